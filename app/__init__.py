@@ -9,6 +9,19 @@ from .config import DevelopmentConfig, TestingConfig, ProductionConfig
 # logging
 from .utils.logger import configure_logger
 
+# shared upstream clients
+from .services.openmeteo_client import openmeteo_pool
+from .services.forecast_cache import forecast_cache
+from .services.geo_grid import coordinate_grid
+from .services.single_flight import single_flight
+from .services.geocode_cache import geocode_cache
+from .services.gazetteer import gazetteer
+from .services.rate_limit import nominatim_limiter
+from .services.timezone_service import timezone_service
+from .services.fan_out import fan_out
+from .services.nominatim_client import nominatim_pool
+from .services.page_cache import page_cache
+
 # from .routes import main as main_blueprint
 
 # db = SQLAlchemy()
@@ -24,6 +37,19 @@ def create_app(config_class=DevelopmentConfig):
     # db.init_app(app)
     CORS(app)
 
+    # Build the pooled Open-Meteo client once per process
+    openmeteo_pool.init_app(app)
+    forecast_cache.init_app(app)
+    coordinate_grid.init_app(app)
+    single_flight.init_app(app, client=forecast_cache.client)
+    geocode_cache.init_app(app)
+    gazetteer.init_app(app)
+    nominatim_limiter.init_app(app, client=forecast_cache.client)
+    timezone_service.init_app(app)
+    fan_out.init_app(app)
+    nominatim_pool.init_app(app)
+    page_cache.init_app(app)
+
     # Register blueprint - import main directly from blueprint.py
     from app.routes.blueprint import main as main_blueprint
 
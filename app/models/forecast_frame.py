@@ -0,0 +1,189 @@
+# Column-oriented forecast data for the view layer.
+# WeatherService hands out dictionaries of Python lists (so they can be
+# cached and serialized); the view builders used to re-stringify, re-parse
+# and convert those lists value by value on every request. ForecastFrame
+# holds the same data as typed NumPy columns so windows, unit conversion and
+# formatting are done per column.
+
+import numpy as np
+
+# Stored for missing codes (NaN past the forecast horizon); the icon lookups
+# map it to the "Unknown" row
+UNKNOWN_WEATHER_CODE = -1
+
+
+class ForecastFrame:
+    """
+    Forecast table with one typed NumPy column per variable.
+
+    Rows are forecast steps (hours or days). Slicing a frame returns a new
+    frame whose columns are views of the original arrays, so selecting a
+    time window copies nothing.
+
+    Attributes:
+        time: datetime64[s] local timestamps (naive, location time)
+        temperature: float32 temperatures (daily maximum for daily frames)
+        temperature_min: float32 daily minimum temperatures, or None
+        weather_code: int16 WMO weather codes, UNKNOWN_WEATHER_CODE where
+            the upstream value is missing
+        precipitation_probability: float32 precipitation probabilities (%)
+        is_day: bool upstream day flags of hourly frames, or None
+    """
+
+    __slots__ = (
+        "time",
+        "temperature",
+        "temperature_min",
+        "weather_code",
+        "precipitation_probability",
+        "is_day",
+    )
+
+    def __init__(
+        self,
+        time,
+        temperature,
+        weather_code,
+        precipitation_probability,
+        temperature_min=None,
+        is_day=None,
+    ):
+        self.time = np.asarray(time, dtype="datetime64[s]")
+        self.temperature = np.asarray(temperature, dtype=np.float32)
+        codes = np.asarray(weather_code, dtype=np.float64)
+        self.weather_code = np.where(
+            np.isfinite(codes), codes, UNKNOWN_WEATHER_CODE
+        ).astype(np.int16)
+        self.precipitation_probability = np.asarray(
+            precipitation_probability, dtype=np.float32
+        )
+        self.temperature_min = (
+            None
+            if temperature_min is None
+            else np.asarray(temperature_min, dtype=np.float32)
+        )
+        self.is_day = None if is_day is None else np.asarray(is_day, dtype=bool)
+
+    @classmethod
+    def from_hourly(cls, hourly_data):
+        """
+        Build a frame from WeatherService.get_hourly_forecast() data.
+
+        Args:
+            hourly_data: Dictionary with "hours" and "hourly_*" lists or arrays
+
+        Returns:
+            ForecastFrame with one row per hour
+        """
+        return cls(
+            time=hourly_data["hours"],
+            temperature=hourly_data["hourly_temperature_2m"],
+            weather_code=hourly_data["hourly_weather_code"],
+            precipitation_probability=hourly_data["hourly_precipitation_probability"],
+            is_day=hourly_data.get("hourly_is_day"),
+        )
+
+    @classmethod
+    def from_daily(cls, daily_data):
+        """
+        Build a frame from WeatherService.get_7_day_forecast() data.
+
+        Args:
+            daily_data: Dictionary with "date" strings and daily lists or arrays
+
+        Returns:
+            ForecastFrame with one row per day
+        """
+        return cls(
+            time=daily_data["date"],
+            temperature=daily_data["temperature_2m_max"],
+            temperature_min=daily_data["temperature_2m_min"],
+            weather_code=daily_data["weather_code"],
+            precipitation_probability=daily_data["precipitation_probability_max"],
+        )
+
+    def __len__(self):
+        return len(self.time)
+
+    def __getitem__(self, index):
+        """Rows selected by a slice, as a frame of views (no copy)"""
+        if not isinstance(index, slice):
+            raise TypeError("ForecastFrame rows can only be selected with a slice")
+        frame = object.__new__(ForecastFrame)
+        for name in self.__slots__:
+            column = getattr(self, name)
+            setattr(frame, name, None if column is None else column[index])
+        return frame
+
+    def index_after(self, moment):
+        """
+        Position of the first row strictly after a local time.
+
+        Binary search over the sorted time column: O(log n) whatever the
+        forecast length.
+
+        Args:
+            moment: datetime in the location's time (tzinfo is ignored),
+                or a datetime64
+
+        Returns:
+            Row index, len(self) if every row is at or before moment
+        """
+        if not isinstance(moment, np.datetime64):
+            moment = moment.replace(tzinfo=None)
+        moment = np.datetime64(moment, "s")
+        return int(np.searchsorted(self.time, moment, side="right"))
+
+    def window_from(self, moment, length):
+        """
+        Rows of the next length steps after a local time.
+
+        When the whole forecast is at or before moment (e.g. a stale cache
+        entry), the window starts at the first row instead of being empty.
+
+        Args:
+            moment: datetime in the location's time (see index_after)
+            length: Number of rows, e.g. 6, 24, 48 or 168 hours
+
+        Returns:
+            ForecastFrame of views (no copy), shorter than length when the
+            forecast ends first
+        """
+        start = self.index_after(moment)
+        if start >= len(self):
+            start = 0
+        return self[start : start + length]
+
+    def temperatures(self, units="F", minimum=False):
+        """
+        Whole-degree temperatures as displayed.
+
+        Values are converted at full precision, then truncated like int().
+
+        Args:
+            units: UnitService of the session, or a temperature unit
+                ("F" as fetched, or "C")
+            minimum: Use the daily minimum column instead of temperature
+
+        Returns:
+            int64 NumPy array
+        """
+        from app.services.unit_service import UnitService
+
+        if not isinstance(units, UnitService):
+            units = UnitService(temp_unit=units)
+        column = self.temperature_min if minimum else self.temperature
+        return units.temperature(column)
+
+    def hour_labels(self):
+        """Local times formatted as "%H:%M" strings"""
+        return [label[11:] for label in self.time_strings(unit="m")]
+
+    def time_strings(self, unit="s"):
+        """
+        Local times as ISO strings.
+
+        Args:
+            unit: NumPy datetime unit ("D" for dates, "m" for minutes, ...)
+        """
+        return np.datetime_as_string(self.time, unit=unit).tolist()
@@ -0,0 +1,113 @@
+# Response schemas of the hourly frame and the /search JSON.
+# update_view_hourly_frame() used to return its data merged with the whole
+# session, and /search serialized that dictionary back to the browser, so
+# every response carried the user's session (units, the location twice) and
+# grew with it. These typed views name the fields the templates and
+# search.js read; serializing through them drops everything else, so
+# response size depends only on the forecast window. The /search payload
+# carries its schema_version so clients can tell layouts apart.
+
+from dataclasses import dataclass, fields
+
+# Version of the /search payload written by serialize_search()
+SEARCH_SCHEMA_VERSION = 1
+
+
+class ViewSchema:
+    """Mixin for the view dataclasses: build from and flatten to dictionaries"""
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Pick the schema's fields out of a view dictionary.
+
+        Args:
+            data: Dictionary holding at least the schema's fields
+
+        Returns:
+            Schema instance (extra keys are ignored)
+
+        Raises:
+            KeyError: If a field is missing from data
+        """
+        return cls(**{field.name: data[field.name] for field in fields(cls)})
+
+    def to_dict(self):
+        """Flat dictionary of the fields (values are not copied)"""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+@dataclass(frozen=True)
+class HourlyView(ViewSchema):
+    """
+    Hourly forecast window, one list entry per hour.
+
+    Values are preformatted strings, as the templates print them.
+    """
+
+    hours: list[str]
+    hourly_temperature_2m: list[str]
+    hourly_weather_code: list[str]
+    hourly_precipitation_probability: list[str]
+    icon_hourly: list[str]
+    description_hourly: list[str]
+
+
+@dataclass(frozen=True)
+class CurrentView(ViewSchema):
+    """Location and current conditions, in the session's units"""
+
+    city: str
+    state: str
+    city_state: str
+    updated_time: str
+    unit: str
+    wind_label: str
+    precip_label: str
+    current_temperature_2m: float
+    current_apparent_temperature: float
+    current_precipitation: float
+    current_wind_speed_10m: float
+    current_weather_code: int
+    is_day: int
+    daily_temperature_2m_max: float
+    daily_temperature_2m_min: float
+    daily_uv_index_max: float
+    daily_precipitation_probability_max: float
+    icon: str
+    description: str
+
+
+def _serialize_search_v1(current, hourly):
+    # flat layout: search.js reads current and hourly fields side by side
+    return (
+        {"schema_version": 1}
+        | CurrentView.from_dict(current).to_dict()
+        | HourlyView.from_dict(hourly).to_dict()
+    )
+
+
+# schema version -> serializer of the /search payload
+SEARCH_SERIALIZERS = {1: _serialize_search_v1}
+
+
+def serialize_search(current, hourly, version=SEARCH_SCHEMA_VERSION):
+    """
+    Build the /search JSON payload.
+
+    Args:
+        current: update_view_cur_frame() data
+        hourly: update_view_hourly_frame() data
+        version: Schema version to write
+
+    Returns:
+        JSON-serializable dictionary
+
+    Raises:
+        ValueError: If the schema version is unknown
+    """
+    try:
+        serializer = SEARCH_SERIALIZERS[version]
+    except KeyError:
+        raise ValueError(f"Unknown search schema version: {version}") from None
+    return serializer(current, hourly)
@@ -14,48 +14,34 @@ from app.services.weather_service import WeatherService
 from app.utils.constants import WEATHER_CODE_MAP
 
 # import shared functions within routes
-from .utils import test_print, verify, update_view_cur_frame, update_view_hourly_frame
+from .utils import (
+    test_print,
+    verify,
+    ensure_session_defaults,
+    cached_page,
+    skip_page_cache,
+    prefetch_forecasts,
+    update_view_cur_frame,
+    update_view_hourly_frame,
+)
 
 home_call_counter = 0
 
 
 # from . import views  # Import all route handlers
 @main.route("/")
+@cached_page("home.html")
 def home():
     # initialize the session
     # session.clear()  # Clear the session if needed
     global home_call_counter
     home_call_counter += 1
 
-    # Set default values if not already in session
-    if "temp_unit" not in session:
-        session["temp_unit"] = "F"  # Default to Fahrenheit
-    if "wind_unit" not in session:
-        session["wind_unit"] = "mph"
-    if "precip_unit" not in session:
-        session["precip_unit"] = "in"
+    ensure_session_defaults()
 
     logger.debug(f"\nHome route called {home_call_counter} times\n")
     logger.debug(f"\n-------Session data: {session}\n")
 
-    if "cur_location" not in session:
-        # Set default values for session variables
-        session["cur_location"] = {
-            "lat": 35.7915,
-            "lon": -78.7811,
-            "postal_code": "27511",
-            "city": "Cary",
-            "state": "NC",
-            "city_state": "Cary, NC",
-        }
-        # session["lat_lon"] = {}
-        # session["unit"] = "C"
-        # session["unit_type"] = "metric"
-    else:
-        session["cur_location"]["city_state"] = (
-            session["cur_location"]["city"] + ", " + session["cur_location"]["state"]
-        )
-
     # Get current time
     cur_time = datetime.now().strftime("%H:%M")  # 12-hour format
     formatted_cur_time = int(datetime.now().strftime("%H"))
@@ -63,6 +49,7 @@ def home():
     # Get or create weather data
     try:
 
+        prefetch_forecasts("cur", "hourly")
         return_data = update_view_cur_frame() | update_view_hourly_frame()
 
         # With this single logging statement:
@@ -72,6 +59,7 @@ def home():
 
     except Exception as e:
         logger.error(f"Error getting weather: {e}", exc_info=True)
+        skip_page_cache()
         # Fallback weather data
         return_data = {
             "city_state": "Cary, NC--Default",
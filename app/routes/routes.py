@@ -7,6 +7,7 @@ from flask import (
     url_for,
     jsonify,
     render_template_string,
+    current_app,
 )
 
 from datetime import datetime
@@ -19,6 +20,18 @@ from .blueprint import main
 # import my services
 from app.services.loc_api import LocService
 from app.services.weather_service import WeatherService
+from app.services.openmeteo_client import openmeteo_pool
+from app.services.forecast_cache import forecast_cache
+from app.services.geo_grid import coordinate_grid
+from app.services.single_flight import single_flight
+from app.services.geocode_cache import geocode_cache
+from app.services.gazetteer import gazetteer
+from app.services.rate_limit import RateLimitExceeded, nominatim_limiter
+from app.services.timezone_service import timezone_service
+from app.services.fan_out import FanOutTimeout, fan_out
+from app.services.nominatim_client import nominatim_pool
+from app.services.page_cache import page_cache
+from app.models.view_schema import serialize_search
 from app.utils.constants import WEATHER_CODE_MAP
 
 # import shared functions within routes
@@ -28,6 +41,11 @@ from .utils import (
     update_view_cur_frame,
     update_view_hourly_frame,
     update_view_7_day_frame,
+    prefetch_forecasts,
+    serialize_bundle,
+    cached_page,
+    requested_hours,
+    add_validators,
 )
 
 # Create module-level logger
@@ -115,10 +133,10 @@ def search():
         # debug
         logger.info(f'After Verify....Location data: {session["cur_location"]}\n')
         # debug
+        # the geocode above must finish first; the forecasts run concurrently
+        prefetch_forecasts("cur", "hourly")
         return jsonify(
-            session["cur_location"]
-            | update_view_cur_frame()
-            | update_view_hourly_frame()
+            serialize_search(update_view_cur_frame(), update_view_hourly_frame())
         )
 
     else:
@@ -127,8 +145,10 @@ def search():
 
 
 @main.route("/forecast")
+@cached_page("forecast.html")
 def forecast():
 
+    prefetch_forecasts("cur", "daily")
     return_data = (
         update_view_cur_frame()
         | update_view_7_day_frame()
@@ -142,14 +162,18 @@ def forecast():
 
 
 @main.route("/hourly")
+@cached_page("hourly.html", variant=requested_hours)
 def hourly():
 
     # logger.debug("hourly endpoint called\n ---Session data---\n {session}")
     print(f"session data : {session['cur_location']}")
+    # ?hours=N shows up to the whole forecast (7 days in bundle mode)
+    hours = requested_hours()
+    prefetch_forecasts("cur", "hourly")
     return_data = (
         {"date": datetime.today().strftime("%Y-%m-%d")}
         | update_view_cur_frame()
-        | update_view_hourly_frame(24)
+        | update_view_hourly_frame(hours)
         | {"unit": session["temp_unit"]}
     )
 
@@ -205,8 +229,127 @@ def api_location():
         coords = LocService().get_lat_lon(data)
         return coords
 
+    except RateLimitExceeded:
+        raise
     except Exception as e:
         import traceback
 
         traceback.print_exc()  # Print detailed error for debugging
         return jsonify({"error": str(e)}), 500
+
+
+# Pages and JSON answers get ETags; revalidations cost a 304
+CONDITIONAL_ENDPOINTS = {
+    "main.home",
+    "main.forecast",
+    "main.hourly",
+    "main.search",
+    "main.api_location",
+    "main.api_weather_batch",
+}
+
+
+@main.after_request
+def conditional_response(response):
+    """ETag / Cache-Control for the pages and JSON APIs; metrics are never stored"""
+    if request.endpoint in CONDITIONAL_ENDPOINTS:
+        return add_validators(response)
+    if request.endpoint == "main.api_metrics":
+        response.cache_control.no_store = True
+    return response
+
+
+# Endpoints answering fetch() calls with JSON (besides /api/*)
+JSON_ENDPOINTS = {"main.search"}
+
+
+def wants_json():
+    """True if the error should be JSON (API and XHR calls), not a page"""
+    if request.path.startswith("/api/") or request.endpoint in JSON_ENDPOINTS:
+        return True
+    best = request.accept_mimetypes.best_match(["text/html", "application/json"])
+    return best == "application/json"
+
+
+@main.app_errorhandler(FanOutTimeout)
+def fan_out_timeout(e):
+    """Upstream forecasts missed the request deadline"""
+    logger.warning(f"Forecast fetch deadline exceeded: {e}")
+    if wants_json():
+        return (
+            jsonify({"error": "Forecast service timed out", "pending": e.pending}),
+            504,
+        )
+    return render_template("error.html"), 504
+
+
+@main.app_errorhandler(RateLimitExceeded)
+def rate_limit_exceeded(e):
+    """Geocoding is saturated: tell the client to retry instead of timing out"""
+    response = jsonify({"error": str(e), "retry_after": round(e.retry_after, 1)})
+    response.headers["Retry-After"] = str(max(1, round(e.retry_after)))
+    return response, 503
+
+
+@main.route("/api/weather/batch", methods=["POST"])
+def api_weather_batch():
+    """Forecasts for many locations, fetched with one upstream request"""
+    data = request.json
+    locations = data.get("locations") if isinstance(data, dict) else None
+
+    if not locations:
+        return jsonify({"error": "No locations provided"}), 400
+
+    max_locations = current_app.config["WEATHER_BATCH_MAX_LOCATIONS"]
+    if len(locations) > max_locations:
+        return (
+            jsonify({"error": f"At most {max_locations} locations per request"}),
+            400,
+        )
+
+    try:
+        coords_list = [
+            {"lat": float(loc["lat"]), "lon": float(loc["lon"])} for loc in locations
+        ]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Each location needs numeric lat and lon"}), 400
+
+    try:
+        bundles = WeatherService().get_forecasts_bulk(
+            coords_list, batch_size=max_locations
+        )
+    except Exception as e:
+        logger.error(f"Error fetching batch forecast: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify(
+        {
+            "results": [
+                coords | serialize_bundle(bundle)
+                for coords, bundle in zip(coords_list, bundles)
+            ]
+        }
+    )
+
+
+@main.route("/api/metrics")
+def api_metrics():
+    """Report utilization of the shared upstream clients"""
+    # present when served by the gevent server (serve.py)
+    backpressure = current_app.extensions.get("backpressure")
+    return jsonify(
+        {
+            "server": backpressure.stats() if backpressure else None,
+            "openmeteo_pool": openmeteo_pool.stats(),
+            "forecast_cache": forecast_cache.stats(),
+            "coordinate_grid": coordinate_grid.stats(),
+            "single_flight": single_flight.stats(),
+            "geocode_cache": geocode_cache.stats(),
+            "gazetteer": gazetteer.stats(),
+            "nominatim_pool": nominatim_pool.stats(),
+            "nominatim_rate_limit": nominatim_limiter.stats(),
+            "timezones": timezone_service.stats(),
+            "fan_out": fan_out.stats(),
+            "page_cache": page_cache.stats(),
+        }
+    )
@@ -1,6 +1,10 @@
 # Utility functions within routes
+from functools import wraps
+
+from werkzeug.http import generate_etag
 from flask import (
     Blueprint,
+    make_response,
     render_template,
     request,
     session,
@@ -8,21 +12,35 @@ from flask import (
     url_for,
     jsonify,
     render_template_string,
+    g,
 )
 
-import pandas as pd
 import logging
 
 # Create module-level logger
 logger = logging.getLogger(__name__)
 
 from datetime import datetime
-import pytz
-from tzlocal import get_localzone
 
 from app.services.loc_api import LocService
 from app.services.weather_service import WeatherService
-from app.utils.constants import WEATHER_CODE_MAP
+from app.services.timezone_service import timezone_service
+from app.services.geo_grid import coordinate_grid
+from app.services.page_cache import page_cache
+from app.models.view_schema import HourlyView
+from app.utils.constants import weather_icon, weather_icons
+
+# Fields of get_cur_forecast() data converted to the session's units
+CUR_UNIT_FIELDS = {
+    "temperature": [
+        "current_temperature_2m",
+        "current_apparent_temperature",
+        "daily_temperature_2m_max",
+        "daily_temperature_2m_min",
+    ],
+    "wind": ["current_wind_speed_10m"],
+    "precipitation": ["current_precipitation"],
+}
 
 
 def test_print():
@@ -39,6 +57,195 @@ def debug_print_session(func_name):
     print(f"-------------------------\n")
 
 
+def get_weather_service():
+    """
+    Get the WeatherService shared by all view builders of the current request.
+
+    In bundle mode the first builder fetches current, hourly and daily data in
+    one upstream call and the others slice the same decoded result.
+    """
+    if "weather_service" not in g:
+        g.weather_service = WeatherService()
+    return g.weather_service
+
+
+def prefetch_forecasts(*kinds):
+    """
+    Fetch the forecasts a page needs concurrently, before its view builders.
+
+    Args:
+        kinds: Forecasts the page shows ("cur", "hourly", "daily")
+
+    Raises:
+        FanOutTimeout: if the fetches exceed the request deadline
+    """
+    get_weather_service().prefetch(session["cur_location"], kinds)
+
+
+def ensure_session_defaults():
+    """Fill in default units and the default location (Cary, NC)"""
+    # Set default values if not already in session
+    if "temp_unit" not in session:
+        session["temp_unit"] = "F"  # Default to Fahrenheit
+    if "wind_unit" not in session:
+        session["wind_unit"] = "mph"
+    if "precip_unit" not in session:
+        session["precip_unit"] = "in"
+
+    if "cur_location" not in session:
+        # Set default values for session variables
+        session["cur_location"] = {
+            "lat": 35.7915,
+            "lon": -78.7811,
+            "postal_code": "27511",
+            "city": "Cary",
+            "state": "NC",
+            "city_state": "Cary, NC",
+        }
+    else:
+        session["cur_location"]["city_state"] = (
+            session["cur_location"]["city"] + ", " + session["cur_location"]["state"]
+        )
+
+
+def requested_hours():
+    """Length of the hourly page: ?hours=N, up to the whole forecast (7 days)"""
+    return min(max(request.args.get("hours", 24, type=int), 1), 168)
+
+
+def lookup_page(template, variant=None):
+    """
+    Look up the current request's page in the page cache.
+
+    The lookup runs once per request; later calls return the same result.
+
+    Args:
+        template: Template the page is rendered with
+        variant: Other inputs of the page (e.g. the hourly length)
+
+    Returns:
+        Tuple (key, cached HTML, ETag); HTML and ETag are None on a miss,
+        and key is None when the session is not set up yet and the page
+        cannot be cached
+    """
+    if "page_lookup" not in g:
+        key = html = etag = None
+        if all(
+            name in session
+            for name in ("cur_location", "temp_unit", "wind_unit", "precip_unit")
+        ):
+            location = session["cur_location"]
+            key = page_cache.make_key(
+                coordinate_grid.snap_coords(location),
+                (session["temp_unit"], session["wind_unit"], session["precip_unit"]),
+                template,
+                # nearby places share a grid cell but not their name
+                (variant, location.get("city"), location.get("state")),
+            )
+            html, etag = page_cache.lookup(key)
+        g.page_lookup = (key, html, etag)
+    return g.page_lookup
+
+
+def skip_page_cache():
+    """Keep the page rendered by the current request out of the page cache"""
+    g.skip_page_cache = True
+
+
+def page_response(html, etag):
+    """
+    Response for a page with a known ETag.
+
+    Returns:
+        304 Not Modified when the client already has this version of the
+        page (If-None-Match), the page otherwise
+    """
+    if etag in request.if_none_match:
+        response = make_response("", 304)
+    else:
+        response = make_response(html)
+    response.set_etag(etag)
+    return response
+
+
+def cached_page(template, variant=None):
+    """
+    Serve a view's rendered page from the page cache.
+
+    Cached pages carry the ETag stored with them, so revalidations are
+    answered with 304 Not Modified before anything is fetched or rendered.
+
+    Args:
+        template: Template the view renders
+        variant: Optional callable returning the request's other inputs of
+            the page (e.g. requested_hours)
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key, html, etag = lookup_page(template, variant() if variant else None)
+            if html is not None:
+                return page_response(html, etag)
+            html = view(*args, **kwargs)
+            if key is None or not isinstance(html, str) or "skip_page_cache" in g:
+                return html
+            etag = generate_etag(html.encode("utf-8"))
+            page_cache.set(key, html, etag)
+            return page_response(html, etag)
+
+        return wrapper
+
+    return decorator
+
+
+def add_validators(response):
+    """
+    Make a response revalidatable.
+
+    Adds a content-hash ETag (unless the view set one) and Cache-Control
+    "private, no-cache": responses depend on the session cookie and must
+    be revalidated, which costs a 304 when nothing changed.
+
+    Returns:
+        The response, turned into 304 Not Modified when it matches the
+        request's If-None-Match (GET and HEAD requests)
+    """
+    if response.status_code not in (200, 304):
+        return response
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add("Cookie")
+    if response.status_code == 200 and not response.direct_passthrough:
+        response.add_etag(overwrite=False)
+        etag, _ = response.get_etag()
+        if request.method in ("GET", "HEAD") and etag in request.if_none_match:
+            # the client's copy is current: drop the body
+            response.status_code = 304
+            response.response = []
+            response.headers.pop("Content-Length", None)
+            response.headers.pop("Content-Type", None)
+    return response
+
+
+def serialize_bundle(bundle):
+    """
+    Make a forecast bundle JSON friendly.
+
+    Args:
+        bundle: Dictionary returned by WeatherService.get_forecast_bundle
+
+    Returns:
+        Copy of the bundle with hourly timestamps as strings
+    """
+    hourly = bundle["hourly"] | {
+        "hours": [
+            hour.strftime("%Y-%m-%d %H:%M:%S") for hour in bundle["hourly"]["hours"]
+        ]
+    }
+    return bundle | {"hourly": hourly}
+
+
 def verify(loc_data):
 
     if len(loc_data) == 0:
@@ -61,7 +268,7 @@ def verify(loc_data):
 
 def update_view_cur_frame():
 
-    weather = WeatherService()
+    weather = get_weather_service()
     weather_data = weather.get_cur_forecast(session["cur_location"])
 
     logger.info(
@@ -83,36 +290,23 @@ def update_view_cur_frame():
     # logger.info(f'---cur_data_updated_time: {cur_data["updated_time"]}')
     logger.debug(f"---cur_session: {session}")
 
-    if session["temp_unit"] == "C":
-        weather_data["current_temperature_2m"] = convert_to_celsius(
-            weather_data["current_temperature_2m"]
-        )
-        weather_data["current_apparent_temperature"] = convert_to_celsius(
-            weather_data["current_apparent_temperature"]
-        )
-        weather_data["daily_temperature_2m_max"] = convert_to_celsius(
-            weather_data["daily_temperature_2m_max"]
-        )
-        weather_data["daily_temperature_2m_min"] = convert_to_celsius(
-            weather_data["daily_temperature_2m_min"]
-        )
+    # forecasts come in the units of the service's profile: with upstream
+    # units this only truncates, canonical payloads are converted here
+    units = weather.units
+    weather_data = units.convert(weather_data, CUR_UNIT_FIELDS)
+    cur_data["wind_label"] = units.labels["wind"]
+    cur_data["precip_label"] = units.labels["precipitation"]
 
-    if weather_data["is_day"] == 1:
-        datetime_str = "day"
-    else:
-        datetime_str = "night"
-
-    weather_pics = {
-        "icon": WEATHER_CODE_MAP[str(weather_data["current_weather_code"])][
-            datetime_str
-        ]["image"],
-        "description": WEATHER_CODE_MAP[str(weather_data["current_weather_code"])][
-            datetime_str
-        ]["description"],
-    }
+    icon, description = weather_icon(
+        weather_data["current_weather_code"], weather_data["is_day"] == 1
+    )
+    weather_pics = {"icon": icon, "description": description}
 
-    # Combine location and weather data
-    cur_data = cur_data | session["cur_location"] | weather_data | weather_pics
+    # Combine location and weather data; geocoded locations carry city and
+    # state but not always city_state
+    location = session["cur_location"]
+    location = location | {"city_state": f'{location["city"]}, {location["state"]}'}
+    cur_data = cur_data | location | weather_data | weather_pics
 
     # logger.debug(f"---return data in  update_view_cur_frame():\n {cur_data}\n")
 
@@ -120,150 +314,84 @@ def update_view_cur_frame():
 
 
 def update_view_hourly_frame(hour_length=6):
+    from app.models.forecast_frame import ForecastFrame
+    from app.services.daylight import is_day, sun_times
 
     # get hourly data
-    weather = WeatherService()
+    weather = get_weather_service()
     hourly_data = weather.get_hourly_forecast(session["cur_location"])
+    frame = ForecastFrame.from_hourly(hourly_data)
 
     # # # debug
     # logger.debug(
     #     f"\n---Received Hourly weather data in update_view_hourly_frame():\n {hourly_data}\n"
     # )
 
-    start_time_index = 0
     time_zone_data = get_time_in_timezone(hourly_data["timezone"])
 
     # logger.debug(
     #     f"\n---Received Timezone data in update_view_hourly_frame():\n {time_zone_data}\n"
     # )
 
-    # print(f"\n-------------------------")
-    # print(f"Time zone data: {type(time_zone_data["dest_time"])}")
-
-    for i in range(len(hourly_data["hours"])):
-        # # Convert timestamp to string format for comparison
-        hour_str = hourly_data["hours"][i].strftime("%Y-%m-%d %H:%M:%S")
-        dest_time_str = time_zone_data["dest_time"].strftime("%Y-%m-%d %H:%M:%S")
-
-        if dest_time_str < hour_str:
-            start_time_index = i
-            break
-
-    # logger.info(f" the start index is {start_time_index}")
+    # Start at the first hour after the location's current time (from the
+    # beginning if the forecast is entirely in the past); the window's
+    # columns are views of the frame, nothing is copied
+    window = frame.window_from(time_zone_data["dest_time"], hour_length)
+    units = weather.units
 
     formatted_hourly_data = {
-        "hours": hourly_data["hours"][
-            start_time_index : start_time_index + hour_length
-        ],
+        "hours": window.hour_labels(),
         "hourly_temperature_2m": [
-            f"{int(val)}"
-            for val in hourly_data["hourly_temperature_2m"][
-                start_time_index : start_time_index + hour_length
-            ]
-        ],
-        "hourly_weather_code": [
-            f"{int(val)}"
-            for val in hourly_data["hourly_weather_code"][
-                start_time_index : start_time_index + hour_length
-            ]
+            str(val) for val in window.temperatures(units).tolist()
         ],
+        "hourly_weather_code": [str(val) for val in window.weather_code.tolist()],
         "hourly_precipitation_probability": [
-            f"{int(val)}"
-            for val in hourly_data["hourly_precipitation_probability"][
-                start_time_index : start_time_index + hour_length
-            ]
+            str(val) for val in window.precipitation_probability.astype(int).tolist()
         ],
     }
     logger.debug(
         f"\n---Formatted Hourly weather data in update_view_hourly_frame():\n {formatted_hourly_data}\n"
     )
-    if session["temp_unit"] == "C":
-        # Convert temperature to Celsius
-        for i in range(len(formatted_hourly_data["hourly_temperature_2m"])):
-            formatted_hourly_data["hourly_temperature_2m"][i] = convert_to_celsius(
-                int(formatted_hourly_data["hourly_temperature_2m"][i])
-            )
-
-    icon_hourly = {"icon_hourly": [], "description_hourly": []}
-    for i in range(0, hour_length):
-
-        is_day_str = get_is_day(
-            formatted_hourly_data["hours"][i],
-            hourly_data["daily_sunrise"],
-            hourly_data["daily_sunset"],
-        )
-
-        icon_hourly["icon_hourly"].append(
-            WEATHER_CODE_MAP[str(int(formatted_hourly_data["hourly_weather_code"][i]))][
-                is_day_str
-            ]["image"]
-        )
 
-        icon_hourly["description_hourly"].append(
-            WEATHER_CODE_MAP[str(int(formatted_hourly_data["hourly_weather_code"][i]))][
-                is_day_str
-            ]["description"]
-        )
+    # classify the whole window at once, for any number of forecast days
+    sunrise, sunset = sun_times(hourly_data)
+    day_flags = is_day(window.time, sunrise, sunset, fallback=window.is_day)
+    icons, descriptions = weather_icons(window.weather_code, day_flags)
+    icon_hourly = {"icon_hourly": icons, "description_hourly": descriptions}
 
-        # Convert the start time index to a string format
-    for i in range(0, hour_length):
-        formatted_hourly_data["hours"][i] = formatted_hourly_data["hours"][i].strftime(
-            "%H:%M"
-        )
-
-    return_data = formatted_hourly_data | icon_hourly | session
-
-    return return_data
+    # only the frame's own fields: location and units come from the
+    # current frame, the session stays out of pages and JSON
+    return HourlyView.from_dict(formatted_hourly_data | icon_hourly).to_dict()
 
 
 def update_view_7_day_frame():
+    from app.models.forecast_frame import ForecastFrame
+
     # get daily data
-    weather = WeatherService()
+    weather = get_weather_service()
     daily_data = weather.get_7_day_forecast(session["cur_location"])
+    frame = ForecastFrame.from_daily(daily_data)
 
     # # # debug
     # logger.debug(
     #     f"\n---Received Daily weather data in update_view_daily_frame():\n {daily_data}\n"
     # )
 
+    units = weather.units
     formatted_daily_data = {
         "date": daily_data["date"],
-        "temperature_2m_max": [
-            f"{int(val)}" for val in daily_data["temperature_2m_max"]
-        ],
+        "temperature_2m_max": [str(val) for val in frame.temperatures(units).tolist()],
         "temperature_2m_min": [
-            f"{int(val)}" for val in daily_data["temperature_2m_min"]
+            str(val) for val in frame.temperatures(units, minimum=True).tolist()
         ],
-        "weather_code": [f"{int(val)}" for val in daily_data["weather_code"]],
+        "weather_code": [str(val) for val in frame.weather_code.tolist()],
         "precipitation_probability_max": [
-            f"{int(val)}" for val in daily_data["precipitation_probability_max"]
+            str(val) for val in frame.precipitation_probability.astype(int).tolist()
         ],
     }
 
-    if session["temp_unit"] == "C":
-        # Convert temperature to Celsius
-        for i in range(len(formatted_daily_data["temperature_2m_max"])):
-            formatted_daily_data["temperature_2m_max"][i] = convert_to_celsius(
-                int(formatted_daily_data["temperature_2m_max"][i])
-            )
-            formatted_daily_data["temperature_2m_min"][i] = convert_to_celsius(
-                int(formatted_daily_data["temperature_2m_min"][i])
-            )
-
-    icon_daily = {"icon_daily": [], "description_daily": []}
-    for i in range(len(formatted_daily_data["weather_code"])):
-
-        icon_daily["icon_daily"].append(
-            WEATHER_CODE_MAP[str(int(formatted_daily_data["weather_code"][i]))]["day"][
-                "image"
-            ]
-        )
-
-        icon_daily["description_daily"].append(
-            WEATHER_CODE_MAP[str(int(formatted_daily_data["weather_code"][i]))]["day"][
-                "description"
-            ]
-        )
+    icons, descriptions = weather_icons(frame.weather_code)
+    icon_daily = {"icon_daily": icons, "description_daily": descriptions}
 
     return_data = session["cur_location"] | formatted_daily_data | icon_daily
 
@@ -283,12 +411,12 @@ def get_time_in_timezone(timezone_str="America/New_York"):
         Dictionary with local and destination time information
     """
     try:
-        # Get local timezone
-        local_timezone = get_localzone()
+        # Get local timezone (resolved once per process)
+        local_timezone = timezone_service.local_zone()
         local_time = datetime.now(local_timezone)
 
-        # Get destination timezone
-        dest_timezone = pytz.timezone(timezone_str)
+        # Get destination timezone (cached zoneinfo object)
+        dest_timezone = timezone_service.zone(timezone_str)
         dest_time = local_time.astimezone(dest_timezone)
 
         # logger.info(f"\n-----------------")
@@ -0,0 +1,160 @@
+# gevent WSGI server used by serve.py (the production entry point).
+# run.py starts Flask's development server, one OS thread per request. Here
+# each connection is a greenlet of a bounded gevent pool and, with the
+# stdlib monkey-patched, upstream calls (Open-Meteo, Nominatim, Redis) yield
+# while they wait. Backpressure caps the requests handled at once and sheds
+# the excess with 503 + Retry-After instead of letting latency grow.
+# This is the serving mode for many in-flight upstream calls per worker:
+# up to GEVENT_MAX_ACTIVE requests wait on their upstreams at once, with
+# the same sync views, caches and single-flight coalescing as run.py
+# (benchmarks/server_load.py compares it with the threaded server).
+
+import json
+import logging
+import threading
+import time
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class Backpressure:
+    """
+    WSGI middleware admitting at most max_active requests at a time.
+
+    Requests beyond the limit wait up to queue_timeout seconds for a slot,
+    then get a 503 telling the client when to retry. After monkey-patching
+    the semaphore is a gevent one, so waiting requests only park their
+    greenlet.
+    """
+
+    def __init__(self, wsgi_app, max_active=200, queue_timeout=2.0, retry_after=1):
+        """
+        Args:
+            wsgi_app: Wrapped WSGI application
+            max_active: Requests handled concurrently
+            queue_timeout: Seconds a request may wait for a slot
+            retry_after: Retry-After (seconds) sent with rejections
+        """
+        self.wsgi_app = wsgi_app
+        self.max_active = max_active
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._slots = threading.BoundedSemaphore(max_active)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._peak_active = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._queued_time = 0.0
+
+    def __call__(self, environ, start_response):
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._rejected += 1
+            return self._reject(start_response)
+
+        with self._lock:
+            self._admitted += 1
+            self._active += 1
+            self._peak_active = max(self._peak_active, self._active)
+            self._queued_time += time.monotonic() - start
+        try:
+            # the response is rendered eagerly by Flask, so the slot can be
+            # released once the body iterable is returned
+            return self.wsgi_app(environ, start_response)
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._slots.release()
+
+    def _reject(self, start_response):
+        body = json.dumps(
+            {"error": "Server busy, retry later", "retry_after": self.retry_after}
+        ).encode("utf-8")
+        start_response(
+            "503 Service Unavailable",
+            [
+                ("Content-Type", "application/json"),
+                ("Content-Length", str(len(body))),
+                ("Retry-After", str(self.retry_after)),
+            ],
+        )
+        return [body]
+
+    def stats(self):
+        """
+        Report admission control.
+
+        Returns:
+            Dictionary with active/peak requests, rejections and queueing time
+        """
+        with self._lock:
+            return {
+                "max_active": self.max_active,
+                "active": self._active,
+                "peak_active": self._peak_active,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "avg_queued": (
+                    round(self._queued_time / self._admitted, 4)
+                    if self._admitted
+                    else 0.0
+                ),
+            }
+
+
+def create_server(app, host=None, port=None):
+    """
+    Build the gevent WSGI server for an app.
+
+    Settings are read from GEVENT_HOST, GEVENT_PORT, GEVENT_POOL_SIZE,
+    GEVENT_BACKLOG, GEVENT_MAX_ACTIVE, GEVENT_QUEUE_TIMEOUT and
+    GEVENT_RETRY_AFTER. Call gevent.monkey.patch_all() before importing the
+    app (see serve.py), or upstream calls will block the whole process.
+
+    Args:
+        app: Flask application instance
+        host: Optional interface overriding GEVENT_HOST
+        port: Optional port overriding GEVENT_PORT
+
+    Returns:
+        gevent.pywsgi.WSGIServer (not started)
+    """
+    from gevent import monkey
+    from gevent.pool import Pool
+    from gevent.pywsgi import WSGIServer
+
+    if not monkey.is_module_patched("socket"):
+        logger.warning("gevent server without monkey-patching: upstream I/O blocks")
+
+    config = app.config
+    pool_size = config.get("GEVENT_POOL_SIZE", 1000)
+    backpressure = Backpressure(
+        app.wsgi_app,
+        max_active=config.get("GEVENT_MAX_ACTIVE", 200),
+        queue_timeout=config.get("GEVENT_QUEUE_TIMEOUT", 2.0),
+        retry_after=config.get("GEVENT_RETRY_AFTER", 1),
+    )
+    app.wsgi_app = backpressure
+    app.extensions["backpressure"] = backpressure
+
+    address = (
+        host or config.get("GEVENT_HOST", "0.0.0.0"),
+        port or config.get("GEVENT_PORT", 8000),
+    )
+    server = WSGIServer(
+        address,
+        app,
+        spawn=Pool(pool_size),
+        backlog=config.get("GEVENT_BACKLOG", 2048),
+        log=None,
+        error_log=logger,
+    )
+    logger.info(
+        f"gevent server on {address[0]}:{address[1]} "
+        f"(pool={pool_size}, max_active={backpressure.max_active})"
+    )
+    return server
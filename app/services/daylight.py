@@ -0,0 +1,104 @@
+# Day/night classification of forecast timestamps.
+# get_is_day() parses four sunrise/sunset strings per classified hour and
+# only knows about the first two days. Here sunrise/sunset stay epoch arrays
+# (as decoded from ValuesInt64AsNumpy()) and a whole timestamp array is
+# classified with one np.searchsorted, for any number of forecast days.
+# Polar days and nights have no usable sunrise/sunset table; those hours
+# take Open-Meteo's own hourly is_day flags.
+
+import numpy as np
+
+from app.services.openmeteo_decode import to_local
+from app.services.timezone_service import timezone_service
+
+
+def is_day(times, sunrise, sunset, fallback=None):
+    """
+    Classify timestamps as day or night.
+
+    A time is daytime when it falls strictly between a sunrise and the
+    sunset of the same day. All arguments must use the same time base
+    (Unix seconds, or datetime64 values in the same time zone).
+
+    The binary search needs one sunrise per sunset, sorted, with no
+    missing values and each sunset after its sunrise. Polar days and
+    nights break that (missing, NaN/NaT or equal times), so such tables
+    are not searched: the upstream day flags are used instead.
+
+    Args:
+        times: Array of timestamps to classify
+        sunrise: Sorted array of sunrise times, one per day
+        sunset: Array of sunset times aligned with sunrise
+        fallback: Upstream day flags (e.g. Open-Meteo's hourly is_day)
+            aligned with times, used when the sunrise/sunset table is
+            empty or unusable
+
+    Returns:
+        Bool NumPy array, True for daytime
+
+    Raises:
+        ValueError: If the sunrise/sunset table is unusable and there is
+            no fallback, or the fallback is not aligned with times
+    """
+    times = np.asarray(times)
+    sunrise = np.asarray(sunrise)
+    sunset = np.asarray(sunset)
+    if not len(sunrise) or not _valid_sun_table(sunrise, sunset):
+        if fallback is not None:
+            fallback = np.asarray(fallback)
+            if fallback.shape != times.shape:
+                raise ValueError(
+                    f"Day flags {fallback.shape} do not match times {times.shape}"
+                )
+            return fallback.astype(bool)
+        if not len(sunrise):
+            return np.zeros(times.shape, dtype=bool)
+        raise ValueError(
+            "Sunrise/sunset times are unsorted, misaligned or missing values"
+        )
+
+    # index of the last sunrise strictly before each time
+    day = np.searchsorted(sunrise, times, side="left") - 1
+    after_sunrise = day >= 0
+    return after_sunrise & (times < sunset[np.maximum(day, 0)])
+
+
+def _valid_sun_table(sunrise, sunset):
+    """True if is_day() can binary-search the sunrise/sunset arrays"""
+    if sunrise.ndim != 1 or sunrise.shape != sunset.shape:
+        return False
+    for values in (sunrise, sunset):
+        if values.dtype.kind == "M" and np.isnat(values).any():
+            return False
+        if values.dtype.kind == "f" and np.isnan(values).any():
+            return False
+    return bool(np.all(sunrise[1:] > sunrise[:-1]) and np.all(sunset > sunrise))
+
+
+def sun_times(data):
+    """
+    Local sunrise and sunset times of decoded hourly forecast data.
+
+    Uses the epoch arrays added by WeatherService when present (shifted
+    with the zone's offset table, so DST changes are honored) and falls
+    back to parsing the "%Y-%m-%d %H:%M:%S" strings (payloads cached
+    before the epochs were stored) in one vectorized call.
+
+    Args:
+        data: Dictionary from WeatherService.get_hourly_forecast()
+
+    Returns:
+        Tuple of datetime64[s] arrays (sunrise, sunset) in local time
+    """
+    if "daily_sunrise_epochs" in data:
+        local = []
+        for key in ("daily_sunrise_epochs", "daily_sunset_epochs"):
+            offsets = timezone_service.offsets(
+                data.get("timezone"), data[key], data["utc_offset"]
+            )
+            local.append(to_local(data[key], offsets))
+        return tuple(local)
+    return (
+        np.array(data["daily_sunrise"], dtype="datetime64[s]"),
+        np.array(data["daily_sunset"], dtype="datetime64[s]"),
+    )
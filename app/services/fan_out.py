@@ -0,0 +1,157 @@
+# Concurrent fan-out of independent upstream calls within a request.
+# Pages fetch their current, hourly and daily forecasts one after the other,
+# so a page costs the sum of the upstream latencies. FanOut runs such calls
+# on a shared thread pool (greenlets once gevent has monkey-patched
+# threading) and waits for all of them under one per-request deadline, so a
+# page costs the slowest call instead.
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from flask import copy_current_request_context, has_request_context
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class FanOutTimeout(TimeoutError):
+    """Some calls of a fan-out did not finish before the deadline"""
+
+    def __init__(self, pending, deadline):
+        self.pending = sorted(pending)
+        self.deadline = deadline
+        super().__init__(
+            f"{', '.join(self.pending)} not done after {deadline:.1f}s deadline"
+        )
+
+
+class FanOut:
+    """
+    Run a batch of independent calls concurrently with a shared deadline.
+
+    The worker pool is process-wide and created on first use; each batch
+    is request-scoped: calls run inside a copy of the caller's request
+    context and the batch either completes or fails as a whole.
+    """
+
+    def __init__(self, max_workers=8, deadline=10.0, enabled=True):
+        """
+        Args:
+            max_workers: Threads shared by all concurrent requests
+            deadline: Default seconds a batch may take
+            enabled: Run calls concurrently (False runs them in order in
+                the caller's thread, still honoring the deadline)
+        """
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._batches = 0
+        self._calls = 0
+        self._timeouts = 0
+
+    def init_app(self, app):
+        """
+        Configure the fan-out from FAN_OUT_ENABLED, FAN_OUT_WORKERS and
+        FAN_OUT_DEADLINE.
+
+        Args:
+            app: Flask application instance
+        """
+        self.enabled = app.config.get("FAN_OUT_ENABLED", self.enabled)
+        self.max_workers = app.config.get("FAN_OUT_WORKERS", self.max_workers)
+        self.deadline = app.config.get("FAN_OUT_DEADLINE", self.deadline)
+        self.shutdown()
+        app.extensions["fan_out"] = self
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="fan-out"
+                )
+            return self._executor
+
+    def shutdown(self):
+        """Stop the worker pool (a new one is created on the next batch)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def run(self, calls, deadline=None):
+        """
+        Run calls concurrently and wait for all of them.
+
+        Args:
+            calls: Mapping of name to zero-argument callable
+            deadline: Seconds the whole batch may take (default: deadline)
+
+        Returns:
+            Dictionary of name to result
+
+        Raises:
+            FanOutTimeout: if calls are still running at the deadline
+                (they finish in the background, their results are dropped)
+            Exception: the first exception raised by a call, in calls order
+        """
+        deadline = self.deadline if deadline is None else deadline
+        start = time.monotonic()
+
+        if not self.enabled or len(calls) < 2:
+            results = {}
+            for name, call in calls.items():
+                if time.monotonic() - start > deadline:
+                    self._count(len(calls), timed_out=True)
+                    raise FanOutTimeout(set(calls) - set(results), deadline)
+                results[name] = call()
+            self._count(len(calls))
+            return results
+
+        if has_request_context():
+            calls = {
+                name: copy_current_request_context(call) for name, call in calls.items()
+            }
+        futures = {name: self._pool().submit(call) for name, call in calls.items()}
+        _, pending = wait(futures.values(), timeout=deadline)
+        if pending:
+            self._count(len(calls), timed_out=True)
+            raise FanOutTimeout(
+                {name for name, future in futures.items() if future in pending},
+                deadline,
+            )
+
+        self._count(len(calls))
+        return {name: future.result() for name, future in futures.items()}
+
+    def _count(self, calls, timed_out=False):
+        with self._lock:
+            self._batches += 1
+            self._calls += calls
+            if timed_out:
+                self._timeouts += 1
+
+    def stats(self):
+        """
+        Report fan-out usage.
+
+        Returns:
+            Dictionary with batch/call counts and timeouts
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "max_workers": self.max_workers,
+                "deadline": self.deadline,
+                "batches": self._batches,
+                "calls": self._calls,
+                "timeouts": self._timeouts,
+            }
+
+
+# Shared instance, configured by create_app()
+fan_out = FanOut()
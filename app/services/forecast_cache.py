@@ -0,0 +1,287 @@
+# Shared forecast cache.
+# requests_cache keeps one SQLite file per gunicorn worker, so every worker
+# warms its own copy. This cache stores the *decoded* forecast payloads in
+# Redis (msgpack-encoded) so all workers and hosts share one warm cache.
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import msgpack
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+# msgpack extension code used for naive datetimes (hourly timestamps)
+EXT_DATETIME = 1
+
+
+def _encode_default(obj):
+    """msgpack hook for values it cannot pack natively"""
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode("utf-8"))
+    raise TypeError(f"Cannot cache value of type {type(obj).__name__}")
+
+
+def _decode_ext(code, data):
+    """msgpack hook restoring the extension types written by _encode_default"""
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode("utf-8"))
+    return msgpack.ExtType(code, data)
+
+
+def pack(payload):
+    """Encode a decoded forecast payload for storage"""
+    return msgpack.packb(payload, default=_encode_default, use_bin_type=True)
+
+
+def unpack(data):
+    """Decode a payload written by pack()"""
+    return msgpack.unpackb(data, ext_hook=_decode_ext, raw=False)
+
+
+class ForecastCache:
+    """
+    Redis-backed cache of decoded forecast payloads.
+
+    Keys are built from quantized coordinates plus a hash of the requested
+    variable set, so identical requests from any worker share one entry.
+    Redis failures never fail a request: the cache logs, backs off for
+    retry_after seconds and lets the caller fetch upstream.
+
+    With max_stale > 0 entries are kept for max_stale seconds past their
+    TTL. lookup() still returns them (flagged stale) so the caller can
+    answer immediately and refresh() the entry on a background thread
+    instead of blocking the request on Open-Meteo.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        ttl=900,
+        prefix="forecast",
+        coord_decimals=3,
+        retry_after=30,
+        enabled=None,
+        max_stale=0,
+        refresh_workers=2,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.coord_decimals = coord_decimals
+        self.retry_after = retry_after
+        self.enabled = client is not None if enabled is None else enabled
+        self.max_stale = max_stale
+        self.refresh_workers = refresh_workers
+
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        self._stale_hits = 0
+
+        # background revalidation of stale entries
+        self._executor = None
+        self._refreshing = set()
+        self._refreshes = 0
+        self._refresh_errors = 0
+
+    def init_app(self, app):
+        """
+        Configure the cache from the Flask config.
+
+        Args:
+            app: Flask application instance
+        """
+        self.enabled = app.config.get("FORECAST_CACHE_ENABLED", False)
+        self.ttl = app.config.get("FORECAST_CACHE_TTL", self.ttl)
+        self.prefix = app.config.get("FORECAST_CACHE_PREFIX", self.prefix)
+        self.max_stale = app.config.get("FORECAST_CACHE_MAX_STALE", self.max_stale)
+        self.refresh_workers = app.config.get(
+            "FORECAST_CACHE_REFRESH_WORKERS", self.refresh_workers
+        )
+        self.client = (
+            self.connect(app.config["FORECAST_CACHE_URL"]) if self.enabled else None
+        )
+        self._down_until = 0.0
+        app.extensions["forecast_cache"] = self
+
+    @staticmethod
+    def connect(url):
+        """
+        Create a Redis client for the given URL.
+
+        "fakeredis://" gives an in-process server, handy for development
+        and tests without a Redis instance.
+        """
+        if url.startswith("fakeredis://"):
+            import fakeredis
+
+            return fakeredis.FakeRedis()
+
+        import redis
+
+        return redis.Redis.from_url(url, socket_connect_timeout=0.2, socket_timeout=0.5)
+
+    def make_key(self, type, params):
+        """
+        Build the cache key for a forecast request.
+
+        Args:
+            type: Type of weather data (cur, daily, hourly, bundle)
+            params: Parameters of the Open-Meteo request
+
+        Returns:
+            Key string "<prefix>:<type>:<lat>:<lon>:<variable set hash>"
+        """
+        variables = {
+            name: value
+            for name, value in params.items()
+            if name not in ("latitude", "longitude", "format")
+        }
+        digest = hashlib.sha1(
+            json.dumps(variables, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+
+        lat = round(float(params["latitude"]), self.coord_decimals)
+        lon = round(float(params["longitude"]), self.coord_decimals)
+        return f"{self.prefix}:{type}:{lat}:{lon}:{digest}"
+
+    def _available(self):
+        if not self.enabled or self.client is None:
+            return False
+        # skip Redis for a while after a failure instead of timing out per call
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, action, error):
+        with self._lock:
+            self._errors += 1
+            self._down_until = time.monotonic() + self.retry_after
+        logger.warning(
+            f"Forecast cache {action} failed, bypassing for {self.retry_after}s: {error}"
+        )
+
+    def get(self, key):
+        """
+        Look up a fresh payload.
+
+        Returns:
+            The decoded payload, or None on a miss, a stale entry or a
+            cache failure
+        """
+        payload, stale = self.lookup(key)
+        return None if stale else payload
+
+    def lookup(self, key):
+        """
+        Look up a payload, including entries past their TTL.
+
+        Returns:
+            Tuple (payload, stale). payload is None on a miss or cache
+            failure; stale is True when the entry expired less than
+            max_stale seconds ago and should be refreshed
+        """
+        if not self._available():
+            return None, False
+        try:
+            data = self.client.get(key)
+        except Exception as e:
+            self._failed("read", e)
+            return None, False
+
+        entry = None if data is None else unpack(data)
+        stale = entry is not None and time.time() >= entry["fresh_until"]
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+            elif stale:
+                self._stale_hits += 1
+            else:
+                self._hits += 1
+        return (None, False) if entry is None else (entry["payload"], stale)
+
+    def set(self, key, payload, ttl=None):
+        """Store a payload for ttl seconds (defaults to the configured TTL)"""
+        if not self._available() or payload is None:
+            return
+        ttl = ttl or self.ttl
+        entry = {"fresh_until": time.time() + ttl, "payload": payload}
+        try:
+            # keep the entry around for max_stale more seconds to serve it stale
+            self.client.set(key, pack(entry), ex=ttl + self.max_stale)
+        except Exception as e:
+            self._failed("write", e)
+
+    def refresh(self, key, fetch):
+        """
+        Revalidate a stale entry on a background thread.
+
+        Args:
+            key: Cache key of the stale entry
+            fetch: Callable fetching and storing the fresh payload
+
+        Returns:
+            True if a refresh was scheduled, False if one is already running
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers,
+                    thread_name_prefix="forecast-refresh",
+                )
+            executor = self._executor
+
+        def run():
+            try:
+                fetch()
+                with self._lock:
+                    self._refreshes += 1
+            except Exception as e:
+                # the stale entry keeps being served until max_stale runs out
+                with self._lock:
+                    self._refresh_errors += 1
+                logger.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        executor.submit(run)
+        return True
+
+    def stats(self):
+        """
+        Report cache effectiveness.
+
+        Returns:
+            Dictionary with hit/miss/error counters, the hit ratio and
+            background refresh counters
+        """
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses
+            served = self._hits + self._stale_hits
+            return {
+                "enabled": self.enabled,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+                "refreshes": self._refreshes,
+                "refresh_errors": self._refresh_errors,
+                "refreshing": len(self._refreshing),
+                "ttl": self.ttl,
+                "max_stale": self.max_stale,
+            }
+
+
+# Shared instance, configured by create_app()
+forecast_cache = ForecastCache()
@@ -0,0 +1,328 @@
+# Offline US gazetteer.
+# Resolves postal codes and "City, ST" searches from a local, memory-mapped
+# index instead of a Nominatim round trip. The index is built once from a
+# GeoNames postal code dump (https://download.geonames.org/export/zip/US.zip):
+#
+#     python -m app.services.gazetteer build US.txt data/gazetteer.bin
+#
+# and loaded by create_app() when GAZETTEER_PATH points to it. Searches it
+# cannot answer fall back to Nominatim.
+
+import csv
+import json
+import logging
+import os
+import struct
+import sys
+import threading
+
+from app.services.geocode_cache import GeocodeCache
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+MAGIC = b"GAZ1"
+# arrays start on 8-byte boundaries so they can be memory-mapped directly
+ALIGN = 8
+
+
+def _city_key(city, state):
+    """Normalized "city:<city>|<st>" key, shared with the geocode cache"""
+    return GeocodeCache.make_key({"city": city, "state": state})
+
+
+def _postal_number(postal_code):
+    """Numeric value of a 5-digit ZIP (ZIP+4 suffixes are ignored), or None"""
+    code = "".join(str(postal_code).split())[:5]
+    return int(code) if len(code) == 5 and code.isdigit() else None
+
+
+def read_geonames(path):
+    """
+    Read a GeoNames postal code dump.
+
+    Args:
+        path: Tab-separated GeoNames file (e.g. US.txt)
+
+    Yields:
+        Tuples (postal_code, city, state_abbrev, lat, lon)
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f, delimiter="\t"):
+            # country, postal code, place, state name, state code, ..., lat, lon
+            if len(row) < 11 or row[0] != "US" or not row[9]:
+                continue
+            yield row[1], row[2], row[4], float(row[9]), float(row[10])
+
+
+def build(rows, path):
+    """
+    Write a gazetteer index.
+
+    City centroids are the mean of the ZIP centroids sharing the city name
+    and state.
+
+    Args:
+        rows: Iterable of (postal_code, city, state_abbrev, lat, lon)
+        path: Output file
+
+    Returns:
+        Tuple (number of postal codes, number of cities)
+    """
+    import numpy as np
+
+    zips = {}
+    cities = {}
+    for postal_code, city, state, lat, lon in rows:
+        number = _postal_number(postal_code)
+        if number is None:
+            continue
+        key = _city_key(city, state)
+        entry = cities.setdefault(key, [city, state, 0.0, 0.0, 0])
+        entry[2] += lat
+        entry[3] += lon
+        entry[4] += 1
+        zips[number] = (lat, lon, key)
+
+    city_keys = sorted(cities)
+    city_index = {key: i for i, key in enumerate(city_keys)}
+    zip_codes = sorted(zips)
+
+    def encoded(values):
+        values = [v.encode("utf-8") for v in values]
+        return np.array(values, dtype=f"S{max(map(len, values), default=1)}")
+
+    arrays = {
+        "zip_code": np.array(zip_codes, dtype="<u4"),
+        "zip_lat": np.array([zips[z][0] for z in zip_codes], dtype="<f4"),
+        "zip_lon": np.array([zips[z][1] for z in zip_codes], dtype="<f4"),
+        "zip_city": np.array([city_index[zips[z][2]] for z in zip_codes], dtype="<i4"),
+        "city_key": encoded(city_keys),
+        "city_name": encoded([cities[k][0] for k in city_keys]),
+        "city_state": encoded([cities[k][1] for k in city_keys]),
+        "city_lat": np.array(
+            [cities[k][2] / cities[k][4] for k in city_keys], dtype="<f4"
+        ),
+        "city_lon": np.array(
+            [cities[k][3] / cities[k][4] for k in city_keys], dtype="<f4"
+        ),
+    }
+
+    # header with each array's dtype, shape and offset, padded to ALIGN
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    header = json.dumps(layout).encode("utf-8")
+    data_start = -(-(len(MAGIC) + 4 + len(header)) // ALIGN) * ALIGN
+
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+
+    return len(zip_codes), len(city_keys)
+
+
+class Gazetteer:
+    """
+    Memory-mapped lookup of US postal code and city centroids.
+
+    Lookups are binary searches over sorted arrays, so they take
+    microseconds and the index is shared (through the page cache) by all
+    workers on a host.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Optional index file to load right away
+        """
+        self.path = None
+        self._arrays = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        if path:
+            self.load(path)
+
+    def init_app(self, app):
+        """
+        Load the index named by GAZETTEER_PATH, if any.
+
+        Args:
+            app: Flask application instance
+        """
+        path = app.config.get("GAZETTEER_PATH")
+        self._arrays = None
+        if path and os.path.exists(path):
+            self.load(path)
+        elif path:
+            logger.info(f"Gazetteer {path} not found, geocoding with Nominatim only")
+        app.extensions["gazetteer"] = self
+
+    @property
+    def loaded(self):
+        return self._arrays is not None
+
+    def load(self, path):
+        """
+        Memory-map an index written by build().
+
+        Args:
+            path: Index file
+        """
+        # numpy is only needed (and imported) once an index is configured
+        import numpy as np
+
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a gazetteer index")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            layout = json.loads(f.read(header_len))
+        data_start = -(-(len(MAGIC) + 4 + header_len) // ALIGN) * ALIGN
+
+        arrays = {}
+        for name, spec in layout.items():
+            shape = tuple(spec["shape"])
+            if not shape[0]:
+                arrays[name] = np.empty(shape, dtype=spec["dtype"])
+                continue
+            arrays[name] = np.memmap(
+                path,
+                dtype=spec["dtype"],
+                mode="r",
+                offset=data_start + spec["offset"],
+                shape=shape,
+            )
+        self._arrays = arrays
+        self.path = path
+        logger.info(
+            f"Gazetteer loaded from {path} ({len(arrays['zip_code'])} postal codes, "
+            f"{len(arrays['city_key'])} cities)"
+        )
+
+    @staticmethod
+    def _find(keys, value):
+        """Index of value in the sorted keys array, or -1"""
+        i = int(keys.searchsorted(value))
+        return i if i < len(keys) and keys[i] == value else -1
+
+    def _counted(self, result):
+        with self._lock:
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return result
+
+    def _city(self, i):
+        a = self._arrays
+        return a["city_name"][i].decode("utf-8"), a["city_state"][i].decode("utf-8")
+
+    def lookup_postal(self, postal_code):
+        """
+        Resolve a postal code.
+
+        Args:
+            postal_code: 5-digit ZIP (ZIP+4 is accepted)
+
+        Returns:
+            Location dictionary shaped like LocService.fetch_location
+            results, or None if the code is not in the index
+        """
+        if not self.loaded:
+            return None
+        number = _postal_number(postal_code)
+        if number is None:
+            return self._counted(None)
+
+        a = self._arrays
+        i = self._find(a["zip_code"], number)
+        if i < 0:
+            return self._counted(None)
+
+        city, state = self._city(int(a["zip_city"][i]))
+        return self._counted(
+            {
+                "lat": f"{a['zip_lat'][i]:.4f}",
+                "lon": f"{a['zip_lon'][i]:.4f}",
+                "postal_code": f"{number:05d}",
+                "city": city,
+                "state": state,
+            }
+        )
+
+    def lookup_city(self, city, state):
+        """
+        Resolve a "City, ST" search.
+
+        Args:
+            city: City name (case and spacing are ignored)
+            state: State abbreviation or full name
+
+        Returns:
+            Location dictionary shaped like LocService.fetch_location
+            results, or None if the city is not in the index
+        """
+        if not self.loaded:
+            return None
+
+        a = self._arrays
+        i = self._find(a["city_key"], _city_key(city, state).encode("utf-8"))
+        if i < 0:
+            return self._counted(None)
+
+        name, abbrev = self._city(i)
+        return self._counted(
+            {
+                "lat": f"{a['city_lat'][i]:.4f}",
+                "lon": f"{a['city_lon'][i]:.4f}",
+                "postal_code": "",
+                "city": name,
+                "state": abbrev,
+            }
+        )
+
+    def stats(self):
+        """
+        Report index size and lookup counters.
+
+        Returns:
+            Dictionary with the loaded path, entry counts and hits/misses
+        """
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "path": self.path,
+                "postal_codes": len(self._arrays["zip_code"]) if self.loaded else 0,
+                "cities": len(self._arrays["city_key"]) if self.loaded else 0,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+# Shared instance, configured by create_app()
+gazetteer = Gazetteer()
+
+
+def main(argv=None):
+    """Command line entry point: build <geonames file> <output file>"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] != "build":
+        print("usage: python -m app.services.gazetteer build US.txt gazetteer.bin")
+        return 2
+    zips, cities = build(read_geonames(argv[1]), argv[2])
+    print(f"Wrote {argv[2]}: {zips} postal codes, {cities} cities")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# Coordinate quantization.
+# Nominatim returns long decimal strings, so "27511" and "Cary, NC" produce
+# slightly different coordinates and separate cache entries even though the
+# forecast models only resolve ~1-11 km. Snapping to a grid before fetching
+# and caching lets nearby searches share one entry.
+
+import logging
+import threading
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class CoordinateGrid:
+    """
+    Snap coordinates to a regular lat/lon grid.
+
+    Also keeps a bounded record of the raw and snapped locations it has seen,
+    to report how many distinct upstream keys the snapping collapses.
+    """
+
+    def __init__(self, resolution=0.02, max_tracked=10000):
+        """
+        Args:
+            resolution: Grid spacing in degrees (0 disables snapping)
+            max_tracked: Cap on distinct locations recorded for the report
+        """
+        self.resolution = resolution
+        self.max_tracked = max_tracked
+        self._lock = threading.Lock()
+        self._raw_keys = set()
+        self._grid_keys = set()
+        self._lookups = 0
+
+    def init_app(self, app):
+        """
+        Configure the grid from the Flask config.
+
+        Args:
+            app: Flask application instance
+        """
+        self.resolution = app.config.get("COORD_GRID_RESOLUTION", self.resolution)
+        self.reset()
+        app.extensions["coordinate_grid"] = self
+
+    def snap(self, lat, lon):
+        """
+        Snap one coordinate pair to the grid.
+
+        Args:
+            lat: Latitude (number or numeric string)
+            lon: Longitude (number or numeric string)
+
+        Returns:
+            Tuple (lat, lon) of floats on the grid
+        """
+        lat, lon = float(lat), float(lon)
+        if not self.resolution:
+            return lat, lon
+
+        # decimals of the resolution, to drop float noise like 35.800000000001
+        decimals = max(0, len(f"{self.resolution:.10f}".rstrip("0").split(".")[1]))
+        return (
+            round(round(lat / self.resolution) * self.resolution, decimals),
+            round(round(lon / self.resolution) * self.resolution, decimals),
+        )
+
+    def snap_coords(self, coords):
+        """
+        Snap a coordinates dictionary and record it for the collapse report.
+
+        Args:
+            coords: Dictionary containing latitude and longitude
+
+        Returns:
+            New dictionary with snapped "lat" and "lon"
+        """
+        lat, lon = self.snap(coords["lat"], coords["lon"])
+
+        with self._lock:
+            self._lookups += 1
+            if len(self._raw_keys) < self.max_tracked:
+                self._raw_keys.add(
+                    (round(float(coords["lat"]), 6), round(float(coords["lon"]), 6))
+                )
+                self._grid_keys.add((lat, lon))
+
+        return coords | {"lat": lat, "lon": lon}
+
+    def stats(self):
+        """
+        Report how much the grid collapses distinct locations.
+
+        Returns:
+            Dictionary with distinct raw and snapped location counts
+        """
+        with self._lock:
+            raw, grid = len(self._raw_keys), len(self._grid_keys)
+            return {
+                "resolution": self.resolution,
+                "lookups": self._lookups,
+                "raw_keys": raw,
+                "grid_keys": grid,
+                "collapsed_keys": raw - grid,
+                "collapse_ratio": round(1 - grid / raw, 3) if raw else 0.0,
+            }
+
+    def reset(self):
+        """Clear the collapse report"""
+        with self._lock:
+            self._raw_keys.clear()
+            self._grid_keys.clear()
+            self._lookups = 0
+
+
+# Shared instance, configured by create_app()
+coordinate_grid = CoordinateGrid()
@@ -0,0 +1,328 @@
+# Geocoding result cache.
+# Every /search and /api/location call used to hit Nominatim, whose usage
+# policy allows one request per second, even for postal codes searched
+# thousands of times a day. Results are cached by normalized query in an
+# in-process LRU backed by an optional shared Redis or SQLite store.
+# "No US location found" answers are cached too, with a shorter TTL.
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils.constants import STATE_TO_ABBREV
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+# Full state names in lower case -> abbreviation, for key normalization
+_STATE_ABBREV = {name.lower(): abbrev for name, abbrev in STATE_TO_ABBREV.items()}
+
+
+def _normalize(value):
+    """Lower-case and collapse whitespace"""
+    return " ".join(str(value).split()).lower()
+
+
+class RedisGeocodeBackend:
+    """Shared geocode store in Redis (entries expire through Redis TTLs)"""
+
+    def __init__(self, client, prefix="geocode"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        data = self.client.get(f"{self.prefix}:{key}")
+        return None if data is None else data.decode("utf-8")
+
+    def set(self, key, value, ttl):
+        self.client.set(f"{self.prefix}:{key}", value, ex=ttl)
+
+
+class SQLiteGeocodeBackend:
+    """
+    Persistent geocode store in a local SQLite file.
+
+    Expired rows (negative entries expire within the hour) are deleted when
+    the file is opened and every purge_every writes; the same purge trims
+    the table to max_rows by dropping the rows closest to expiry.
+    """
+
+    def __init__(self, path=".geocode_cache.sqlite", max_rows=100_000, purge_every=256):
+        """
+        Args:
+            path: SQLite file
+            max_rows: Rows kept at most
+            purge_every: Writes between purges of expired rows
+        """
+        self.path = path
+        self.max_rows = max_rows
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS geocode_expires ON geocode (expires)"
+            )
+            self._purge()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM geocode WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key, value, ttl):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode (key, value, expires) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._purge()
+
+    def count(self):
+        """Rows in the table, expired or not"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+
+    def _purge(self):
+        # callers hold the lock inside a transaction
+        self._conn.execute("DELETE FROM geocode WHERE expires < ?", (time.time(),))
+        self._conn.execute(
+            "DELETE FROM geocode WHERE key IN (SELECT key FROM geocode "
+            "ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+
+
+class GeocodeCache:
+    """
+    Two-level cache of LocService lookups.
+
+    Lookups check an in-process LRU first, then the optional backend (Redis
+    or SQLite, shared by workers and kept across restarts). A cached empty
+    result means Nominatim found no US location; it is stored with
+    negative_ttl so typos do not keep hitting the API.
+
+    Backend failures never fail a search: they are logged and the lookup
+    falls through to Nominatim.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        max_entries=1024,
+        ttl=30 * 24 * 3600,
+        negative_ttl=3600,
+        enabled=False,
+    ):
+        """
+        Args:
+            backend: Optional RedisGeocodeBackend / SQLiteGeocodeBackend
+            max_entries: Size of the in-process LRU
+            ttl: Seconds a found location is kept
+            negative_ttl: Seconds a "not found" answer is kept
+            enabled: Cache lookups at all (off until init_app enables it)
+        """
+        self.backend = backend
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    def init_app(self, app):
+        """
+        Configure the cache from the Flask config.
+
+        Args:
+            app: Flask application instance
+        """
+        self.enabled = app.config.get("GEOCODE_CACHE_ENABLED", False)
+        self.max_entries = app.config.get("GEOCODE_CACHE_MAX_ENTRIES", self.max_entries)
+        self.ttl = app.config.get("GEOCODE_CACHE_TTL", self.ttl)
+        self.negative_ttl = app.config.get(
+            "GEOCODE_CACHE_NEGATIVE_TTL", self.negative_ttl
+        )
+        self.backend = (
+            self.create_backend(
+                app.config.get("GEOCODE_CACHE_BACKEND", "memory"), app.config
+            )
+            if self.enabled
+            else None
+        )
+        self.clear()
+        app.extensions["geocode_cache"] = self
+
+    @staticmethod
+    def create_backend(name, config):
+        """
+        Build the shared backend named by GEOCODE_CACHE_BACKEND.
+
+        Args:
+            name: "memory" (LRU only), "redis" or "sqlite"
+            config: Flask config holding the backend settings
+
+        Returns:
+            Backend instance, or None for the memory-only cache
+        """
+        if name == "redis":
+            from app.services.forecast_cache import ForecastCache
+
+            return RedisGeocodeBackend(
+                ForecastCache.connect(config.get("GEOCODE_CACHE_URL", "")),
+                prefix=config.get("GEOCODE_CACHE_PREFIX", "geocode"),
+            )
+        if name == "sqlite":
+            return SQLiteGeocodeBackend(
+                config.get("GEOCODE_CACHE_PATH", ".geocode_cache.sqlite"),
+                max_rows=config.get("GEOCODE_CACHE_MAX_ROWS", 100_000),
+            )
+        if name != "memory":
+            raise ValueError(f"Unknown geocode cache backend: {name}")
+        return None
+
+    @staticmethod
+    def make_key(params):
+        """
+        Build the cache key for a Nominatim query.
+
+        "27587", " 27587 " and "Cary, North Carolina" / "cary, nc" style
+        variations of the same search map to the same key.
+
+        Args:
+            params: Query parameters passed to Nominatim
+
+        Returns:
+            Key string "zip:<postal code>" or "city:<city>|<state>"
+        """
+        if params.get("postalcode"):
+            return "zip:" + "".join(str(params["postalcode"]).split()).upper()
+
+        city = _normalize(params.get("city") or "")
+        state = _normalize(params.get("state") or "")
+        state = _STATE_ABBREV.get(state, state).lower()
+        return f"city:{city}|{state}"
+
+    def get(self, key):
+        """
+        Look up a location.
+
+        Returns:
+            The cached location dictionary, {} for a cached "not found",
+            or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        value = None
+        if entry is not None:
+            value = entry[1]
+        elif self.backend is not None:
+            try:
+                data = self.backend.get(key)
+            except Exception as e:
+                self._failed("read", e)
+                data = None
+            if data is not None:
+                value = json.loads(data)
+                # promote to the LRU; the backend keeps the authoritative expiry
+                self._remember(key, value, self.negative_ttl)
+
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            elif value:
+                self._hits += 1
+            else:
+                self._negative_hits += 1
+        return value
+
+    def set(self, key, location):
+        """
+        Store a lookup result.
+
+        Args:
+            key: Key built by make_key()
+            location: Location dictionary, or {} when nothing was found
+        """
+        if not self.enabled:
+            return
+
+        ttl = self.ttl if location else self.negative_ttl
+        self._remember(key, location, ttl)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, json.dumps(location), ttl)
+            except Exception as e:
+                self._failed("write", e)
+
+    def _remember(self, key, location, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, location)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _failed(self, action, error):
+        with self._lock:
+            self._errors += 1
+        logger.warning(f"Geocode cache {action} failed: {error}")
+
+    def clear(self):
+        """Drop the in-process entries and counters"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._negative_hits = self._misses = self._errors = 0
+
+    def stats(self):
+        """
+        Report cache effectiveness.
+
+        Returns:
+            Dictionary with hit/miss counters and the hit ratio
+        """
+        with self._lock:
+            served = self._hits + self._negative_hits
+            lookups = served + self._misses
+            return {
+                "enabled": self.enabled,
+                "backend": type(self.backend).__name__ if self.backend else "memory",
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+            }
+
+
+# Shared instance, configured by create_app()
+geocode_cache = GeocodeCache()
@@ -3,18 +3,28 @@
 # using logging instead of print
 
 
-import requests
 import logging
 
 from app.utils.constants import STATE_TO_ABBREV
+from app.services.geocode_cache import geocode_cache
+from app.services.gazetteer import gazetteer as shared_gazetteer
+from app.services.nominatim_client import NOMINATIM_HEADERS, nominatim_pool
+from app.services.rate_limit import RateLimitExceeded, nominatim_limiter
+from app.services.single_flight import SingleFlight
 
 # Create module-level logger
 logger = logging.getLogger(__name__)
 
+# Identical searches waiting for Nominatim share one call
+_pending_lookups = SingleFlight()
+
 
 class LocService:
-    def __init__(self, location):
-        """Initialize with location data"""
+    def __init__(self, location, cache=None, gazetteer=None, limiter=None):
+        """Initialize with location data (and optional cache, gazetteer, limiter)"""
+        self.cache = cache or geocode_cache
+        self.gazetteer = gazetteer or shared_gazetteer
+        self.limiter = limiter or nominatim_limiter
         # Check if location dictionary has required keys
         if location and len(location) > 0:
             # Use direct dictionary access with proper error handling
@@ -33,48 +43,70 @@ class LocService:
             self.loc = {"postal_code": None, "city": None, "state": None}
 
     def fetch_location(self, params, s_type=0):
-        """Fetch location data from Nominatim API"""
-        url = "https://nominatim.openstreetmap.org/search"
-        headers = {"User-Agent": "weather-dashboard-app/1.0 (tony@example.com)"}
+        """
+        Fetch location data from Nominatim API
+
+        Raises:
+            RateLimitExceeded: if Nominatim's request queue is full
+        """
+        # Repeat searches are answered from the geocode cache
+        cache_key = self.cache.make_key(params)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Geocode cache hit for {cache_key}")
+            return dict(cached)
+
+        location = _pending_lookups.do(
+            cache_key, lambda: self._query_nominatim(params, s_type, cache_key)
+        )
+        return dict(location)
+
+    def _query_nominatim(self, params, s_type, cache_key):
+        """Call Nominatim within its rate limit and cache the answer"""
+        # Queue for a slot; a full queue raises RateLimitExceeded to the caller
+        self.limiter.acquire()
 
         try:
             logger.debug(f"Calling Nominatim API with params: {params}")
-            response = requests.get(url, params=params, headers=headers)
-            data = response.json()
-
-            # Find US location in results
-            index_num = -1
-            for i in range(len(data)):
-                if "United States" in data[i]["display_name"]:
-                    index_num = i
-                    break
-
-            # Handle missing data cases
-            if not data:
-                logger.warning("No location data returned from API")
-                return {}
-
-            if index_num == -1:
-                # Use proper logging instead of print
-                logger.warning(f"No US location found for params: {params}")
-                return {}
-
-            # Process location data
-            loc_str = [
-                part.strip() for part in data[index_num]["display_name"].split(",")
-            ]
-
-            # Create return data structure
-            return_data = self._process_location_components(
-                loc_str, data[index_num], params, s_type
-            )
-
-            return return_data
+            response = nominatim_pool.get(params)
+            return self._parse_nominatim(response.json(), params, s_type, cache_key)
 
         except Exception as e:
             logger.error(f"Error fetching location data: {e}")
             return {}
 
+    def _parse_nominatim(self, data, params, s_type, cache_key):
+        """Pick the US result of a Nominatim search and cache it"""
+        # Find US location in results
+        index_num = -1
+        for i in range(len(data)):
+            if "United States" in data[i]["display_name"]:
+                index_num = i
+                break
+
+        # Handle missing data cases
+        if not data:
+            logger.warning("No location data returned from API")
+            self.cache.set(cache_key, {})
+            return {}
+
+        if index_num == -1:
+            # Use proper logging instead of print
+            logger.warning(f"No US location found for params: {params}")
+            self.cache.set(cache_key, {})
+            return {}
+
+        # Process location data
+        loc_str = [part.strip() for part in data[index_num]["display_name"].split(",")]
+
+        # Create return data structure
+        return_data = self._process_location_components(
+            loc_str, data[index_num], params, s_type
+        )
+
+        self.cache.set(cache_key, return_data)
+        return return_data
+
     def _process_location_components(self, components, location_data, params, s_type):
         """Process location components based on format and search type"""
         return_data = {
@@ -146,31 +178,51 @@ class LocService:
 
         return return_data
 
-    def get_lat_lon(self, location):
-        """Get location data from postal code or city/state"""
-        params = {}
-        search_type = 0
+    def _search(self, location):
+        """
+        Build the Nominatim search for a location.
 
+        Returns:
+            Tuple (params, search type), or (None, None) when the location
+            has neither a postal code nor a city and state
+        """
         try:
             if location["postal_code"]:
                 params = {
                     "postalcode": location["postal_code"],
                     "format": "json",
                 }
+                return params, 0
             elif location["city"] and location["state"]:
                 params = {
                     "city": location["city"],
                     "state": location["state"],
                     "format": "json",
                 }
-                search_type = 1
+                return params, 1
             else:
                 logger.warning("Empty location data provided")
-                return {}
+                return None, None
         except KeyError as e:
             logger.error(f"Missing key in location data: {e}")
+            return None, None
+
+    def _lookup_local(self, params, search_type):
+        """Answer from the local gazetteer when it knows the place"""
+        if search_type == 0:
+            return self.gazetteer.lookup_postal(params["postalcode"])
+        return self.gazetteer.lookup_city(params["city"], params["state"])
+
+    def get_lat_lon(self, location):
+        """Get location data from postal code or city/state"""
+        params, search_type = self._search(location)
+        if params is None:
             return {}
 
+        local = self._lookup_local(params, search_type)
+        if local is not None:
+            return local
+
         return self.fetch_location(params, s_type=search_type)
 
     def show_lat_lon(self):
@@ -178,6 +230,8 @@ class LocService:
         try:
             # Use the get_lat_lon method to avoid code duplication
             return self.get_lat_lon(self.loc)
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             logger.error(f"Error in show_lat_lon: {e}")
             return {}
@@ -0,0 +1,138 @@
+# Pooled HTTP session for Nominatim.
+# LocService called requests.get() for every geocode, opening (and TLS
+# handshaking) a new connection each time. With NOMINATIM_POOL_MAXSIZE set,
+# calls share one keep-alive requests.Session instead; under the gevent
+# server (serve.py) its sockets are cooperative, so a greenlet waiting on
+# Nominatim does not block the others.
+
+import logging
+import threading
+
+import requests
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+NOMINATIM_HEADERS = {"User-Agent": "weather-dashboard-app/1.0 (tony@example.com)"}
+
+
+class NominatimClientPool:
+    """
+    Process-wide Nominatim HTTP client.
+
+    Without a pool size, calls go through requests.get() as before; with
+    one, they share a lazily built keep-alive session.
+    """
+
+    def __init__(self, url=NOMINATIM_URL, pool_maxsize=0, pool_block=False, timeout=5):
+        """
+        Args:
+            url: Nominatim search endpoint
+            pool_maxsize: Connections kept open (0 disables the session)
+            pool_block: Wait for a free connection instead of opening
+                extra, unpooled ones when all are busy
+            timeout: Seconds allowed per call
+        """
+        self._lock = threading.Lock()
+        self._session = None
+        self._calls = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self.configure(
+            url=url, pool_maxsize=pool_maxsize, pool_block=pool_block, timeout=timeout
+        )
+
+    def init_app(self, app):
+        """
+        Configure the client from NOMINATIM_URL, NOMINATIM_POOL_MAXSIZE,
+        NOMINATIM_POOL_BLOCK and API_TIMEOUT.
+
+        Args:
+            app: Flask application instance
+        """
+        self.configure(
+            url=app.config.get("NOMINATIM_URL", self.url),
+            pool_maxsize=app.config.get("NOMINATIM_POOL_MAXSIZE", self.pool_maxsize),
+            pool_block=app.config.get("NOMINATIM_POOL_BLOCK", self.pool_block),
+            timeout=app.config.get("API_TIMEOUT", self.timeout),
+        )
+        app.extensions["nominatim_pool"] = self
+
+    def configure(self, url, pool_maxsize, pool_block, timeout):
+        """Update settings and drop the current session so it is rebuilt."""
+        with self._lock:
+            self.url = url
+            self.pool_maxsize = pool_maxsize
+            self.pool_block = pool_block
+            self.timeout = timeout
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        with self._lock:
+            if self._session is None:
+                from requests.adapters import HTTPAdapter
+
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.pool_maxsize,
+                    pool_block=self.pool_block,
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(NOMINATIM_HEADERS)
+                self._session = session
+                logger.info(f"Nominatim session created (maxsize={self.pool_maxsize})")
+            return self._session
+
+    def get(self, params):
+        """
+        Run a Nominatim search.
+
+        Args:
+            params: Query parameters of the search
+
+        Returns:
+            requests.Response
+        """
+        with self._lock:
+            self._calls += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            if not self.pool_maxsize:
+                return requests.get(
+                    self.url,
+                    params=params,
+                    headers=NOMINATIM_HEADERS,
+                    timeout=self.timeout,
+                )
+            return self._get_session().get(
+                self.url, params=params, timeout=self.timeout
+            )
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self):
+        """
+        Report client usage.
+
+        Returns:
+            Dictionary with call counters and the pool size
+        """
+        with self._lock:
+            return {
+                "pooled": bool(self.pool_maxsize),
+                "pool_maxsize": self.pool_maxsize,
+                "calls": self._calls,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+            }
+
+
+# Shared instance, configured by create_app()
+nominatim_pool = NominatimClientPool()
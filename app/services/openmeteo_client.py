@@ -0,0 +1,244 @@
+# Process-wide pooled Open-Meteo client.
+# WeatherService used to build a CachedSession, a retry wrapper and an
+# openmeteo_requests.Client on every call; the pool below builds them once
+# (from create_app) and shares them between all request threads.
+
+import logging
+import threading
+from contextlib import contextmanager
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+OPENMETEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Defaults used until init_app() is called (e.g. in unit tests)
+DEFAULT_SETTINGS = {
+    "url": OPENMETEO_URL,
+    "cache_name": ".cache",
+    "cache_backend": "sqlite",
+    "cache_expire": 3600,
+    "retries": 5,
+    "backoff_factor": 0.2,
+    "pool_connections": 10,
+    "pool_maxsize": 20,
+    "pool_block": False,
+    "keep_alive": True,
+    "timeout": 5,
+}
+
+# Flask config key -> setting name
+CONFIG_KEYS = {
+    "OPENMETEO_URL": "url",
+    "OPENMETEO_CACHE_NAME": "cache_name",
+    "OPENMETEO_CACHE_BACKEND": "cache_backend",
+    "OPENMETEO_CACHE_EXPIRE": "cache_expire",
+    "OPENMETEO_RETRIES": "retries",
+    "OPENMETEO_BACKOFF_FACTOR": "backoff_factor",
+    "OPENMETEO_POOL_CONNECTIONS": "pool_connections",
+    "OPENMETEO_POOL_MAXSIZE": "pool_maxsize",
+    "OPENMETEO_POOL_BLOCK": "pool_block",
+    "OPENMETEO_KEEP_ALIVE": "keep_alive",
+    "API_TIMEOUT": "timeout",
+}
+
+
+class OpenMeteoClientPool:
+    """
+    Thread-safe registry holding one pooled Open-Meteo client per process.
+
+    The client is created lazily on first use (or eagerly by init_app) and
+    reused by every WeatherService call, so connection setup, the SQLite
+    cache file and the retry adapter are paid for once instead of per call.
+    """
+
+    def __init__(self, **settings):
+        self.settings = DEFAULT_SETTINGS | settings
+        self._lock = threading.Lock()
+        self._client = None
+        self._session = None
+        self._adapter = None
+
+        # utilization metrics
+        self._calls = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+    def init_app(self, app):
+        """
+        Configure the pool from the Flask config.
+
+        The client (and requests_cache / openmeteo_requests) is built on the
+        first forecast request, keeping worker boot fast. Set
+        OPENMETEO_PRELOAD to build it here instead, e.g. in a preloading
+        gunicorn master.
+
+        Args:
+            app: Flask application instance
+        """
+        settings = {
+            name: app.config[key]
+            for key, name in CONFIG_KEYS.items()
+            if key in app.config
+        }
+        self.configure(**settings)
+        if app.config.get("OPENMETEO_PRELOAD", False):
+            self.get_client()
+        app.extensions["openmeteo_pool"] = self
+
+    def configure(self, **settings):
+        """Update settings and drop the current client so it is rebuilt."""
+        with self._lock:
+            self.settings = self.settings | settings
+            self._close_locked()
+
+    def get_client(self):
+        """
+        Get the shared openmeteo_requests.Client, building it on first use.
+
+        Returns:
+            openmeteo_requests.Client bound to the pooled session
+        """
+        client = self._client
+        if client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._build_client()
+                client = self._client
+        return client
+
+    def _build_client(self):
+        """Build the cached, retrying, connection-pooled session and client."""
+        import openmeteo_requests
+        import requests_cache
+        from requests.adapters import HTTPAdapter
+        from retry_requests import retry
+
+        settings = self.settings
+
+        # Setup the Open-Meteo API client with cache and retry on error
+        cache_session = requests_cache.CachedSession(
+            settings["cache_name"],
+            backend=settings["cache_backend"],
+            expire_after=settings["cache_expire"],
+        )
+        retry_session = retry(
+            cache_session,
+            retries=settings["retries"],
+            backoff_factor=settings["backoff_factor"],
+        )
+
+        # Re-mount with a sized connection pool, keeping the retry policy
+        max_retries = retry_session.get_adapter("https://").max_retries
+        adapter = HTTPAdapter(
+            pool_connections=settings["pool_connections"],
+            pool_maxsize=settings["pool_maxsize"],
+            pool_block=settings["pool_block"],
+            max_retries=max_retries,
+        )
+        retry_session.mount("http://", adapter)
+        retry_session.mount("https://", adapter)
+
+        if not settings["keep_alive"]:
+            retry_session.headers["Connection"] = "close"
+
+        logger.info(
+            f"Open-Meteo client pool created "
+            f"(maxsize={settings['pool_maxsize']}, keep_alive={settings['keep_alive']})"
+        )
+
+        self._session = retry_session
+        self._adapter = adapter
+        return openmeteo_requests.Client(session=retry_session)
+
+    @contextmanager
+    def _track(self):
+        """Count in-flight calls for the utilization metrics."""
+        with self._lock:
+            self._calls += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def weather_api(self, params, url=None, refresh=False):
+        """
+        Call the Open-Meteo forecast API through the shared client.
+
+        Args:
+            params: Dictionary containing parameters for the API request
+            url: Optional endpoint override (defaults to the configured URL)
+            refresh: Skip the HTTP cache and always ask Open-Meteo (used
+                when revalidating a stale forecast)
+
+        Returns:
+            List of WeatherApiResponse objects, one per location
+        """
+        client = self.get_client()
+        # force_refresh is understood by the requests_cache session
+        kwargs = {"force_refresh": True} if refresh else {}
+        with self._track():
+            return client.weather_api(
+                url or self.settings["url"],
+                params=params,
+                timeout=self.settings["timeout"],
+                **kwargs,
+            )
+
+    def stats(self):
+        """
+        Report pool utilization.
+
+        Returns:
+            Dictionary with call counters and connection pool usage
+        """
+        with self._lock:
+            stats = {
+                "calls": self._calls,
+                "errors": self._errors,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "pool_maxsize": self.settings["pool_maxsize"],
+                "keep_alive": self.settings["keep_alive"],
+                "hosts": 0,
+                "connections_opened": 0,
+                "idle_connections": 0,
+            }
+            if self._adapter is not None:
+                pools = self._adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    stats["hosts"] += 1
+                    stats["connections_opened"] += pool.num_connections
+                    # the pool queue holds None placeholders for unopened slots
+                    if pool.pool is not None:
+                        stats["idle_connections"] += sum(
+                            1 for conn in pool.pool.queue if conn is not None
+                        )
+        return stats
+
+    def close(self):
+        """Close the pooled session (it is rebuilt on next use)."""
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self):
+        if self._session is not None:
+            self._session.close()
+        self._client = None
+        self._session = None
+        self._adapter = None
+
+
+# Shared instance, configured by create_app()
+openmeteo_pool = OpenMeteoClientPool()
@@ -0,0 +1,52 @@
+# Lightweight decoding of Open-Meteo FlatBuffers time axes.
+# The decoders used to build pd.date_range / DataFrame objects and convert
+# time zones just to produce naive local timestamps. Open-Meteo timestamps
+# are plain Unix seconds on a regular grid, so the axis is an arange and the
+# local time is that plus UtcOffsetSeconds(); NumPy's datetime64 does the
+# formatting without pandas.
+
+import numpy as np
+
+
+def block_epochs(block):
+    """
+    Timestamps of a Hourly()/Daily() block.
+
+    Args:
+        block: VariablesWithTime block of an Open-Meteo response
+
+    Returns:
+        int64 NumPy array of Unix seconds, one per value of the block
+    """
+    return np.arange(block.Time(), block.TimeEnd(), block.Interval(), dtype=np.int64)
+
+
+def to_local(epochs, utc_offset):
+    """
+    Shift Unix seconds to local wall-clock seconds.
+
+    Args:
+        epochs: Array of Unix seconds
+        utc_offset: Location's offset in seconds (response.UtcOffsetSeconds())
+
+    Returns:
+        datetime64[s] NumPy array of local times
+    """
+    return (np.asarray(epochs, dtype=np.int64) + utc_offset).astype("datetime64[s]")
+
+
+def local_datetimes(epochs, utc_offset):
+    """Naive local datetime objects for each timestamp"""
+    return to_local(epochs, utc_offset).tolist()
+
+
+def local_strings(epochs, utc_offset):
+    """Local timestamps formatted as "%Y-%m-%d %H:%M:%S" strings"""
+    iso = np.datetime_as_string(to_local(epochs, utc_offset), unit="s")
+    return np.char.replace(iso, "T", " ").tolist()
+
+
+def local_dates(epochs, utc_offset):
+    """Local dates formatted as "%Y-%m-%d" strings"""
+    local = to_local(epochs, utc_offset).astype("datetime64[D]")
+    return np.datetime_as_string(local, unit="D").tolist()
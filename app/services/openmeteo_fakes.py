@@ -0,0 +1,115 @@
+# Minimal stand-ins for openmeteo_sdk response objects, used to exercise
+# WeatherService decoding without calling the Open-Meteo API. The unit tests
+# and the benchmarks both build their canned forecasts from here.
+
+import numpy as np
+
+
+class FakeVariable:
+    def __init__(self, values):
+        self.values = np.asarray(values)
+
+    def Value(self):
+        return float(self.values)
+
+    def ValuesAsNumpy(self):
+        return self.values.astype(np.float32)
+
+    def ValuesInt64AsNumpy(self):
+        return self.values.astype(np.int64)
+
+
+class FakeBlock:
+    def __init__(self, variables, time=0, interval=3600):
+        self.variables = [FakeVariable(v) for v in variables]
+        self.time = time
+        self.interval = interval
+
+    def Variables(self, i):
+        return self.variables[i]
+
+    def Time(self):
+        return self.time
+
+    def TimeEnd(self):
+        return self.time + self.interval * len(np.atleast_1d(self.variables[0].values))
+
+    def Interval(self):
+        return self.interval
+
+
+class FakeResponse:
+    def __init__(
+        self,
+        current=None,
+        hourly=None,
+        daily=None,
+        timezone=b"America/New_York",
+        utc_offset=-4 * 3600,
+        lat=35.79,
+        lon=-78.78,
+    ):
+        self.current = current
+        self.hourly = hourly
+        self.daily = daily
+        self.timezone = timezone
+        self.utc_offset = utc_offset
+        self.lat = lat
+        self.lon = lon
+
+    def Current(self):
+        return self.current
+
+    def Hourly(self):
+        return self.hourly
+
+    def Daily(self):
+        return self.daily
+
+    def Timezone(self):
+        return self.timezone
+
+    def UtcOffsetSeconds(self):
+        return self.utc_offset
+
+    def Latitude(self):
+        return self.lat
+
+    def Longitude(self):
+        return self.lon
+
+
+# 2025-05-03 00:00 America/New_York (EDT) as a UTC epoch
+DAY0 = 1746244800
+
+
+def make_bundle_response(days=7, **kwargs):
+    """Build a response carrying the current, hourly and daily bundle blocks"""
+    hours = days * 24
+    current = FakeBlock([70.6, 1, 8.24, 2, 72.3, 0.0], time=DAY0 + 9 * 3600)
+    hourly = FakeBlock(
+        [
+            np.linspace(60, 80, hours),
+            np.full(hours, 3),
+            np.full(hours, 10),
+            # daytime 07:00-19:00, as the daily sunrise/sunset below
+            ((np.arange(hours) % 24 >= 7) & (np.arange(hours) % 24 < 20)).astype(
+                np.float32
+            ),
+        ],
+        time=DAY0,
+    )
+    daily = FakeBlock(
+        [
+            np.arange(days) + 80.0,
+            np.arange(days) + 60.0,
+            np.full(days, 6.55),
+            np.full(days, 20),
+            np.arange(days) % 4,
+            DAY0 + np.arange(days) * 86400 + 6 * 3600 + 30 * 60,
+            DAY0 + np.arange(days) * 86400 + 20 * 3600,
+        ],
+        time=DAY0,
+        interval=86400,
+    )
+    return FakeResponse(current=current, hourly=hourly, daily=daily, **kwargs)
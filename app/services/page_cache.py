@@ -0,0 +1,200 @@
+# Rendered page cache for the home, forecast and hourly views.
+# A page hit used to rerun the geocode/forecast lookups, the unit
+# conversions and the Jinja rendering, although the HTML only changes with
+# the location, the unit preferences and the hour. PageCache keeps the
+# rendered HTML in an in-process LRU keyed by (grid cell, units, template,
+# variant, time bucket, forecast generation): repeat views skip all of it.
+# Storing a fresh forecast for a grid cell bumps its generation, so pages
+# rendered from the previous forecast are never served again. Each page keeps
+# its ETag, so conditional GETs of cached pages are answered without hashing.
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from werkzeug.http import generate_etag
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class PageCache:
+    """
+    In-process LRU of rendered pages with per-location invalidation.
+
+    Entries expire after ttl seconds and whenever the time bucket changes
+    (pages show the current hour). Invalidation is per process: other
+    workers drop their copies through the TTL.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300, bucket=3600, enabled=False):
+        """
+        Args:
+            max_entries: Pages kept in memory
+            ttl: Seconds a rendered page is served
+            bucket: Seconds per time bucket (3600: pages change every hour)
+            enabled: Cache pages at all (off until init_app enables it)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.bucket = bucket
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def init_app(self, app):
+        """
+        Configure the cache from PAGE_CACHE_ENABLED, PAGE_CACHE_MAX_ENTRIES,
+        PAGE_CACHE_TTL and PAGE_CACHE_BUCKET.
+
+        Args:
+            app: Flask application instance
+        """
+        self.enabled = app.config.get("PAGE_CACHE_ENABLED", False)
+        self.max_entries = app.config.get("PAGE_CACHE_MAX_ENTRIES", self.max_entries)
+        self.ttl = app.config.get("PAGE_CACHE_TTL", self.ttl)
+        self.bucket = app.config.get("PAGE_CACHE_BUCKET", self.bucket)
+        self.clear()
+        app.extensions["page_cache"] = self
+
+    @staticmethod
+    def _cell(lat, lon):
+        # snapped coordinates may arrive as floats or strings
+        return (round(float(lat), 4), round(float(lon), 4))
+
+    def make_key(self, coords, units, template, variant=None, now=None):
+        """
+        Build the key of a rendered page.
+
+        Build the key before fetching the page's data: a forecast stored
+        meanwhile then makes the page's entry unreachable.
+
+        Args:
+            coords: Snapped coordinates (lat/lon) of the page
+            units: Tuple of the temperature, wind and precipitation units
+            template: Template the page is rendered with
+            variant: Other inputs of the page (e.g. the hourly length)
+            now: Unix time (defaults to now)
+
+        Returns:
+            Hashable key
+        """
+        cell = self._cell(coords["lat"], coords["lon"])
+        now = time.time() if now is None else now
+        with self._lock:
+            generation = self._generations.get(cell, 0)
+        return (
+            cell,
+            tuple(units),
+            template,
+            variant,
+            int(now // self.bucket),
+            generation,
+        )
+
+    def lookup(self, key):
+        """
+        Look up a rendered page and its ETag.
+
+        Returns:
+            Tuple (HTML, ETag); both None on a miss
+        """
+        if not self.enabled:
+            return None, None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < now:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1], entry[2]
+
+    def get(self, key):
+        """
+        Look up a rendered page.
+
+        Returns:
+            The page's HTML, or None on a miss
+        """
+        return self.lookup(key)[0]
+
+    def set(self, key, html, etag=None):
+        """
+        Store a rendered page.
+
+        Args:
+            key: Key built by make_key()
+            html: Rendered page
+            etag: ETag of the page (computed from html when omitted)
+        """
+        if not self.enabled:
+            return
+
+        etag = etag or generate_etag(html.encode("utf-8"))
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, html, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, lat, lon):
+        """
+        Retire the pages of a grid cell after its forecast changed.
+
+        Args:
+            lat: Snapped latitude (as sent to Open-Meteo)
+            lon: Snapped longitude
+        """
+        if not self.enabled:
+            return
+
+        cell = self._cell(lat, lon)
+        with self._lock:
+            self._generations[cell] = self._generations.get(cell, 0) + 1
+            self._invalidations += 1
+            if len(self._generations) > 4 * self.max_entries:
+                # forgetting a generation would revive retired pages, so
+                # bound the table by starting over
+                self._entries.clear()
+                self._generations.clear()
+
+    def clear(self):
+        """Drop all pages and counters"""
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._hits = self._misses = self._invalidations = 0
+
+    def stats(self):
+        """
+        Report cache effectiveness.
+
+        Returns:
+            Dictionary with hit/miss counters and the hit ratio
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# Shared instance, configured by create_app()
+page_cache = PageCache()
@@ -0,0 +1,195 @@
+# Outbound rate limiting.
+# Nominatim's usage policy allows one request per second, but bursts of
+# /search requests used to call it concurrently from every worker and got
+# throttled. RateLimiter spaces calls out: callers queue for the next free
+# slot, and give up with RateLimitExceeded when that slot is further away
+# than max_wait instead of piling up behind a blocked API.
+
+import logging
+import threading
+import time
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """The upstream API is saturated; the caller should retry later"""
+
+    def __init__(self, name, retry_after):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(
+            f"{name} is busy, retry in {retry_after:.1f}s (rate limit queue full)"
+        )
+
+
+class RateLimiter:
+    """
+    Token bucket of rate calls per second with bursts of up to burst calls.
+
+    Implemented as GCRA: the state is a single "theoretical arrival time"
+    (TAT), so the in-process variant keeps it in an attribute and the Redis
+    variant keeps it in one key updated with WATCH/MULTI, letting all
+    workers share one budget.
+    """
+
+    def __init__(
+        self, name, rate=1.0, burst=1, max_wait=5.0, client=None, prefix="ratelimit"
+    ):
+        """
+        Args:
+            name: Name of the limited API (part of the Redis key and errors)
+            rate: Allowed calls per second (None disables the limit)
+            burst: Calls allowed back to back before spacing kicks in
+            max_wait: Longest a caller queues for a slot before giving up
+            client: Optional Redis client to share the budget between workers
+            prefix: Prefix of the Redis key
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.client = client
+        self.prefix = prefix
+
+        self._lock = threading.Lock()
+        self._tat = 0.0
+        self._granted = 0
+        self._rejected = 0
+        self._waiting = 0
+        self._waited = 0.0
+
+    def init_app(self, app, client=None):
+        """
+        Configure the limiter from the Flask config.
+
+        Settings are read from <NAME>_RATE_LIMIT, <NAME>_RATE_BURST,
+        <NAME>_RATE_MAX_WAIT and <NAME>_RATE_LIMIT_SHARED.
+
+        Args:
+            app: Flask application instance
+            client: Redis client used when the shared limit is enabled
+                (defaults to a connection to REDIS_URL)
+        """
+        config_name = self.name.upper()
+        self.rate = app.config.get(f"{config_name}_RATE_LIMIT", self.rate)
+        self.burst = app.config.get(f"{config_name}_RATE_BURST", self.burst)
+        self.max_wait = app.config.get(f"{config_name}_RATE_MAX_WAIT", self.max_wait)
+        self.client = None
+        if app.config.get(f"{config_name}_RATE_LIMIT_SHARED", False):
+            from app.services.forecast_cache import ForecastCache
+
+            self.client = client or ForecastCache.connect(app.config["REDIS_URL"])
+        self._tat = 0.0
+        app.extensions[f"{self.name}_rate_limiter"] = self
+
+    def _reserve(self, now, tat):
+        """
+        Compute the wait for the next slot given the current TAT.
+
+        Returns:
+            Tuple (wait in seconds, new TAT)
+
+        Raises:
+            RateLimitExceeded: if the wait is longer than max_wait
+        """
+        interval = 1.0 / self.rate
+        tat = max(tat, now)
+        wait = max(0.0, tat - now - (self.burst - 1) * interval)
+        if wait > self.max_wait:
+            raise RateLimitExceeded(self.name, wait - self.max_wait)
+        return wait, tat + interval
+
+    def _reserve_local(self, now):
+        with self._lock:
+            wait, self._tat = self._reserve(now, self._tat)
+            return wait
+
+    def _reserve_shared(self, now):
+        """Reserve a slot in the Redis TAT key (optimistic WATCH/MULTI)"""
+        from redis.exceptions import WatchError
+
+        key = f"{self.prefix}:{self.name}"
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    stored = pipe.get(key)
+                    wait, tat = self._reserve(now, float(stored or 0.0))
+                    pipe.multi()
+                    # the key is useless once its TAT is in the past
+                    pipe.set(key, tat, px=int((tat - now) * 1000) + 1000)
+                    pipe.execute()
+                    return wait
+                except WatchError:
+                    # another worker took a slot first; try again
+                    continue
+
+    def acquire(self):
+        """
+        Wait for a slot.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitExceeded: if the queue is longer than max_wait
+        """
+        if not self.rate:
+            return 0.0
+
+        now = time.time()
+        try:
+            if self.client is not None:
+                try:
+                    wait = self._reserve_shared(now)
+                except RateLimitExceeded:
+                    raise
+                except Exception as e:
+                    # keep limiting per process while Redis is unavailable
+                    logger.warning(f"Shared {self.name} rate limit unavailable: {e}")
+                    wait = self._reserve_local(now)
+            else:
+                wait = self._reserve_local(now)
+        except RateLimitExceeded:
+            with self._lock:
+                self._rejected += 1
+            logger.warning(f"{self.name} rate limit queue full, rejecting call")
+            raise
+
+        with self._lock:
+            self._granted += 1
+            self._waited += wait
+            self._waiting += 1
+        try:
+            if wait > 0:
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        return wait
+
+    def stats(self):
+        """
+        Report limiter usage.
+
+        Returns:
+            Dictionary with granted/rejected counts and queueing time
+        """
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "shared": self.client is not None,
+                "granted": self._granted,
+                "rejected": self._rejected,
+                "waiting": self._waiting,
+                "avg_wait": (
+                    round(self._waited / self._granted, 3) if self._granted else 0.0
+                ),
+            }
+
+
+# Shared limiter for Nominatim calls, enabled by create_app()
+nominatim_limiter = RateLimiter("nominatim", rate=None)
@@ -0,0 +1,201 @@
+# Request coalescing ("single flight").
+# When a popular forecast expires, every request thread misses the cache at
+# once and calls Open-Meteo for the same coordinates. Routing fetches through
+# SingleFlight lets the first caller for a key do the upstream call while the
+# others wait for it and share its result.
+
+import logging
+import threading
+import time
+import uuid
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight call and the outcome its waiters will share"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    Within a process, callers for a key already in flight block until the
+    leader finishes and receive its result (or its exception).
+
+    With a Redis client the leader also takes a short-lived Redis lock, so
+    leaders in other workers wait too. Remote waiters poll the lookup
+    callable (normally the shared forecast cache) until the result shows
+    up, and run the call themselves if the lock holder goes away or takes
+    longer than wait_timeout.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        prefix="inflight",
+        lock_ttl=10,
+        wait_timeout=5,
+        poll_interval=0.05,
+    ):
+        """
+        Args:
+            client: Optional Redis client for cross-worker coordination
+            prefix: Prefix of the Redis lock keys
+            lock_ttl: Seconds before an abandoned Redis lock expires
+            wait_timeout: Maximum seconds to wait on another worker
+            poll_interval: Seconds between lookups while waiting on another worker
+        """
+        self.client = client
+        self.prefix = prefix
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._executed = 0
+        self._coalesced = 0
+        self._remote_waits = 0
+
+    def init_app(self, app, client=None):
+        """
+        Configure coalescing from the Flask config.
+
+        Args:
+            app: Flask application instance
+            client: Redis client used for the cross-worker lock when
+                SINGLE_FLIGHT_DISTRIBUTED is set (usually the forecast
+                cache's client)
+        """
+        distributed = app.config.get("SINGLE_FLIGHT_DISTRIBUTED", False)
+        self.client = client if distributed else None
+        self.lock_ttl = app.config.get("SINGLE_FLIGHT_LOCK_TTL", self.lock_ttl)
+        self.wait_timeout = app.config.get("SINGLE_FLIGHT_WAIT", self.wait_timeout)
+        app.extensions["single_flight"] = self
+
+    def do(self, key, fn, lookup=None):
+        """
+        Run fn once for all concurrent callers of key.
+
+        Args:
+            key: Identity of the call (e.g. the forecast cache key)
+            fn: Callable doing the actual work
+            lookup: Optional callable returning the result published by
+                another worker, or None while it is not available yet
+
+        Returns:
+            The result of fn, shared between all coalesced callers
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run(key, fn, lookup)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run(self, key, fn, lookup):
+        """Run fn as the local leader, coordinating with other workers if enabled"""
+        if self.client is None:
+            return self._execute(fn)
+
+        lock_key = f"{self.prefix}:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.client.set(lock_key, token, nx=True, ex=self.lock_ttl)
+        except Exception as e:
+            # never fail a request because the lock is unavailable
+            logger.warning(f"Single-flight lock unavailable, fetching anyway: {e}")
+            return self._execute(fn)
+
+        if acquired:
+            try:
+                return self._execute(fn)
+            finally:
+                self._release(lock_key, token)
+
+        # another worker is fetching: wait for it to publish the result
+        with self._lock:
+            self._remote_waits += 1
+        result = self._wait_remote(lock_key, lookup)
+        return result if result is not None else self._execute(fn)
+
+    def _execute(self, fn):
+        with self._lock:
+            self._executed += 1
+        return fn()
+
+    def _wait_remote(self, lock_key, lookup):
+        """Poll for another worker's result until it appears or the lock goes away"""
+        if lookup is None:
+            return None
+
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            result = lookup()
+            if result is not None:
+                return result
+            try:
+                if not self.client.exists(lock_key):
+                    # holder finished (or failed) without publishing; one last look
+                    return lookup()
+            except Exception:
+                return None
+        logger.warning(f"Timed out waiting on {lock_key}, fetching anyway")
+        return None
+
+    def _release(self, lock_key, token):
+        try:
+            # only delete the lock if it is still ours: it may have expired
+            # and been taken by another worker in the meantime
+            if self.client.get(lock_key) == token.encode("utf-8"):
+                self.client.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"Failed to release single-flight lock {lock_key}: {e}")
+
+    def stats(self):
+        """
+        Report how many calls were coalesced.
+
+        Returns:
+            Dictionary with executed, coalesced and in-flight counts
+        """
+        with self._lock:
+            return {
+                "distributed": self.client is not None,
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+                "remote_waits": self._remote_waits,
+                "in_flight": len(self._calls),
+            }
+
+
+# Shared instance, configured by create_app()
+single_flight = SingleFlight()
@@ -0,0 +1,164 @@
+# Time zone lookups for the view layer and the forecast decoders.
+# Every request used to resolve the server's zone with tzlocal and build
+# pytz zones from scratch, and the decoders shifted whole forecasts by the
+# single UtcOffsetSeconds() of the response (wrong after a DST change inside
+# the forecast). TimezoneService keeps zoneinfo zones in a bounded cache,
+# resolves the local zone once per process, and turns a forecast's time
+# range into a small table of UTC offset transitions applied with NumPy.
+
+import logging
+import threading
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+# seconds between offset probes. Each probe that sees a new offset is
+# bisected to the exact second of the change; since 1970 no zone has
+# changed offset twice within a week, so no change hides between probes.
+PROBE_INTERVAL = 6 * 3600
+
+
+class TimezoneService:
+    """
+    Cached zoneinfo zones and per-forecast UTC offset tables.
+    """
+
+    def __init__(self, max_zones=256):
+        """
+        Args:
+            max_zones: Number of zones (and of offset tables) kept in memory
+        """
+        self._lock = threading.Lock()
+        self._local_zone = None
+        self._configure(max_zones)
+
+    def _configure(self, max_zones):
+        self.max_zones = max_zones
+        self._zone = lru_cache(maxsize=max_zones)(ZoneInfo)
+        self._table = lru_cache(maxsize=max_zones)(self._offset_table)
+
+    def init_app(self, app):
+        """
+        Size the caches from TIMEZONE_CACHE_SIZE.
+
+        Args:
+            app: Flask application instance
+        """
+        self._configure(app.config.get("TIMEZONE_CACHE_SIZE", self.max_zones))
+        app.extensions["timezone_service"] = self
+
+    def zone(self, name):
+        """
+        Zone object for an IANA name.
+
+        Args:
+            name: IANA time zone name (e.g. "America/New_York")
+
+        Raises:
+            zoneinfo.ZoneInfoNotFoundError: for unknown zones
+            ValueError: for malformed names
+        """
+        return self._zone(name)
+
+    def local_zone(self):
+        """Server time zone, resolved once per process"""
+        if self._local_zone is None:
+            with self._lock:
+                if self._local_zone is None:
+                    from tzlocal import get_localzone
+
+                    self._local_zone = get_localzone()
+        return self._local_zone
+
+    def _offset_table(self, name, start, end):
+        """
+        UTC offsets in effect between two epochs.
+
+        Returns:
+            Tuple (transition epochs, offsets in seconds); offsets[i]
+            applies from transitions[i] on, transitions[0] == start
+        """
+        zone = self.zone(name)
+
+        def offset_at(epoch):
+            return int(datetime.fromtimestamp(epoch, zone).utcoffset().total_seconds())
+
+        transitions = [start]
+        offsets = [offset_at(start)]
+        probe = start
+        while probe < end:
+            following = min(probe + PROBE_INTERVAL, end)
+            if offset_at(following) == offsets[-1]:
+                probe = following
+                continue
+            # bisect down to the second the offset changes
+            low, high = probe, following
+            while high - low > 1:
+                middle = (low + high) // 2
+                if offset_at(middle) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            transitions.append(high)
+            offsets.append(offset_at(high))
+            # resume at the change: the rest of the interval may hold another
+            probe = high
+        return tuple(transitions), tuple(offsets)
+
+    def offsets(self, name, epochs, default=0):
+        """
+        UTC offset of each timestamp.
+
+        Args:
+            name: IANA time zone name (None to use default)
+            epochs: Array of Unix seconds
+            default: Offset used when the zone is unknown (e.g. the
+                response's UtcOffsetSeconds())
+
+        Returns:
+            int64 NumPy array of offsets in seconds, aligned with epochs
+        """
+        # imported on first use: numpy is too slow to load at boot
+        import numpy as np
+
+        epochs = np.asarray(epochs, dtype=np.int64)
+        if not epochs.size:
+            return np.zeros(epochs.shape, dtype=np.int64)
+        if not name:
+            return np.full(epochs.shape, default, dtype=np.int64)
+        try:
+            transitions, offsets = self._table(
+                name, int(epochs.min()), int(epochs.max())
+            )
+        except (KeyError, ValueError, OSError) as e:
+            logger.warning(f"Unknown time zone {name!r}, using fixed offset: {e}")
+            return np.full(epochs.shape, default, dtype=np.int64)
+
+        index = np.searchsorted(np.asarray(transitions), epochs, side="right") - 1
+        return np.asarray(offsets, dtype=np.int64)[index]
+
+    def stats(self):
+        """
+        Report cache usage.
+
+        Returns:
+            Dictionary with zone and offset table cache counters
+        """
+        zones = self._zone.cache_info()
+        tables = self._table.cache_info()
+        return {
+            "max_zones": self.max_zones,
+            "local_zone": str(self._local_zone) if self._local_zone else None,
+            "zones": zones.currsize,
+            "zone_hits": zones.hits,
+            "zone_misses": zones.misses,
+            "offset_tables": tables.currsize,
+            "offset_table_hits": tables.hits,
+        }
+
+
+# Shared instance, configured by create_app()
+timezone_service = TimezoneService()
@@ -1,3 +1,50 @@
+# Unit conversion for the view layer.
+# Forecasts are fetched in Fahrenheit, mph and millimeters; the settings page
+# lets users pick Celsius, km/h and inches. UnitService converts whole columns
+# with NumPy ufuncs instead of one Python call per value. numpy is imported at
+# module level, so view code imports this module lazily (see test_startup).
+
+import numpy as np
+
+# Units of the forecasts the views historically received (Open-Meteo
+# defaults plus the app's Fahrenheit/mph), the default source of conversions
+SOURCE_UNITS = {"temperature": "F", "wind": "mph", "precipitation": "mm"}
+
+# Units forecasts are fetched and cached in with FORECAST_UNITS_MODE=canonical
+CANONICAL_UNITS = {"temperature": "C", "wind": "kmh", "precipitation": "mm"}
+
+# How each unit is named in Open-Meteo request parameters
+_OPENMETEO_UNITS = {
+    "F": "fahrenheit",
+    "C": "celsius",
+    "mph": "mph",
+    "kmh": "kmh",
+    "mm": "mm",
+    "in": "inch",
+}
+
+# Display labels of the units offered on /settings
+UNIT_LABELS = {
+    "F": "°F",
+    "C": "°C",
+    "mph": "mph",
+    "kmh": "km/h",
+    "mm": "mm",
+    "in": "in",
+}
+
+# Linear factors between speed / length units
+_FACTORS = {
+    ("mph", "kmh"): 1.609344,
+    ("kmh", "mph"): 1 / 1.609344,
+    ("mm", "in"): 1 / 25.4,
+    ("in", "mm"): 25.4,
+}
+
+# Decimals kept when displaying converted values
+_DECIMALS = {"wind": 1, "precipitation": 2}
+
+
 def convert_temperature(celsius, target_unit):
     """
     Convert temperature from Celsius to the target unit.
@@ -15,3 +62,166 @@ def convert_temperature(celsius, target_unit):
         return (celsius * 9 / 5) + 32
     else:
         raise ValueError(f"Unsupported temperature unit: {target_unit}")
+
+
+class UnitService:
+    """
+    Convert forecast values to the user's preferred units.
+
+    Every conversion works on whole arrays with NumPy ufuncs (scalars are
+    accepted too), so a forecast column is converted in one call instead
+    of a Python loop per value.
+    """
+
+    def __init__(self, temp_unit="F", wind_unit="mph", precip_unit="in", source=None):
+        """
+        Args:
+            temp_unit: "F" or "C"
+            wind_unit: "mph" or "kmh"
+            precip_unit: "in" or "mm"
+            source: Units of the values to convert (defaults to SOURCE_UNITS)
+        """
+        self.source = SOURCE_UNITS | (source or {})
+        self.target = {
+            "temperature": temp_unit,
+            "wind": wind_unit,
+            "precipitation": precip_unit,
+        }
+        for kind, unit in self.target.items():
+            if unit not in UNIT_LABELS:
+                raise ValueError(f"Unsupported {kind} unit: {unit}")
+
+    @classmethod
+    def from_session(cls, session, source=None):
+        """
+        Build the converter for the preferences saved by /settings.
+
+        Args:
+            session: Flask session (or any mapping with the *_unit keys)
+            source: Units of the values to convert (defaults to SOURCE_UNITS)
+        """
+        return cls(
+            temp_unit=session.get("temp_unit", "F"),
+            wind_unit=session.get("wind_unit", "mph"),
+            precip_unit=session.get("precip_unit", "in"),
+            source=source,
+        )
+
+    @classmethod
+    def profile(cls, preferences, mode="upstream"):
+        """
+        Build the converter between fetched forecasts and the preferences.
+
+        Args:
+            preferences: Flask session (or any mapping with the *_unit keys)
+            mode: "upstream" to have Open-Meteo answer in the preferred units
+                (conversions are no-ops), or "canonical" to fetch and cache
+                CANONICAL_UNITS and convert on read
+
+        Returns:
+            UnitService whose source units are the units to fetch in
+        """
+        units = cls.from_session(preferences)
+        if mode == "upstream":
+            units.source = dict(units.target)
+        elif mode == "canonical":
+            units.source = dict(CANONICAL_UNITS)
+        else:
+            raise ValueError(f"Unsupported units mode: {mode}")
+        return units
+
+    @property
+    def identity(self):
+        """True when values are already in the target units"""
+        return self.source == self.target
+
+    def openmeteo_params(self):
+        """Open-Meteo request parameters for the source units"""
+        return {
+            "temperature_unit": _OPENMETEO_UNITS[self.source["temperature"]],
+            "wind_speed_unit": _OPENMETEO_UNITS[self.source["wind"]],
+            "precipitation_unit": _OPENMETEO_UNITS[self.source["precipitation"]],
+        }
+
+    @property
+    def labels(self):
+        """Display labels of the target units, e.g. {"wind": "km/h"}"""
+        return {kind: UNIT_LABELS[unit] for kind, unit in self.target.items()}
+
+    @staticmethod
+    def _result(values, converted):
+        """Return scalars for scalar input, arrays otherwise"""
+        return converted if np.ndim(values) else converted.item()
+
+    def temperature(self, values, whole=True):
+        """
+        Convert temperatures.
+
+        Args:
+            values: Scalar or array of temperatures in the source unit
+            whole: Truncate the converted values to whole degrees, as the
+                views display them (only once, after converting, so no
+                precision is lost to an intermediate int())
+
+        Returns:
+            Converted values (int64 when whole, float64 otherwise)
+        """
+        source, target = self.source["temperature"], self.target["temperature"]
+        array = np.asarray(values, dtype=np.float64)
+
+        if (source, target) == ("F", "C"):
+            array = (array - 32) * 5 / 9
+        elif (source, target) == ("C", "F"):
+            array = array * 9 / 5 + 32
+
+        if whole:
+            array = np.trunc(array).astype(np.int64)
+        return self._result(values, array)
+
+    def _linear(self, kind, values):
+        source, target = self.source[kind], self.target[kind]
+        array = np.asarray(values, dtype=np.float64)
+        if source != target:
+            array = np.round(array * _FACTORS[(source, target)], _DECIMALS[kind])
+        return self._result(values, array)
+
+    def wind(self, values):
+        """Convert wind speeds (rounded to 0.1)"""
+        return self._linear("wind", values)
+
+    def precipitation(self, values):
+        """Convert precipitation amounts (rounded to 0.01)"""
+        return self._linear("precipitation", values)
+
+    def convert(self, data, fields):
+        """
+        Convert several fields of a forecast dictionary.
+
+        Fields of the same kind are stacked and converted in a single call.
+
+        Args:
+            data: Dictionary of forecast values (scalars or lists)
+            fields: Mapping of kind ("temperature", "wind", "precipitation")
+                to the names of the fields holding that kind of value
+
+        Returns:
+            New dictionary with the converted fields (lists stay lists)
+        """
+        converted = dict(data)
+        for kind, names in fields.items():
+            names = [name for name in names if name in data]
+            if not names:
+                continue
+
+            # ragged fields (a scalar next to a column) are converted one by one
+            shapes = {np.shape(data[name]) for name in names}
+            if len(shapes) > 1:
+                for name in names:
+                    value = getattr(self, kind)(data[name])
+                    converted[name] = value.tolist() if np.ndim(value) else value
+                continue
+
+            stacked = getattr(self, kind)(np.array([data[name] for name in names]))
+            for name, value in zip(names, stacked.tolist()):
+                converted[name] = value
+        return converted
@@ -1,40 +1,240 @@
 import json
 import requests
 from datetime import datetime
-from flask import session
+from flask import session, current_app, has_app_context, has_request_context
 
-import numpy as np  # Add this import
-
-import openmeteo_requests
-
-import requests_cache
-import pandas as pd
-from retry_requests import retry
 import logging
 
+from app.services.openmeteo_client import openmeteo_pool
+from app.services.forecast_cache import forecast_cache
+from app.services.geo_grid import coordinate_grid
+from app.services.single_flight import single_flight
+from app.services.timezone_service import timezone_service
+from app.services.fan_out import fan_out as shared_fan_out
+from app.services.page_cache import page_cache
+
 # Create module-level logger
 logger = logging.getLogger(__name__)
 
+# Variables requested by the consolidated "bundle" call. Each view slices the
+# block it needs, so home/search/forecast/hourly pay for one upstream call.
+BUNDLE_CURRENT_VARS = [
+    "temperature_2m",
+    "is_day",
+    "wind_speed_10m",
+    "weather_code",
+    "apparent_temperature",
+    "precipitation",
+]
+BUNDLE_HOURLY_VARS = [
+    "temperature_2m",
+    "weather_code",
+    "precipitation_probability",
+    "is_day",
+]
+BUNDLE_DAILY_VARS = [
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "uv_index_max",
+    "precipitation_probability_max",
+    "weather_code",
+    "sunrise",
+    "sunset",
+]
+
 
 class WeatherService:
-    def __init__(self):
+    def __init__(
+        self,
+        pool=None,
+        bundle=None,
+        cache=None,
+        grid=None,
+        flight=None,
+        units=None,
+        pages=None,
+    ):
         """
         Initialize the WeatherService class.
+
+        Args:
+            pool: Optional OpenMeteoClientPool (defaults to the shared pool)
+            bundle: Serve cur/hourly/daily from one consolidated request
+                (defaults to the FORECAST_BUNDLE_ENABLED config value)
+            cache: Optional ForecastCache (defaults to the shared cache)
+            grid: Optional CoordinateGrid used to snap coordinates before
+                fetching and caching (defaults to the shared grid)
+            flight: Optional SingleFlight coalescing concurrent identical
+                fetches (defaults to the shared instance)
+            units: Optional UnitService profile (see UnitService.profile);
+                forecasts are requested in its source units and the views
+                convert them to its target units. Defaults to the session's
+                preferences in the FORECAST_UNITS_MODE mode.
+            pages: Optional PageCache whose pages of a location are retired
+                when its forecast is refreshed (defaults to the shared one)
         """
-        pass
+        self.pool = pool or openmeteo_pool
+        self.cache = cache or forecast_cache
+        self.grid = grid or coordinate_grid
+        self.flight = flight or single_flight
+        self.pages = pages or page_cache
+        if bundle is None:
+            bundle = (
+                current_app.config.get("FORECAST_BUNDLE_ENABLED", True)
+                if has_app_context()
+                else True
+            )
+        self.bundle = bundle
+        if units is None:
+            # imported on first use: numpy is too slow to load at boot
+            from app.services.unit_service import UnitService
+
+            units = UnitService.profile(
+                session if has_request_context() else {},
+                (
+                    current_app.config.get("FORECAST_UNITS_MODE", "upstream")
+                    if has_app_context()
+                    else "upstream"
+                ),
+            )
+        self.units = units
+        # decoded bundles of this service instance, keyed by coordinates
+        self._bundles = {}
+        # forecasts fetched ahead by prefetch(), keyed by (kind, coordinates)
+        self._prefetched = {}
 
-    def get_7_day_forecast(self, coords):
+    def get_forecast_bundle(self, coords):
         """
-        Get 7-day forecast for a city.
+        Get current, hourly and daily forecast from a single API call.
+
+        The decoded result is kept on the instance, so every view builder
+        sharing this service reuses the same upstream response.
 
         Args:
             coords: Dictionary containing latitude and longitude
 
         Returns:
-            List of dictionaries with forecast data
+            Dictionary with "cur", "hourly" and "daily" entries, each shaped
+            like the result of the matching get_*_forecast method
         """
-        # Implementation to be added
-        _7_day_params = {
+        coords = self.grid.snap_coords(coords)
+        key = self._coords_key(coords)
+        if key not in self._bundles:
+            bundle_params = self._bundle_params(coords["lat"], coords["lon"])
+            self._bundles[key] = self.fetch_weather_data(bundle_params, "bundle")
+        return self._bundles[key]
+
+    def get_forecasts_bulk(self, coords_list, batch_size=50):
+        """
+        Get forecast bundles for many locations with few upstream calls.
+
+        Open-Meteo accepts comma-separated latitude/longitude lists and
+        returns one response per location, so up to batch_size locations
+        are fetched in a single request.
+
+        Args:
+            coords_list: List of dictionaries containing latitude and longitude
+            batch_size: Maximum number of locations per upstream request
+
+        Returns:
+            List of bundles (see get_forecast_bundle), in input order
+        """
+        coords_list = [self.grid.snap_coords(coords) for coords in coords_list]
+        # locations snapped onto the same grid cell are fetched once
+        missing = {}
+        for coords in coords_list:
+            key = self._coords_key(coords)
+            if key in self._bundles or key in missing:
+                continue
+            params = self._bundle_params(coords["lat"], coords["lon"])
+            cached = self.cache.get(self.cache.make_key("bundle", params))
+            if cached is None:
+                missing[key] = coords
+            else:
+                self._bundles[key] = cached
+
+        missing = list(missing.items())
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start : start + batch_size]
+            params = self._bundle_params(
+                ",".join(str(coords["lat"]) for _, coords in batch),
+                ",".join(str(coords["lon"]) for _, coords in batch),
+            )
+            responses = self.pool.weather_api(params)
+            if len(responses) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} locations, got {len(responses)}"
+                )
+
+            # fan the responses back out, one decoded bundle per location
+            for (key, coords), response in zip(batch, responses):
+                bundle = self.decode_response(response, params, "bundle")
+                self.cache.set(
+                    self.cache.make_key(
+                        "bundle", self._bundle_params(coords["lat"], coords["lon"])
+                    ),
+                    bundle,
+                )
+                self._bundles[key] = bundle
+
+        return [self._bundles[self._coords_key(coords)] for coords in coords_list]
+
+    def prefetch(self, coords, kinds, fan_out=None, deadline=None):
+        """
+        Fetch several forecasts of a location concurrently.
+
+        The results are kept on the instance, so the view builders' later
+        get_*_forecast calls return them without fetching one after the
+        other. In bundle mode a single call already covers every kind, so
+        this does nothing.
+
+        Args:
+            coords: Dictionary containing latitude and longitude
+            kinds: Forecasts to fetch ("cur", "hourly", "daily")
+            fan_out: Optional FanOut (defaults to the shared instance)
+            deadline: Seconds allowed for all fetches (FanOut default)
+
+        Raises:
+            FanOutTimeout: if a fetch is still running at the deadline
+        """
+        fan_out = fan_out or shared_fan_out
+        if self.bundle or not fan_out.enabled:
+            # the view builders fetch on demand
+            return
+
+        getters = {
+            "cur": self.get_cur_forecast,
+            "hourly": self.get_hourly_forecast,
+            "daily": self.get_7_day_forecast,
+        }
+        key = self._coords_key(coords)
+        calls = {
+            kind: (lambda getter=getters[kind]: getter(coords))
+            for kind in kinds
+            if (kind, key) not in self._prefetched
+        }
+        for kind, data in fan_out.run(calls, deadline).items():
+            self._prefetched[(kind, key)] = data
+
+    @staticmethod
+    def _coords_key(coords):
+        return (str(coords["lat"]), str(coords["lon"]))
+
+    def _bundle_params(self, latitude, longitude):
+        """Parameters of the consolidated current + hourly + daily request"""
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": BUNDLE_CURRENT_VARS,
+            "hourly": BUNDLE_HOURLY_VARS,
+            "daily": BUNDLE_DAILY_VARS,
+            "timezone": "auto",
+            "forecast_days": 7,
+        } | self.units.openmeteo_params()
+
+    def _daily_params(self, coords):
+        """Parameters of the separate 7-day request"""
+        return {
             "latitude": coords["lat"],
             "longitude": coords["lon"],
             "daily": [
@@ -44,27 +244,11 @@ class WeatherService:
                 "weather_code",
             ],
             "timezone": "auto",
-            "wind_speed_unit": "mph",
-            "temperature_unit": "fahrenheit",
-        }
-        # Setup the Open-Meteo API client with cache and retry on error
-        return self.fetch_weather_data(_7_day_params, "daily")
-        # return self.weather_data_daily
-
-    def get_cur_forecast(self, coords):
-        """
-        Get current weather data for a given set of coordinates.
-
-        Args:
-            coords: Dictionary containing latitude and longitude
-
-        Returns:
-            Dictionary containing current weather data
-        """
-
-        today = datetime.today().strftime("%Y-%m-%d")
+        } | self.units.openmeteo_params()
 
-        cur_params = {
+    def _cur_params(self, coords):
+        """Parameters of the separate current conditions request"""
+        return {
             "latitude": coords["lat"],
             "longitude": coords["lon"],
             "daily": [
@@ -82,11 +266,62 @@ class WeatherService:
                 "precipitation",
             ],
             "timezone": "auto",
-            "wind_speed_unit": "mph",
-            "temperature_unit": "fahrenheit",
-        }
+        } | self.units.openmeteo_params()
+
+    def _hourly_params(self, coords):
+        """Parameters of the separate hourly request (today and tomorrow)"""
+        return {
+            "latitude": coords["lat"],
+            "longitude": coords["lon"],
+            "daily": ["sunrise", "sunset"],
+            "hourly": [
+                "temperature_2m",
+                "weather_code",
+                "precipitation_probability",
+                "is_day",
+            ],
+            "timezone": "auto",
+            "forecast_days": 2,
+        } | self.units.openmeteo_params()
 
-        return self.fetch_weather_data(cur_params, "cur")
+    def get_7_day_forecast(self, coords):
+        """
+        Get 7-day forecast for a city.
+
+        Args:
+            coords: Dictionary containing latitude and longitude
+
+        Returns:
+            List of dictionaries with forecast data
+        """
+        if self.bundle:
+            return self.get_forecast_bundle(coords)["daily"]
+        prefetched = self._prefetched.get(("daily", self._coords_key(coords)))
+        if prefetched is not None:
+            return prefetched
+
+        coords = self.grid.snap_coords(coords)
+        # Setup the Open-Meteo API client with cache and retry on error
+        return self.fetch_weather_data(self._daily_params(coords), "daily")
+
+    def get_cur_forecast(self, coords):
+        """
+        Get current weather data for a given set of coordinates.
+
+        Args:
+            coords: Dictionary containing latitude and longitude
+
+        Returns:
+            Dictionary containing current weather data
+        """
+        if self.bundle:
+            return self.get_forecast_bundle(coords)["cur"]
+        prefetched = self._prefetched.get(("cur", self._coords_key(coords)))
+        if prefetched is not None:
+            return prefetched
+
+        coords = self.grid.snap_coords(coords)
+        return self.fetch_weather_data(self._cur_params(coords), "cur")
 
     def get_hourly_forecast(self, coords):
         """
@@ -99,35 +334,14 @@ class WeatherService:
         Returns:
             List of dictionaries with hourly forecast data
         """
-        # Implementation to be added
-        today = datetime.today().strftime("%Y-%m-%d")
-        tomorrow = (datetime.today() + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
-        # hourly_params = {
-        #     "latitude": coords["lat"],
-        #     "longitude": coords["lon"],
-        #     "hourly": ["temperature_2m", "weather_code", "precipitation_probability"],
-        #     "timezone": "America/New_York",
-        #     "wind_speed_unit": "mph",
-        #     "temperature_unit": "fahrenheit",
-        #     "start_date": today,
-        #     "end_date": today,
-        # }
-        hourly_params = {
-            "latitude": coords["lat"],
-            "longitude": coords["lon"],
-            "daily": ["sunrise", "sunset"],
-            "hourly": [
-                "temperature_2m",
-                "weather_code",
-                "precipitation_probability",
-            ],
-            "timezone": "auto",
-            "forecast_days": 2,
-            "wind_speed_unit": "mph",
-            "temperature_unit": "fahrenheit",
-        }
+        if self.bundle:
+            return self.get_forecast_bundle(coords)["hourly"]
+        prefetched = self._prefetched.get(("hourly", self._coords_key(coords)))
+        if prefetched is not None:
+            return prefetched
 
-        return self.fetch_weather_data(hourly_params, "hourly")
+        coords = self.grid.snap_coords(coords)
+        return self.fetch_weather_data(self._hourly_params(coords), "hourly")
 
     def fetch_weather_data(self, params, type):
         """
@@ -135,21 +349,65 @@ class WeatherService:
 
         Args:
             params: Dictionary containing parameters for the API request
-            type: Type of weather data to fetch (current, daily, hourly)
+            type: Type of weather data to fetch (cur, daily, hourly, bundle)
 
         Returns:
-            Response object from the API
+            Dictionary with the decoded weather data
         """
-        # Setup the Open-Meteo API client with cache and retry on error
-        cache_session = requests_cache.CachedSession(".cache", expire_after=3600)
-        retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
-        openmeteo = openmeteo_requests.Client(session=retry_session)
+        # Decoded payloads are shared by all workers through the forecast cache
+        cache_key = self.cache.make_key(type, params)
+        weather_data, stale = self.cache.lookup(cache_key)
+        if weather_data is not None:
+            if stale:
+                # answer with the expired entry, revalidate off the request path
+                self.cache.refresh(
+                    cache_key,
+                    lambda: self._fetch_coalesced(params, type, cache_key, True),
+                )
+            return weather_data
 
-        url = "https://api.open-meteo.com/v1/forecast"
-        responses = openmeteo.weather_api(url, params=params)
+        return self._fetch_coalesced(params, type, cache_key)
+
+    def _fetch_coalesced(self, params, type, cache_key, refresh=False):
+        """Fetch through single flight: concurrent misses share one upstream call"""
+        return self.flight.do(
+            cache_key,
+            lambda: self._fetch_and_store(params, type, cache_key, refresh),
+            lookup=lambda: self.cache.get(cache_key),
+        )
+
+    def _fetch_and_store(self, params, type, cache_key, refresh=False):
+        """Call Open-Meteo, decode the response and publish it to the cache"""
+        # Reuse the process-wide pooled client (cache + retry + keep-alive);
+        # a refresh skips the HTTP cache, which may still hold the old copy
+        responses = self.pool.weather_api(params, refresh=refresh)
         # Process first location. Add a for-loop for multiple locations or weather models
         response = responses[0]
 
+        weather_data = self.decode_response(response, params, type)
+
+        if len(weather_data) > 0:
+            self.cache.set(cache_key, weather_data)
+            if refresh:
+                # pages rendered from the replaced forecast are outdated
+                self.pages.invalidate(params["latitude"], params["longitude"])
+            return weather_data
+        else:
+            print("Failed to fetch weather data.")
+            return None
+
+    def decode_response(self, response, params, type):
+        """
+        Decode one Open-Meteo response into the dictionaries used by the views.
+
+        Args:
+            response: WeatherApiResponse for a single location
+            params: Parameters the response was requested with
+            type: Type of weather data (cur, daily, hourly, bundle)
+
+        Returns:
+            Dictionary with the decoded weather data
+        """
         # Get timezone as string
         timezone_str = (
             response.Timezone().decode("utf-8")
@@ -160,152 +418,165 @@ class WeatherService:
         # # Display for debugging
         # logger.info(f"\nUsing timezone: {timezone_str}\n")
 
-        # Initialize an empty dictionary for weather data
-        weather_data = {}
-
         # according to the type of data requested, we can process the response
         if type == "cur":
-            # Current values. The order of variables needs to be the same as requested.
-            current = response.Current()
-            daily = response.Daily()
-
-            # combine current and daily data
-            weather_data = {
-                "current_temperature_2m": int(current.Variables(0).Value()),
-                "is_day": int(current.Variables(1).Value()),
-                "current_wind_speed_10m": round(current.Variables(2).Value(), 1),
-                "current_weather_code": int(current.Variables(3).Value()),
-                "current_apparent_temperature": int(current.Variables(4).Value()),
-                "current_precipitation": round(current.Variables(5).Value(), 1),
-                "daily_temperature_2m_max": int(daily.Variables(0).ValuesAsNumpy()[0]),
-                "daily_temperature_2m_min": int(daily.Variables(1).ValuesAsNumpy()[0]),
-                "daily_uv_index_max": round(
-                    float(daily.Variables(2).ValuesAsNumpy()[0]), 1
-                ),
-                "daily_precipitation_probability_max": int(
-                    daily.Variables(3).ValuesAsNumpy()[0]
+            weather_data = self._decode_cur(response, params, timezone_str)
+        elif type == "daily":
+            weather_data = self._decode_daily(response, params)
+        elif type == "hourly":
+            weather_data = self._decode_hourly(response, params, timezone_str)
+        elif type == "bundle":
+            # one response carries current, hourly and daily blocks
+            return {
+                "cur": self._to_lists(self._decode_cur(response, params, timezone_str)),
+                "hourly": self._to_lists(
+                    self._decode_hourly(response, params, timezone_str)
                 ),
-                "timezone": timezone_str,
+                "daily": self._to_lists(self._decode_daily(response, params)),
             }
+        else:
+            raise ValueError(
+                "Invalid type. Must be 'cur', 'daily', 'hourly' or 'bundle'."
+            )
 
-            # # debug
-            # logger.info(f"\n-----weather_data in cur:\n {weather_data}\n")
+        # # debug
+        # logger.debug(f"\n-----weather_data in fetch_weather_data: \n {weather_data}\n")
 
-        elif type == "daily":
-            # Process daily data. The order of variables needs to be the same as requested.
-            daily = response.Daily()
-
-            daily_data = {
-                "date": pd.date_range(
-                    start=pd.to_datetime(daily.Time(), unit="s", utc=True),
-                    end=pd.to_datetime(daily.TimeEnd(), unit="s", utc=True),
-                    freq=pd.Timedelta(seconds=daily.Interval()),
-                    inclusive="left",
-                )
-            }
+        return self._to_lists(weather_data)
 
-            # # debug
-            # logger.debug(f"\n-----daily_data: {daily_data}\n")
-            # Process daily data. The order of variables needs to be the same as requested.
-            weather_data = {
-                "date": daily_data["date"].strftime("%Y-%m-%d").tolist(),
-                "temperature_2m_max": daily.Variables(0).ValuesAsNumpy(),
-                "temperature_2m_min": daily.Variables(1).ValuesAsNumpy(),
-                "precipitation_probability_max": daily.Variables(2).ValuesAsNumpy(),
-                "weather_code": daily.Variables(3).ValuesAsNumpy(),
-            }
+    @staticmethod
+    def _to_lists(weather_data):
+        """Convert NumPy arrays to lists before returning"""
+        # imported on first use: numpy is too slow to load at boot
+        import numpy as np
 
-            # debug
-            logger.debug(f"\n-----weather_data in daily: \n {weather_data}\n")
+        for key, value in weather_data.items():
+            if isinstance(value, np.ndarray):
+                weather_data[key] = value.tolist()
+        return weather_data
 
-        elif type == "hourly":  # 24 hours data
+    @staticmethod
+    def _variables(block, names):
+        """
+        Map requested variable names to the variables of a response block.
 
-            # First get the hourly data object BEFORE using it
-            hourly = response.Hourly()
+        The order of variables in a block is the same as requested, so the
+        decoders can look them up by name whatever request they came from.
+        """
+        return {name: block.Variables(i) for i, name in enumerate(names)}
 
-            # Process daily data. The order of variables needs to be the same as requested.
-            daily = response.Daily()
-            daily_sunrise = daily.Variables(0).ValuesInt64AsNumpy()
-            daily_sunset = daily.Variables(1).ValuesInt64AsNumpy()
+    def _decode_cur(self, response, params, timezone_str):
+        """Decode current conditions plus today's daily summary"""
+        current = self._variables(response.Current(), params["current"])
+        daily = self._variables(response.Daily(), params["daily"])
 
-            # Convert sunrise timestamps to datetime in the correct timezone
-            sunrise_times = (
-                pd.to_datetime(daily_sunrise, unit="s", utc=True)  # Specify UTC source
-                .tz_convert(timezone_str)  # Convert to location's timezone
-                .strftime("%Y-%m-%d %H:%M:%S")  # Format without timezone suffix
-                .tolist()
-            )
+        # Whole degrees are what the views display; payloads that are still
+        # converted on read keep a decimal so truncation happens only once
+        if self.units.identity:
+            degrees = int
+        else:
+            degrees = lambda value: round(float(value), 1)
+
+        # combine current and daily data
+        weather_data = {
+            "current_temperature_2m": degrees(current["temperature_2m"].Value()),
+            "is_day": int(current["is_day"].Value()),
+            "current_wind_speed_10m": round(current["wind_speed_10m"].Value(), 1),
+            "current_weather_code": int(current["weather_code"].Value()),
+            "current_apparent_temperature": degrees(
+                current["apparent_temperature"].Value()
+            ),
+            "current_precipitation": round(current["precipitation"].Value(), 2),
+            "daily_temperature_2m_max": degrees(
+                daily["temperature_2m_max"].ValuesAsNumpy()[0]
+            ),
+            "daily_temperature_2m_min": degrees(
+                daily["temperature_2m_min"].ValuesAsNumpy()[0]
+            ),
+            "daily_uv_index_max": round(
+                float(daily["uv_index_max"].ValuesAsNumpy()[0]), 1
+            ),
+            "daily_precipitation_probability_max": int(
+                daily["precipitation_probability_max"].ValuesAsNumpy()[0]
+            ),
+            "timezone": timezone_str,
+        }
 
-            # Do the same for sunset times
-            sunset_times = (
-                pd.to_datetime(daily_sunset, unit="s", utc=True)
-                .tz_convert(timezone_str)
-                .strftime("%Y-%m-%d %H:%M:%S")
-                .tolist()
-            )
+        # # debug
+        # logger.info(f"\n-----weather_data in cur:\n {weather_data}\n")
 
-            # Add to your weather data dictionary (2 days)
-            weather_data["daily_sunrise"] = sunrise_times
-            weather_data["daily_sunset"] = sunset_times
-
-            # # logger.debug(f"\n-----hourly--\n: {hourly}\n")
-            # logger.info(f"\n-----daily--\n: {sunrise_times}, {sunset_times}\n")
-
-            # Process hourly data. The order of variables needs to be the same as requested.
-            hourly_temperature_2m = hourly.Variables(0).ValuesAsNumpy()
-            hourly_weather_code = hourly.Variables(1).ValuesAsNumpy()
-            hourly_precipitation_probability = hourly.Variables(2).ValuesAsNumpy()
-
-            data_hours = {
-                "hours": pd.date_range(
-                    start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
-                    end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
-                    freq=pd.Timedelta(seconds=hourly.Interval()),
-                    inclusive="left",
-                ).tz_convert(
-                    timezone_str
-                )  # Convert to location's timezone
-            }
-            data_hoursframe = pd.DataFrame(data=data_hours)
-            # Convert timezone-aware datetimes to naive datetimes
-            data_hoursframe["hours"] = data_hoursframe["hours"].dt.tz_localize(None)
-
-            hours_series = []
-            for hour_str in data_hoursframe["hours"]:
-                hours_series.append(hour_str)
-
-            # logger.info(f"\n-----data_hours_frame: \n {data_hoursframe}\n")
-
-            # data_hours = data_hours.dt.tz_localize(None)  # Convert to naive datetime
-
-            weather_data = {
-                "hours": hours_series,
-                "hourly_temperature_2m": hourly_temperature_2m,
-                "hourly_weather_code": hourly_weather_code,
-                "hourly_precipitation_probability": hourly_precipitation_probability,
-                "daily_sunrise": sunrise_times,
-                "daily_sunset": sunset_times,
-                "timezone": timezone_str,
-                # "utc_offset": response.UtcOffset(),
-            }
+        return weather_data
 
-            # # debug
-            # logger.info(f"\n-----weather_data in hourly: \n {weather_data}\n")
+    def _decode_daily(self, response, params):
+        """Decode the daily forecast used by the 7-day view"""
+        from app.services.openmeteo_decode import block_epochs, local_dates
+
+        block = response.Daily()
+        daily = self._variables(block, params["daily"])
+
+        weather_data = {
+            "date": local_dates(block_epochs(block), response.UtcOffsetSeconds()),
+            "temperature_2m_max": daily["temperature_2m_max"].ValuesAsNumpy(),
+            "temperature_2m_min": daily["temperature_2m_min"].ValuesAsNumpy(),
+            "precipitation_probability_max": daily[
+                "precipitation_probability_max"
+            ].ValuesAsNumpy(),
+            "weather_code": daily["weather_code"].ValuesAsNumpy(),
+        }
+
+        # debug
+        logger.debug(f"\n-----weather_data in daily: \n {weather_data}\n")
+
+        return weather_data
+
+    def _decode_hourly(self, response, params, timezone_str):
+        """Decode hourly forecast plus the sunrise/sunset times it needs"""
+        from app.services.openmeteo_decode import (
+            block_epochs,
+            local_datetimes,
+            local_strings,
+        )
+
+        # Timestamps are Unix seconds; shift them by the location's offset
+        # to get the naive local times the views display. Offsets come from
+        # the zone's transition table, so a DST change inside the forecast
+        # is honored (UtcOffsetSeconds() is only right for the first hours)
+        utc_offset = response.UtcOffsetSeconds()
+
+        hourly_block = response.Hourly()
+        hourly = self._variables(hourly_block, params["hourly"])
+        epochs = block_epochs(hourly_block)
+
+        # Process daily data. The order of variables needs to be the same as requested.
+        daily = self._variables(response.Daily(), params["daily"])
+        sunrise = daily["sunrise"].ValuesInt64AsNumpy()
+        sunset = daily["sunset"].ValuesInt64AsNumpy()
+
+        def offsets(values):
+            return timezone_service.offsets(timezone_str, values, utc_offset)
+
+        weather_data = {
+            "hours": local_datetimes(epochs, offsets(epochs)),
+            "hourly_temperature_2m": hourly["temperature_2m"].ValuesAsNumpy(),
+            "hourly_weather_code": hourly["weather_code"].ValuesAsNumpy(),
+            "hourly_precipitation_probability": hourly[
+                "precipitation_probability"
+            ].ValuesAsNumpy(),
+            # upstream day flags, for hours the sunrise table can't classify
+            "hourly_is_day": hourly["is_day"].ValuesAsNumpy(),
+            "daily_sunrise": local_strings(sunrise, offsets(sunrise)),
+            "daily_sunset": local_strings(sunset, offsets(sunset)),
+            # raw epochs for the vectorized day/night classification
+            "daily_sunrise_epochs": sunrise,
+            "daily_sunset_epochs": sunset,
+            "utc_offset": utc_offset,
+            "timezone": timezone_str,
+        }
 
-        else:
-            raise ValueError("Invalid type. Must be 'cur', 'daily', or 'hourly'.")
-            # Convert NumPy arrays to lists before returning
-        for key, value in weather_data.items():
-            if isinstance(value, np.ndarray):
-                weather_data[key] = value.tolist()
         # # debug
-        # logger.debug(f"\n-----weather_data in fetch_weather_data: \n {weather_data}\n")
+        # logger.info(f"\n-----weather_data in hourly: \n {weather_data}\n")
 
-        if len(weather_data) > 0:
-            return weather_data
-        else:
-            print("Failed to fetch weather data.")
-            return None
+        return weather_data
 
     def get_sunrise_sunset(self, coords):
         """
@@ -411,8 +682,8 @@ class WeatherService:
 #     f'test for today: {test.get_hourly_forecast({"lat": 35.7915, "lon": -78.7811})}\n'
 # )
 
-# debug daily
-test = WeatherService()
-print(f"\n------------------------")
-print(f'test for today: {test.get_7_day_forecast({"lat": 35.7915, "lon": -78.7811})}')
-print(f"\n------------------------")
+# # debug daily
+# test = WeatherService()
+# print(f"\n------------------------")
+# print(f'test for today: {test.get_7_day_forecast({"lat": 35.7915, "lon": -78.7811})}')
+# print(f"\n------------------------")
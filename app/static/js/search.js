@@ -99,7 +99,7 @@ document.addEventListener('DOMContentLoaded', function () {
                             document.getElementById('precip').textContent = 
                                 `${data.daily_precipitation_probability_max}`;
                             document.getElementById('wind_speed').textContent = 
-                                `${Math.round(data.current_wind_speed_10m)} mph`;
+                                `${Math.round(data.current_wind_speed_10m)} ${data.wind_label || 'mph'}`;
                             // document.getElementById('humidity').textContent = 
                             //     `${data.humidity || 0}%`;
                             
@@ -281,6 +281,100 @@ WEATHER_CODE_MAP = {
     },
 }
 
+# Dense lookup tables over WMO codes 0-99, built once from WEATHER_CODE_MAP.
+# Row = weather code, column = DAY/NIGHT; the extra last row is returned for
+# codes missing from the map, so lookups never raise KeyError.
+WEATHER_CODE_COUNT = 100
+DAY, NIGHT = 0, 1
+UNKNOWN_WEATHER = {
+    "day": {
+        "description": "Unknown",
+        "image": "http://openweathermap.org/img/wn/03d@2x.png",
+    },
+    "night": {
+        "description": "Unknown",
+        "image": "http://openweathermap.org/img/wn/03n@2x.png",
+    },
+}
+
+
+def _dense_table(field):
+    """(day, night) values of field for every code, plus the unknown row"""
+    rows = [
+        WEATHER_CODE_MAP.get(str(code), UNKNOWN_WEATHER)
+        for code in range(WEATHER_CODE_COUNT)
+    ] + [UNKNOWN_WEATHER]
+    return tuple((row["day"][field], row["night"][field]) for row in rows)
+
+
+WEATHER_IMAGES = _dense_table("image")
+WEATHER_DESCRIPTIONS = _dense_table("description")
+
+# NumPy copies of the tables, built on the first batch lookup
+_weather_arrays = None
+
+
+def _code_row(code):
+    """Table row of a weather code (the unknown row for invalid codes)"""
+    try:
+        row = int(code)
+    except (TypeError, ValueError):
+        return WEATHER_CODE_COUNT
+    return row if 0 <= row < WEATHER_CODE_COUNT and row == code else WEATHER_CODE_COUNT
+
+
+def weather_icon(code, is_day=True):
+    """
+    Icon and description of one weather code.
+
+    Args:
+        code: WMO weather code (int, float or numeric string)
+        is_day: Daytime variant if truthy, night variant otherwise
+
+    Returns:
+        Tuple (image URL, description)
+    """
+    if isinstance(code, str):
+        try:
+            code = float(code)
+        except ValueError:
+            code = None
+    row = _code_row(code)
+    column = DAY if is_day else NIGHT
+    return WEATHER_IMAGES[row][column], WEATHER_DESCRIPTIONS[row][column]
+
+
+def weather_icons(codes, is_day=True):
+    """
+    Icons and descriptions of many weather codes in one vectorized lookup.
+
+    Args:
+        codes: Sequence or NumPy array of WMO weather codes
+        is_day: Bool, or a sequence of day flags aligned with codes
+
+    Returns:
+        Tuple (list of image URLs, list of descriptions)
+    """
+    # imported on first use: numpy is too slow to load at boot
+    import numpy as np
+
+    global _weather_arrays
+    if _weather_arrays is None:
+        images = np.empty((WEATHER_CODE_COUNT + 1, 2), dtype=object)
+        images[:] = WEATHER_IMAGES
+        descriptions = np.empty((WEATHER_CODE_COUNT + 1, 2), dtype=object)
+        descriptions[:] = WEATHER_DESCRIPTIONS
+        _weather_arrays = images, descriptions
+    images, descriptions = _weather_arrays
+
+    codes = np.asarray(codes, dtype=np.float64)
+    valid = (codes >= 0) & (codes < WEATHER_CODE_COUNT) & (codes == np.trunc(codes))
+    rows = np.where(valid, codes, WEATHER_CODE_COUNT).astype(np.intp)
+    columns = np.where(np.asarray(is_day, dtype=bool), DAY, NIGHT)
+    columns = np.broadcast_to(columns, rows.shape)
+    return images[rows, columns].tolist(), descriptions[rows, columns].tolist()
+
+
 WEATHER_CODE_DESC = {
     0: "Clear sky",
     1: "Mainly clear",
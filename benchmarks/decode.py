@@ -0,0 +1,120 @@
+"""
+Decoding benchmark: previous pandas decoders vs openmeteo_decode.
+
+Decodes a synthetic 7-day bundle response (168 hourly values, 7 days) with
+both implementations and reports the time per decode.
+
+Usage:
+    python benchmarks/decode.py [--number 500]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.openmeteo_fakes import make_bundle_response  # noqa: E402
+from app.services.weather_service import WeatherService  # noqa: E402
+
+
+def pandas_time_axes(response, timezone_str):
+    """The time handling of the decoders before openmeteo_decode (reference)"""
+    import pandas as pd
+
+    block = response.Daily()
+    dates = (
+        pd.date_range(
+            start=pd.to_datetime(block.Time(), unit="s", utc=True),
+            end=pd.to_datetime(block.TimeEnd(), unit="s", utc=True),
+            freq=pd.Timedelta(seconds=block.Interval()),
+            inclusive="left",
+        )
+        .strftime("%Y-%m-%d")
+        .tolist()
+    )
+
+    sunrise = block.Variables(5).ValuesInt64AsNumpy()
+    sunset = block.Variables(6).ValuesInt64AsNumpy()
+    sunrise_times = (
+        pd.to_datetime(sunrise, unit="s", utc=True)
+        .tz_convert(timezone_str)
+        .strftime("%Y-%m-%d %H:%M:%S")
+        .tolist()
+    )
+    sunset_times = (
+        pd.to_datetime(sunset, unit="s", utc=True)
+        .tz_convert(timezone_str)
+        .strftime("%Y-%m-%d %H:%M:%S")
+        .tolist()
+    )
+
+    hourly_block = response.Hourly()
+    frame = pd.DataFrame(
+        data={
+            "hours": pd.date_range(
+                start=pd.to_datetime(hourly_block.Time(), unit="s", utc=True),
+                end=pd.to_datetime(hourly_block.TimeEnd(), unit="s", utc=True),
+                freq=pd.Timedelta(seconds=hourly_block.Interval()),
+                inclusive="left",
+            ).tz_convert(timezone_str)
+        }
+    )
+    frame["hours"] = frame["hours"].dt.tz_localize(None)
+    hours = [hour for hour in frame["hours"]]
+    return dates, sunrise_times, sunset_times, hours
+
+
+def numpy_time_axes(response, timezone_str):
+    """The same axes through openmeteo_decode"""
+    from app.services.openmeteo_decode import (
+        block_epochs,
+        local_dates,
+        local_datetimes,
+        local_strings,
+    )
+
+    offset = response.UtcOffsetSeconds()
+    block = response.Daily()
+    return (
+        local_dates(block_epochs(block), offset),
+        local_strings(block.Variables(5).ValuesInt64AsNumpy(), offset),
+        local_strings(block.Variables(6).ValuesInt64AsNumpy(), offset),
+        local_datetimes(block_epochs(response.Hourly()), offset),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-Meteo decoding benchmark")
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    response = make_bundle_response()
+    timezone_str = "America/New_York"
+    service = WeatherService(pool=object(), bundle=True)
+    params = service._bundle_params(35.8, -78.78)
+
+    # both must agree before timing them
+    assert pandas_time_axes(response, timezone_str) == numpy_time_axes(
+        response, timezone_str
+    )
+
+    cases = {
+        "time axes, pandas (previous)": lambda: pandas_time_axes(
+            response, timezone_str
+        ),
+        "time axes, openmeteo_decode": lambda: numpy_time_axes(response, timezone_str),
+        "full bundle decode": lambda: service.decode_response(
+            response, params, "bundle"
+        ),
+    }
+    for name, fn in cases.items():
+        fn()  # warm up imports
+        seconds = timeit.timeit(fn, number=args.number) / args.number
+        print(f"{name:32s} {seconds * 1e6:10.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Payload size report: session-merged responses vs the view schemas.
+
+Builds the /search JSON and the hourly frame from a canned forecast the
+way the views did (frame data merged with the whole session), then through
+the view schemas, and reports the raw and gzip-compressed sizes. --extra
+pads the session with that many bytes (e.g. a search history) to show that
+the schema payload no longer grows with it.
+
+Usage:
+    python benchmarks/payload_size.py [--hours 6 24 168] [--extra 0 2048]
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import session  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.config import TestingConfig  # noqa: E402
+from app.models.view_schema import serialize_search  # noqa: E402
+from app.routes.utils import (  # noqa: E402
+    ensure_session_defaults,
+    update_view_cur_frame,
+    update_view_hourly_frame,
+)
+from app.services.openmeteo_client import openmeteo_pool  # noqa: E402
+from app.services.openmeteo_fakes import make_bundle_response  # noqa: E402
+
+
+def sizes(payload):
+    """Raw and gzip sizes (bytes) of a JSON payload"""
+    raw = json.dumps(payload).encode("utf-8")
+    return len(raw), len(gzip.compress(raw))
+
+
+def build(hours):
+    """Session-merged (previous) and schema payloads of /search and the frame"""
+    current = update_view_cur_frame()
+    hourly = update_view_hourly_frame(hours)
+    merged_hourly = hourly | dict(session)
+    return {
+        "/search (previous)": session["cur_location"] | current | merged_hourly,
+        "/search (schema v1)": serialize_search(current, hourly),
+        "hourly frame (previous)": merged_hourly,
+        "hourly frame (schema)": hourly,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Payload size report")
+    parser.add_argument("--hours", type=int, nargs="+", default=[6, 24, 168])
+    parser.add_argument("--extra", type=int, nargs="+", default=[0, 2048])
+    args = parser.parse_args(argv)
+
+    app = create_app(TestingConfig)
+    logging.disable(logging.INFO)  # the view builders log their payloads
+    print(f"{'payload':28s} {'hours':>5s} {'extra':>6s} {'raw':>8s} {'gzip':>7s}")
+    with patch.object(
+        openmeteo_pool,
+        "weather_api",
+        side_effect=lambda params, **kwargs: [make_bundle_response()],
+    ):
+        for extra in args.extra:
+            for hours in args.hours:
+                with app.test_request_context():
+                    ensure_session_defaults()
+                    if extra:
+                        session["history"] = "x" * extra
+                    for name, payload in build(hours).items():
+                        raw, packed = sizes(payload)
+                        print(f"{name:28s} {hours:5d} {extra:6d} {raw:8d} {packed:7d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Load profile: gevent server (serve.py) vs the threaded development server.
+
+Starts the app in a child process for each mode, with Open-Meteo and
+Nominatim replaced by fakes that sleep --latency seconds (no network,
+caches and the Nominatim rate limit off, so every request waits on both
+upstreams), then sends --requests POST /search requests from --concurrency
+concurrent clients and reports throughput, latency percentiles and 503s.
+
+- threaded: Flask's server with threaded=True (run.py), a thread per request
+- gevent: app.server.create_server with GeventConfig, a greenlet per
+  request and monkey-patched upstream I/O
+
+Usage:
+    python benchmarks/server_load.py [--requests 1000] [--concurrency 200]
+        [--latency 0.1] [--max-active 200]
+"""
+
+import sys
+
+# the load generator and the gevent server run on greenlets; the threaded
+# server must keep real threads
+if "--serve" not in sys.argv or "gevent" in sys.argv:
+    from gevent import monkey
+
+    monkey.patch_all()
+
+import argparse  # noqa: E402
+import os  # noqa: E402
+import socket  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import time  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NOMINATIM = [
+    {
+        "lat": "35.7915",
+        "lon": "-78.7811",
+        "display_name": "27511, Cary, Wake County, North Carolina, United States",
+    }
+]
+LOCATION = {"postal_code": "27511", "city": "", "state": ""}
+
+
+class FakeNominatimResponse:
+    def json(self):
+        return NOMINATIM
+
+
+def serve(mode, port, latency, max_active):
+    """Child process: run the app with slow fake upstreams"""
+    from app import create_app
+    from app.config import GeventConfig
+    from app.services.nominatim_client import nominatim_pool
+    from app.services.openmeteo_client import openmeteo_pool
+    from app.services.openmeteo_fakes import make_bundle_response
+
+    class LoadConfig(GeventConfig):
+        FORECAST_CACHE_ENABLED = False
+        GEOCODE_CACHE_ENABLED = False
+        GAZETTEER_PATH = None
+        NOMINATIM_RATE_LIMIT = None
+        GEVENT_MAX_ACTIVE = max_active
+
+    def weather_api(params, **kwargs):
+        time.sleep(latency)
+        return [make_bundle_response()]
+
+    def nominatim_get(params):
+        time.sleep(latency)
+        return FakeNominatimResponse()
+
+    openmeteo_pool.weather_api = weather_api
+    nominatim_pool.get = nominatim_get
+
+    app = create_app(LoadConfig)
+    if mode == "gevent":
+        from app.server import create_server
+
+        create_server(app, host="127.0.0.1", port=port).serve_forever()
+    else:
+        app.run(host="127.0.0.1", port=port, threaded=True)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def load(mode, args):
+    """Start a server in mode and measure it under load"""
+    import requests
+    from gevent.pool import Pool
+
+    port = free_port()
+    child = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--serve",
+            mode,
+            "--port",
+            str(port),
+            "--latency",
+            str(args.latency),
+            "--max-active",
+            str(args.max_active),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        # the home page sets the session (units) /search relies on
+        cookies = requests.get(f"http://127.0.0.1:{port}/", timeout=30).cookies
+        url = f"http://127.0.0.1:{port}/search"
+
+        def search(_):
+            start = time.monotonic()
+            try:
+                status = requests.post(
+                    url, json=LOCATION, cookies=cookies, timeout=30
+                ).status_code
+            except requests.RequestException:
+                status = None
+            return time.monotonic() - start, status
+
+        start = time.monotonic()
+        results = list(
+            Pool(args.concurrency).imap_unordered(search, range(args.requests))
+        )
+        elapsed = time.monotonic() - start
+    finally:
+        child.terminate()
+        child.wait()
+
+    latencies = sorted(latency for latency, status in results if status == 200)
+    rejected = sum(1 for _, status in results if status == 503)
+    failed = len(results) - len(latencies) - rejected
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(
+        f"{mode:10s} {len(latencies) / elapsed:8.1f} req/s"
+        f"   p50 {statistics.median(latencies or [0]) * 1000:8.1f} ms"
+        f"   p95 {p95 * 1000:8.1f} ms   503s {rejected:5d}   errors {failed:5d}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="gevent vs threaded load profile")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--max-active", type=int, default=200)
+    parser.add_argument("--serve", choices=("gevent", "threaded"))
+    parser.add_argument("--port", type=int)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.port, args.latency, args.max_active)
+        return 0
+
+    for mode in ("threaded", "gevent"):
+        load(mode, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
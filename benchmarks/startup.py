@@ -0,0 +1,95 @@
+"""
+Cold-start benchmark for create_app().
+
+Each run starts a fresh interpreter with ``python -X importtime``, times
+``create_app()`` and parses the import log, so regressions in the import
+graph (an eager pandas import, I/O at import time, ...) show up as numbers.
+
+Usage:
+    python benchmarks/startup.py [--runs 5] [--top 15] [--budget 1.0]
+
+Exits with status 1 when the median start time exceeds --budget seconds.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be loaded just to boot a worker
+HEAVY_MODULES = ["pandas", "numpy", "requests_cache", "openmeteo_requests"]
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+import app.config
+create_app(getattr(app.config, sys.argv[1]))
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "heavy": [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Parse ``-X importtime`` output.
+
+    Returns:
+        Dictionary of module name -> cumulative import time in microseconds
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def run_once(config):
+    """Start one interpreter and return (result, import times)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SNIPPET, config, *HEAVY_MODULES],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result, parse_importtime(completed.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget", type=float, default=1.0)
+    parser.add_argument("--config", default="ProductionConfig")
+    args = parser.parse_args(argv)
+
+    timings = []
+    for _ in range(args.runs):
+        result, modules = run_once(args.config)
+        timings.append(result["seconds"])
+
+    median = statistics.median(timings)
+    print(f"create_app() cold start over {args.runs} runs ({args.config}):")
+    print(f"  median {median * 1000:.0f} ms, min {min(timings) * 1000:.0f} ms")
+    print(f"  heavy modules loaded: {', '.join(result['heavy']) or 'none'}")
+
+    print(f"\nSlowest imports (cumulative, last run):")
+    for name, micros in sorted(modules.items(), key=lambda m: -m[1])[: args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    if median > args.budget:
+        print(f"\nFAIL: median start {median:.2f}s exceeds budget {args.budget:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
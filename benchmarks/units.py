@@ -0,0 +1,78 @@
+"""
+Unit conversion benchmark: per-value Python loops vs UnitService.
+
+Converts a week of hourly temperatures, wind speeds and precipitation
+amounts (168 values each) the way the views did value by value, then with
+UnitService's array conversions, and reports the time per conversion.
+
+Usage:
+    python benchmarks/units.py [--number 2000] [--hours 168]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes.utils import convert_to_celsius  # noqa: E402
+from app.services.unit_service import UnitService  # noqa: E402
+
+
+def loop_conversion(temperatures, winds, precipitation):
+    """Per-value conversion (reference)"""
+    return (
+        [convert_to_celsius(float(t)) for t in temperatures],
+        [round(w * 1.609344, 1) for w in winds],
+        [round(p / 25.4, 2) for p in precipitation],
+    )
+
+
+def array_conversion(units, temperatures, winds, precipitation):
+    """The same conversions through UnitService"""
+    return (
+        units.temperature(temperatures).tolist(),
+        units.wind(winds).tolist(),
+        units.precipitation(precipitation).tolist(),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Unit conversion benchmark")
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--hours", type=int, default=168)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    temperatures = rng.uniform(-10, 100, args.hours).astype(np.float32)
+    winds = rng.uniform(0, 40, args.hours).astype(np.float32)
+    precipitation = rng.uniform(0, 10, args.hours).astype(np.float32)
+    units = UnitService(temp_unit="C", wind_unit="kmh", precip_unit="in")
+
+    # temperatures must agree exactly (wind/precipitation may differ by one
+    # unit in the last decimal: NumPy rounds halves to even)
+    assert (
+        loop_conversion(temperatures, winds, precipitation)[0]
+        == array_conversion(units, temperatures, winds, precipitation)[0]
+    )
+
+    cases = {
+        "per-value loops (previous)": lambda: loop_conversion(
+            temperatures, winds, precipitation
+        ),
+        "UnitService arrays": lambda: array_conversion(
+            units, temperatures, winds, precipitation
+        ),
+    }
+    for name, fn in cases.items():
+        fn()
+        seconds = timeit.timeit(fn, number=args.number) / args.number
+        print(f"{name:32s} {seconds * 1e6:10.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
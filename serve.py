@@ -0,0 +1,33 @@
+# Production entry point: the app under a gevent WSGI server.
+#
+#     python serve.py            # GEVENT_HOST/GEVENT_PORT, default 0.0.0.0:8000
+#
+# monkey.patch_all() must run before anything imports socket, ssl or
+# threading, so upstream calls (requests/urllib3, redis) become cooperative.
+# Pool and backpressure settings are in GeventConfig (app/config.py).
+from gevent import monkey
+
+monkey.patch_all()
+
+import os  # noqa: E402
+import sys  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv  # noqa: E402
+
+# Load environment variables from .env file before the config is read
+load_dotenv()
+
+from app import create_app  # noqa: E402
+from app.config import GeventConfig  # noqa: E402
+from app.server import create_server  # noqa: E402
+
+app = create_app(GeventConfig)
+
+if __name__ == "__main__":
+    server = create_server(app)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop(timeout=5)
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from app.utils.constants import (
+    UNKNOWN_WEATHER,
+    WEATHER_CODE_MAP,
+    weather_icon,
+    weather_icons,
+)
+
+
+class TestWeatherCodeTables(unittest.TestCase):
+    def test_tables_match_code_map(self):
+        """Dense tables agree with WEATHER_CODE_MAP for every known code"""
+        codes = [int(code) for code in WEATHER_CODE_MAP]
+        for is_day, period in ((True, "day"), (False, "night")):
+            icons, descriptions = weather_icons(codes, is_day)
+            self.assertEqual(
+                icons, [WEATHER_CODE_MAP[str(c)][period]["image"] for c in codes]
+            )
+            self.assertEqual(
+                descriptions,
+                [WEATHER_CODE_MAP[str(c)][period]["description"] for c in codes],
+            )
+
+    def test_single_lookup(self):
+        """Scalar lookups accept ints, floats and numeric strings"""
+        expected = (
+            WEATHER_CODE_MAP["61"]["night"]["image"],
+            WEATHER_CODE_MAP["61"]["night"]["description"],
+        )
+        self.assertEqual(weather_icon(61, False), expected)
+        self.assertEqual(weather_icon(61.0, False), expected)
+        self.assertEqual(weather_icon("61", False), expected)
+
+    def test_unknown_codes(self):
+        """Unknown codes fall back instead of raising KeyError"""
+        unknown = UNKNOWN_WEATHER["day"]["description"]
+        for code in (4, 100, -1, 2.5, None, "rain", float("nan")):
+            self.assertEqual(weather_icon(code)[1], unknown)
+
+        _, descriptions = weather_icons(np.array([0, 4, 250, np.nan]))
+        self.assertEqual(descriptions[0], WEATHER_CODE_MAP["0"]["day"]["description"])
+        self.assertEqual(descriptions[1:], [unknown] * 3)
+
+    def test_per_row_day_flags(self):
+        """Day flags can vary per code"""
+        icons, _ = weather_icons(np.array([0, 0], dtype=np.int16), [True, False])
+        self.assertEqual(
+            icons,
+            [
+                WEATHER_CODE_MAP["0"]["day"]["image"],
+                WEATHER_CODE_MAP["0"]["night"]["image"],
+            ],
+        )
+        self.assertEqual(weather_icons([], True), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.routes.utils import get_is_day
+from app.services.daylight import is_day, sun_times
+
+# 2025-05-03 00:00 America/New_York (EDT) as a UTC epoch
+DAY0 = 1746244800
+OFFSET = -4 * 3600
+
+
+class TestDaylight(unittest.TestCase):
+    def setUp(self):
+        days = np.arange(7) * 86400
+        self.sunrise = DAY0 + days + 6 * 3600 + 30 * 60
+        self.sunset = DAY0 + days + 20 * 3600
+        self.data = {
+            "daily_sunrise_epochs": self.sunrise.tolist(),
+            "daily_sunset_epochs": self.sunset.tolist(),
+            "utc_offset": OFFSET,
+            "daily_sunrise": [f"2025-05-{3 + i:02d} 06:30:00" for i in range(7)],
+            "daily_sunset": [f"2025-05-{3 + i:02d} 20:00:00" for i in range(7)],
+        }
+
+    def test_whole_week(self):
+        """Every day of the forecast is classified, not just the first two"""
+        hours = DAY0 + np.arange(168) * 3600
+        flags = is_day(hours, self.sunrise, self.sunset)
+        hour_of_day = np.arange(168) % 24
+        np.testing.assert_array_equal(flags, (hour_of_day >= 7) & (hour_of_day < 20))
+
+    def test_boundaries_are_night(self):
+        """Sunrise and sunset instants themselves are not daytime"""
+        flags = is_day(
+            [self.sunrise[0], self.sunset[0], DAY0 - 3600, self.sunset[-1] + 3600],
+            self.sunrise,
+            self.sunset,
+        )
+        self.assertEqual(flags.tolist(), [False, False, False, False])
+        self.assertEqual(is_day([DAY0], [], []).tolist(), [False])
+
+    def test_polar_days_use_upstream_flags(self):
+        """Polar days (no sunrise/sunset) take the upstream flags"""
+        hours = DAY0 + np.arange(48) * 3600
+        upstream = np.ones(48)
+        # no sunset after the sunrise: the sun stays up all day
+        flags = is_day(hours, self.sunrise[:2], self.sunrise[:2], fallback=upstream)
+        self.assertTrue(flags.all())
+
+        with self.assertRaises(ValueError):
+            is_day(hours, self.sunrise[:2], self.sunrise[:2])
+
+    def test_missing_values_use_upstream_flags(self):
+        """NaN/NaT, unsorted or misaligned tables are never searched"""
+        hours = DAY0 + np.arange(48) * 3600
+        upstream = (np.arange(48) % 24 >= 12).astype(np.float32)
+        sunrise = self.sunrise[:2].astype(float)
+        sunset = self.sunset[:2].astype(float)
+        cases = {
+            "nan sunrise": (hours, [np.nan, sunrise[1]], sunset),
+            "nan sunset": (hours, sunrise, [sunset[0], np.nan]),
+            "unsorted": (hours, sunrise[::-1], sunset[::-1]),
+            "misaligned": (hours, sunrise, sunset[:1]),
+            "nat": (
+                np.datetime64("2025-05-03T00:00", "s") + np.arange(48) * 3600,
+                np.array(["2025-05-03T06:30", "NaT"], dtype="datetime64[s]"),
+                np.array(
+                    ["2025-05-03T20:00", "2025-05-04T20:00"], dtype="datetime64[s]"
+                ),
+            ),
+        }
+        for name, (times, rise, set_) in cases.items():
+            with self.subTest(name):
+                flags = is_day(times, rise, set_, fallback=upstream)
+                np.testing.assert_array_equal(flags, upstream.astype(bool))
+                with self.assertRaises(ValueError):
+                    is_day(times, rise, set_)
+
+        with self.assertRaises(ValueError):
+            is_day(hours, [np.nan], [np.nan], fallback=upstream[:6])
+
+    def test_local_times_from_epochs_and_strings(self):
+        """Epoch payloads and string-only payloads give the same local times"""
+        from_epochs = sun_times(self.data)
+        legacy = {k: v for k, v in self.data.items() if "epochs" not in k}
+        from_strings = sun_times(legacy)
+        np.testing.assert_array_equal(from_epochs[0], from_strings[0])
+        np.testing.assert_array_equal(from_epochs[1], from_strings[1])
+
+    def test_matches_get_is_day(self):
+        """Agrees with the per-hour string parser over its two-day range"""
+        sunrise, sunset = sun_times(self.data)
+        hours = [datetime(2025, 5, 3) + timedelta(minutes=30 * i) for i in range(96)]
+        flags = is_day(np.array(hours, dtype="datetime64[s]"), sunrise, sunset)
+        expected = [
+            get_is_day(hour, self.data["daily_sunrise"], self.data["daily_sunset"])
+            == "day"
+            for hour in hours
+        ]
+        self.assertEqual(flags.tolist(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+
+from app import create_app
+from app.config import TestingConfig
+from app.services.openmeteo_client import openmeteo_pool
+from app.services.openmeteo_fakes import make_bundle_response
+from app.services.page_cache import page_cache
+
+
+class ConditionalGetTest(unittest.TestCase):
+    config = TestingConfig
+
+    def setUp(self):
+        self.app = create_app(self.config)
+        self.client = self.app.test_client()
+        self.get("/")  # session defaults (Cary, NC; F/mph/in)
+
+    def get(self, url, **kwargs):
+        with patch.object(
+            openmeteo_pool,
+            "weather_api",
+            side_effect=lambda params, **kw: [make_bundle_response()],
+        ) as weather_api:
+            response = self.client.get(url, **kwargs)
+        return response, weather_api.call_count
+
+
+class TestConditionalPages(ConditionalGetTest):
+    def test_validators(self):
+        response, _ = self.get("/forecast")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["ETag"])
+        self.assertIn("private", response.headers["Cache-Control"])
+        self.assertIn("no-cache", response.headers["Cache-Control"])
+        self.assertIn("Cookie", response.headers["Vary"])
+
+    def test_not_modified(self):
+        """Without the page cache the ETag is a hash of the rendered page"""
+        first, _ = self.get("/hourly")
+        second, _ = self.get(
+            "/hourly", headers={"If-None-Match": first.headers["ETag"]}
+        )
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.data, b"")
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+
+        third, _ = self.get("/hourly", headers={"If-None-Match": '"stale"'})
+        self.assertEqual(third.status_code, 200)
+
+    @patch("app.routes.routes.LocService")
+    def test_json_endpoints(self, mock_loc_service):
+        mock_loc_service.return_value.get_lat_lon.return_value = {
+            "lat": "35.7915",
+            "lon": "-78.7811",
+        }
+        response = self.client.post("/api/location", json={"postal_code": "27511"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["ETag"])
+
+        metrics = self.client.get("/api/metrics")
+        self.assertNotIn("ETag", metrics.headers)
+        self.assertIn("no-store", metrics.headers["Cache-Control"])
+
+
+class TestConditionalCachedPages(ConditionalGetTest):
+    class config(TestingConfig):
+        PAGE_CACHE_ENABLED = True
+
+    def tearDown(self):
+        page_cache.enabled = False
+        page_cache.clear()
+
+    def test_not_modified_before_rendering(self):
+        """A cached page's stored ETag answers revalidations: no fetch, no render"""
+        first, calls = self.get("/hourly")
+        self.assertEqual(calls, 1)
+
+        with patch("app.routes.routes.render_template") as render:
+            second, calls = self.get(
+                "/hourly", headers={"If-None-Match": first.headers["ETag"]}
+            )
+        self.assertEqual((second.status_code, calls), (304, 0))
+        render.assert_not_called()
+
+        # a full GET of the cached page carries the same ETag
+        third, _ = self.get("/hourly")
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(third.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(third.data, first.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app import create_app
+from app.config import TestingConfig
+from app.services.fan_out import FanOut, FanOutTimeout
+from app.services.openmeteo_client import openmeteo_pool
+from app.services.openmeteo_fakes import make_bundle_response
+from app.services.weather_service import WeatherService
+
+COORDS = {"lat": 35.7915, "lon": -78.7811}
+
+
+class TestFanOut(unittest.TestCase):
+    def setUp(self):
+        self.fan_out = FanOut(max_workers=4, deadline=2.0)
+
+    def tearDown(self):
+        self.fan_out.shutdown()
+
+    def test_calls_run_concurrently(self):
+        """Wall-clock time is the slowest call, not the sum"""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def call(value):
+            # every call must be running at the same time to pass the barrier
+            barrier.wait()
+            return value
+
+        start = time.monotonic()
+        results = self.fan_out.run({name: (lambda n=name: call(n)) for name in "abc"})
+        self.assertEqual(results, {"a": "a", "b": "b", "c": "c"})
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(self.fan_out.stats()["calls"], 3)
+
+    def test_deadline(self):
+        """Slow calls fail the batch at the deadline"""
+        release = threading.Event()
+        with self.assertRaises(FanOutTimeout) as raised:
+            self.fan_out.run(
+                {"fast": lambda: 1, "slow": lambda: release.wait(5)}, deadline=0.1
+            )
+        release.set()
+        self.assertEqual(raised.exception.pending, ["slow"])
+        self.assertEqual(self.fan_out.stats()["timeouts"], 1)
+
+    def test_errors_propagate(self):
+        def fail():
+            raise ValueError("upstream down")
+
+        with self.assertRaises(ValueError):
+            self.fan_out.run({"ok": lambda: 1, "bad": fail})
+
+    def test_disabled_runs_in_order(self):
+        order = []
+        fan_out = FanOut(enabled=False)
+        fan_out.run({"a": lambda: order.append("a"), "b": lambda: order.append("b")})
+        self.assertEqual(order, ["a", "b"])
+
+
+class TestWeatherPrefetch(unittest.TestCase):
+    def test_prefetched_forecasts_are_reused(self):
+        """Separate requests run concurrently and feed the getters"""
+        pool = MagicMock()
+        pool.weather_api.side_effect = lambda params, **kwargs: [make_bundle_response()]
+        weather = WeatherService(pool=pool, bundle=False)
+        fan_out = FanOut(max_workers=3)
+        try:
+            weather.prefetch(COORDS, ("cur", "hourly", "daily"), fan_out=fan_out)
+        finally:
+            fan_out.shutdown()
+        self.assertEqual(pool.weather_api.call_count, 3)
+
+        weather.get_cur_forecast(COORDS)
+        weather.get_hourly_forecast(COORDS)
+        weather.get_7_day_forecast(COORDS)
+        self.assertEqual(pool.weather_api.call_count, 3)
+
+    def test_bundle_mode_skips_fan_out(self):
+        pool = MagicMock()
+        fan_out = FanOut()
+        WeatherService(pool=pool, bundle=True).prefetch(
+            COORDS, ("cur", "hourly"), fan_out=fan_out
+        )
+        pool.weather_api.assert_not_called()
+        self.assertEqual(fan_out.stats()["batches"], 0)
+        self.assertIsNone(fan_out._executor)  # no pool threads started
+
+
+class TestDeadlineResponses(unittest.TestCase):
+    """A missed deadline is an error page for browsers, JSON for fetch()"""
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        with patch.object(
+            openmeteo_pool,
+            "weather_api",
+            side_effect=lambda params, **kwargs: [make_bundle_response()],
+        ):
+            self.client.get("/")  # session defaults
+        timeout = patch(
+            "app.routes.routes.prefetch_forecasts",
+            side_effect=FanOutTimeout({"daily"}, 10.0),
+        )
+        timeout.start()
+        self.addCleanup(timeout.stop)
+
+    def test_pages_render_the_error_page(self):
+        response = self.client.get("/forecast", headers={"Accept": "text/html"})
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.mimetype, "text/html")
+        self.assertIn(b"Weather Interruption", response.data)
+
+    def test_json_callers_get_json(self):
+        response = self.client.get("/hourly", headers={"Accept": "application/json"})
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.get_json()["pending"], ["daily"])
+
+        with patch("app.routes.routes.verify", return_value=True):
+            response = self.client.post("/search", json={"postal_code": "27511"})
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.get_json()["error"], "Forecast service timed out")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+
+from app.services.forecast_cache import ForecastCache, pack, unpack
+from app.services.openmeteo_fakes import make_bundle_response
+from app.services.weather_service import WeatherService
+
+PARAMS = {
+    "latitude": "35.791212",
+    "longitude": "-78.781104",
+    "daily": ["temperature_2m_max"],
+    "timezone": "auto",
+}
+
+
+class TestForecastCache(unittest.TestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        self.cache = ForecastCache(client=self.redis, ttl=60)
+
+    def test_pack_round_trip(self):
+        """Payloads with naive datetimes survive msgpack encoding"""
+        payload = {
+            "hours": [datetime(2025, 5, 3, 7, 0), datetime(2025, 5, 3, 8, 0)],
+            "hourly_temperature_2m": [60.5, 61.0],
+            "timezone": "America/New_York",
+        }
+        self.assertEqual(unpack(pack(payload)), payload)
+
+    def test_key_quantizes_coordinates(self):
+        """Nearby coordinates with the same variables share a key"""
+        nearby = PARAMS | {"latitude": 35.7913, "longitude": -78.7809}
+        self.assertEqual(
+            self.cache.make_key("daily", PARAMS), self.cache.make_key("daily", nearby)
+        )
+
+        other_vars = PARAMS | {"daily": ["temperature_2m_min"]}
+        self.assertNotEqual(
+            self.cache.make_key("daily", PARAMS),
+            self.cache.make_key("daily", other_vars),
+        )
+
+    def test_set_get_with_ttl(self):
+        """Entries are stored with the configured TTL and counted"""
+        key = self.cache.make_key("daily", PARAMS)
+        self.assertIsNone(self.cache.get(key))
+
+        self.cache.set(key, {"date": ["2025-05-03"]})
+
+        self.assertEqual(self.cache.get(key), {"date": ["2025-05-03"]})
+        self.assertTrue(0 < self.redis.ttl(key) <= 60)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_redis_failure_is_bypassed(self):
+        """A broken Redis degrades to misses and backs off"""
+        client = MagicMock()
+        client.get.side_effect = ConnectionError("down")
+        cache = ForecastCache(client=client)
+
+        self.assertIsNone(cache.get("key"))
+        self.assertIsNone(cache.get("key"))
+
+        client.get.assert_called_once()
+        self.assertEqual(cache.stats()["errors"], 1)
+
+    def test_weather_service_uses_cache(self):
+        """A second service (e.g. another worker) is served from the cache"""
+        pool = MagicMock()
+        pool.weather_api.return_value = [make_bundle_response()]
+        coords = {"lat": 35.7915, "lon": -78.7811}
+
+        first = WeatherService(pool=pool, bundle=True, cache=self.cache)
+        second = WeatherService(pool=pool, bundle=True, cache=self.cache)
+
+        hourly = first.get_hourly_forecast(coords)
+        cached = second.get_hourly_forecast(coords)
+
+        pool.weather_api.assert_called_once()
+        self.assertEqual(cached["hours"], hourly["hours"])
+        self.assertEqual(cached["daily_sunrise"], hourly["daily_sunrise"])
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        self.cache = ForecastCache(client=self.redis, ttl=60, max_stale=300)
+        self.key = self.cache.make_key("daily", PARAMS)
+
+    def store_expired(self, payload):
+        """Write an entry whose TTL ran out two minutes ago"""
+        with patch("app.services.forecast_cache.time.time", return_value=0):
+            self.cache.set(self.key, payload)
+        with patch("app.services.forecast_cache.time.time", return_value=120):
+            return self.cache.lookup(self.key)
+
+    def test_expired_entry_served_stale(self):
+        """Entries past their TTL are kept for max_stale and flagged"""
+        self.cache.set(self.key, {"date": ["2025-05-03"]})
+        self.assertEqual(self.cache.lookup(self.key), ({"date": ["2025-05-03"]}, False))
+        self.assertTrue(60 < self.redis.ttl(self.key) <= 360)
+
+        payload, stale = self.store_expired({"date": ["2025-05-02"]})
+
+        self.assertEqual(payload, {"date": ["2025-05-02"]})
+        self.assertTrue(stale)
+        self.assertEqual(self.cache.stats()["stale_hits"], 1)
+
+    def test_refresh_runs_once_per_key(self):
+        """Concurrent refreshes of one key are collapsed and run off-thread"""
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(threading.current_thread().name)
+            release.wait(1)
+
+        self.assertTrue(self.cache.refresh(self.key, fetch))
+        self.assertFalse(self.cache.refresh(self.key, fetch))
+        release.set()
+        self.cache._executor.shutdown(wait=True)
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(calls[0].startswith("forecast-refresh"))
+        self.assertEqual(self.cache.stats()["refreshes"], 1)
+
+    def test_weather_service_serves_stale_and_refreshes(self):
+        """A stale forecast is returned at once and revalidated upstream"""
+        pool = MagicMock()
+        pool.weather_api.return_value = [make_bundle_response()]
+        weather = WeatherService(pool=pool, bundle=True, cache=self.cache)
+        params = weather._bundle_params(35.8, -78.78)
+        self.key = self.cache.make_key("bundle", params)
+        self.store_expired({"cur": "old", "hourly": {}, "daily": {}})
+
+        with patch("app.services.forecast_cache.time.time", return_value=120):
+            bundle = weather.get_forecast_bundle({"lat": 35.7915, "lon": -78.7811})
+        self.cache._executor.shutdown(wait=True)
+
+        self.assertEqual(bundle["cur"], "old")
+        pool.weather_api.assert_called_once()
+        self.assertTrue(pool.weather_api.call_args[1]["refresh"])
+        self.assertEqual(
+            self.cache.lookup(self.key)[0]["cur"]["timezone"], "America/New_York"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytz
+
+from app.models.forecast_frame import UNKNOWN_WEATHER_CODE, ForecastFrame
+from app.routes.utils import convert_to_celsius
+from app.utils.constants import weather_icons
+
+START = datetime(2025, 5, 3, 0, 0)
+
+
+class TestForecastFrame(unittest.TestCase):
+    def setUp(self):
+        self.hourly = {
+            "hours": [START + timedelta(hours=i) for i in range(48)],
+            "hourly_temperature_2m": np.linspace(40, 87, 48, dtype=np.float32),
+            "hourly_weather_code": [3.0] * 48,
+            "hourly_precipitation_probability": [10.0] * 48,
+        }
+        self.frame = ForecastFrame.from_hourly(self.hourly)
+
+    def test_typed_columns(self):
+        """Service lists become compact typed columns"""
+        self.assertEqual(len(self.frame), 48)
+        self.assertEqual(self.frame.time.dtype, np.dtype("datetime64[s]"))
+        self.assertEqual(self.frame.weather_code.dtype, np.int16)
+        self.assertIsNone(self.frame.temperature_min)
+        with self.assertRaises(AttributeError):
+            self.frame.extra = 1
+
+    def test_window_is_zero_copy(self):
+        """Slicing shares the column buffers"""
+        window = self.frame[5:11]
+        self.assertEqual(len(window), 6)
+        self.assertTrue(np.shares_memory(window.temperature, self.frame.temperature))
+        self.assertEqual(window.hour_labels()[0], "05:00")
+
+    def test_index_after(self):
+        """The window starts after the location's current time"""
+        eastern = pytz.timezone("America/New_York")
+        now = eastern.localize(datetime(2025, 5, 3, 6, 30))
+        self.assertEqual(self.frame.index_after(now), 7)
+        self.assertEqual(self.frame.index_after(datetime(2025, 5, 3, 7, 0)), 8)
+        self.assertEqual(self.frame.index_after(datetime(2025, 5, 9)), 48)
+
+    def test_window_from(self):
+        """Windows of any length start after now, or at the start if stale"""
+        now = datetime(2025, 5, 3, 6, 30)
+        for length in (6, 24, 48, 168):
+            window = self.frame.window_from(now, length)
+            self.assertEqual(len(window), min(length, 48 - 7))
+            self.assertEqual(window.hour_labels()[0], "07:00")
+            self.assertTrue(np.shares_memory(window.time, self.frame.time))
+
+        stale = self.frame.window_from(datetime(2025, 5, 9), 6)
+        self.assertEqual(stale.hour_labels()[0], "00:00")
+        self.assertEqual(self.frame.index_after(np.datetime64("2025-05-03T06:30")), 7)
+
+    def test_temperatures_match_scalar_conversion(self):
+        """Vectorized conversion matches convert_to_celsius at full precision"""
+        temps = self.frame.temperature
+        self.assertEqual(
+            self.frame.temperatures("C").tolist(),
+            [convert_to_celsius(float(t)) for t in temps],
+        )
+        self.assertEqual(self.frame.temperatures("F").tolist(), [int(t) for t in temps])
+
+    def test_from_daily(self):
+        """Daily frames carry the minimum temperature column"""
+        frame = ForecastFrame.from_daily(
+            {
+                "date": ["2025-05-03", "2025-05-04"],
+                "temperature_2m_max": [66.0, 70.2],
+                "temperature_2m_min": [44.0, 46.2],
+                "weather_code": [0.0, 2.0],
+                "precipitation_probability_max": [0.0, 20.0],
+            }
+        )
+        self.assertEqual(frame.temperatures("C", minimum=True).tolist(), [6, 7])
+        self.assertEqual(frame.time_strings(unit="D"), ["2025-05-03", "2025-05-04"])
+
+    def test_missing_weather_codes(self):
+        """NaN codes past the forecast horizon show the "Unknown" row"""
+        frame = ForecastFrame.from_daily(
+            {
+                "date": ["2025-05-03", "2025-05-04", "2025-05-05"],
+                "temperature_2m_max": [66.0, 70.2, np.nan],
+                "temperature_2m_min": [44.0, 46.2, np.nan],
+                "weather_code": np.array([2.0, np.nan, np.inf], dtype=np.float32),
+                "precipitation_probability_max": [0.0, 20.0, np.nan],
+            }
+        )
+        self.assertEqual(
+            frame.weather_code.tolist(), [2, UNKNOWN_WEATHER_CODE, UNKNOWN_WEATHER_CODE]
+        )
+        _, descriptions = weather_icons(frame.weather_code)
+        self.assertEqual(descriptions, ["Partly Cloudy", "Unknown", "Unknown"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.services.gazetteer import Gazetteer, build, main
+from app.services.loc_api import LocService
+
+ROWS = [
+    ("27511", "Cary", "NC", 35.7641, -78.7786),
+    ("27513", "Cary", "NC", 35.8021, -78.8003),
+    ("02134", "Allston", "MA", 42.3539, -71.1337),
+    ("81212", "Cañon City", "CO", 38.4494, -105.2253),
+]
+
+GEONAMES = (
+    "US\t27511\tCary\tNorth Carolina\tNC\tWake\t183\t\t\t35.7641\t-78.7786\t4\n"
+    "US\t02134\tAllston\tMassachusetts\tMA\tSuffolk\t025\t\t\t42.3539\t-71.1337\t4\n"
+)
+
+
+class TestGazetteer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "gazetteer.bin")
+        build(ROWS, self.path)
+        self.gazetteer = Gazetteer(self.path)
+
+    def tearDown(self):
+        self.gazetteer = None
+        self.tmp.cleanup()
+
+    def test_lookup_postal(self):
+        """Postal codes resolve to their centroid, city and state"""
+        self.assertEqual(
+            self.gazetteer.lookup_postal("02134"),
+            {
+                "lat": "42.3539",
+                "lon": "-71.1337",
+                "postal_code": "02134",
+                "city": "Allston",
+                "state": "MA",
+            },
+        )
+        self.assertEqual(self.gazetteer.lookup_postal("27511-1234")["city"], "Cary")
+        self.assertIsNone(self.gazetteer.lookup_postal("99999"))
+        self.assertIsNone(self.gazetteer.lookup_postal("abc"))
+
+    def test_lookup_city(self):
+        """City centroids average their postal codes; names are normalized"""
+        cary = self.gazetteer.lookup_city(" cary", "North Carolina")
+        self.assertEqual((cary["city"], cary["state"]), ("Cary", "NC"))
+        self.assertEqual(cary["lat"], "35.7831")
+        self.assertEqual(cary["postal_code"], "")
+
+        self.assertEqual(self.gazetteer.lookup_city("Cañon City", "CO")["state"], "CO")
+        self.assertIsNone(self.gazetteer.lookup_city("Cary", "IL"))
+
+        stats = self.gazetteer.stats()
+        self.assertEqual((stats["postal_codes"], stats["cities"]), (4, 3))
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+    def test_unloaded_gazetteer_misses(self):
+        """Without an index every lookup falls through"""
+        self.assertIsNone(Gazetteer().lookup_postal("27511"))
+
+    def test_build_from_geonames(self):
+        """The command line builds an index from a GeoNames dump"""
+        source = os.path.join(self.tmp.name, "US.txt")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write(GEONAMES)
+        output = os.path.join(self.tmp.name, "out.bin")
+
+        self.assertEqual(main(["build", source, output]), 0)
+        self.assertEqual(Gazetteer(output).lookup_postal("27511")["state"], "NC")
+
+    @patch("requests.get")
+    def test_loc_service_skips_nominatim(self, mock_get):
+        """Known places never reach Nominatim; unknown ones still do"""
+        service = LocService({}, gazetteer=self.gazetteer)
+
+        result = service.get_lat_lon({"postal_code": "27513", "city": "", "state": ""})
+        self.assertEqual(result["city"], "Cary")
+        mock_get.assert_not_called()
+
+        mock_get.return_value.json.return_value = []
+        service.get_lat_lon({"postal_code": "", "city": "Springfield", "state": "IL"})
+        mock_get.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
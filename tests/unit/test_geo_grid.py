@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import MagicMock
+
+from app.services.geo_grid import CoordinateGrid
+from app.services.openmeteo_fakes import make_bundle_response
+from app.services.weather_service import WeatherService
+
+
+class TestCoordinateGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = CoordinateGrid(resolution=0.02)
+
+    def test_snap(self):
+        """Coordinates snap to the nearest grid point without float noise"""
+        self.assertEqual(self.grid.snap("35.7915", "-78.7811"), (35.8, -78.78))
+        self.assertEqual(self.grid.snap(35.7795897, -78.6381787), (35.78, -78.64))
+
+    def test_snap_disabled(self):
+        """A zero resolution passes coordinates through as floats"""
+        grid = CoordinateGrid(resolution=0)
+        self.assertEqual(grid.snap("35.7915", "-78.7811"), (35.7915, -78.7811))
+
+    def test_collapse_report(self):
+        """Postal code and city searches for the same town collapse"""
+        zip_result = {"lat": "35.7915", "lon": "-78.7811", "postal_code": "27511"}
+        city_result = {"lat": "35.7937", "lon": "-78.7756", "city": "Cary"}
+
+        snapped = self.grid.snap_coords(zip_result)
+        self.grid.snap_coords(city_result)
+        self.grid.snap_coords(city_result)
+
+        self.assertEqual(snapped["postal_code"], "27511")
+        stats = self.grid.stats()
+        self.assertEqual(stats["lookups"], 3)
+        self.assertEqual(stats["raw_keys"], 2)
+        self.assertEqual(stats["grid_keys"], 1)
+        self.assertEqual(stats["collapsed_keys"], 1)
+
+    def test_weather_service_shares_grid_cell(self):
+        """Nearby coordinates reuse one upstream request"""
+        pool = MagicMock()
+        pool.weather_api.return_value = [make_bundle_response()]
+        weather = WeatherService(pool=pool, bundle=True, grid=self.grid)
+
+        weather.get_cur_forecast({"lat": "35.7915", "lon": "-78.7811"})
+        weather.get_cur_forecast({"lat": "35.7937", "lon": "-78.7756"})
+
+        pool.weather_api.assert_called_once()
+        params = pool.weather_api.call_args[0][0]
+        self.assertEqual((params["latitude"], params["longitude"]), (35.8, -78.78))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+import fakeredis
+
+from app.services.geocode_cache import (
+    GeocodeCache,
+    RedisGeocodeBackend,
+    SQLiteGeocodeBackend,
+)
+from app.services.loc_api import LocService
+
+NOMINATIM_ZIP = [
+    {
+        "lat": "35.7915",
+        "lon": "-78.7811",
+        "display_name": "27511, Cary, Wake County, North Carolina, United States",
+    }
+]
+
+
+class TestGeocodeCache(unittest.TestCase):
+    def test_key_normalization(self):
+        """Spelling variations of one search share a key"""
+        make_key = GeocodeCache.make_key
+        self.assertEqual(
+            make_key({"postalcode": " 27511 ", "format": "json"}), "zip:27511"
+        )
+        self.assertEqual(
+            make_key({"city": "Cary", "state": "North Carolina"}),
+            make_key({"city": "  cary ", "state": "NC"}),
+        )
+        self.assertNotEqual(
+            make_key({"city": "Cary", "state": "NC"}),
+            make_key({"city": "Cary", "state": "IL"}),
+        )
+
+    def test_lru_eviction(self):
+        """The in-process cache keeps the most recently used entries"""
+        cache = GeocodeCache(max_entries=2, enabled=True)
+        cache.set("a", {"lat": "1"})
+        cache.set("b", {"lat": "2"})
+        cache.get("a")
+        cache.set("c", {"lat": "3"})
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"lat": "1"})
+
+    def test_negative_entries_use_short_ttl(self):
+        """Not-found answers are cached for negative_ttl only"""
+        redis = fakeredis.FakeRedis()
+        cache = GeocodeCache(
+            backend=RedisGeocodeBackend(redis), ttl=1000, negative_ttl=60, enabled=True
+        )
+        cache.set("zip:00000", {})
+        cache.set("zip:27511", {"lat": "35.79"})
+
+        self.assertEqual(cache.get("zip:00000"), {})
+        self.assertTrue(0 < redis.ttl("geocode:zip:00000") <= 60)
+        self.assertTrue(60 < redis.ttl("geocode:zip:27511") <= 1000)
+        self.assertEqual(cache.stats()["negative_hits"], 1)
+
+    def test_sqlite_backend_survives_restart(self):
+        """Entries in the SQLite backend are visible to a new process"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "geocode.sqlite")
+            GeocodeCache(backend=SQLiteGeocodeBackend(path), enabled=True).set(
+                "zip:27511", {"lat": "35.79"}
+            )
+
+            restarted = GeocodeCache(backend=SQLiteGeocodeBackend(path), enabled=True)
+            self.assertEqual(restarted.get("zip:27511"), {"lat": "35.79"})
+
+    def test_sqlite_backend_drops_expired_rows(self):
+        """Expired and excess rows are deleted, the file does not grow"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "geocode.sqlite")
+            backend = SQLiteGeocodeBackend(path, max_rows=3, purge_every=2)
+            backend.set("zip:00000", "{}", ttl=-1)  # expired negative entry
+            backend.set("zip:27511", '{"lat": "35.79"}', ttl=60)
+            self.assertEqual(backend.count(), 1)
+
+            backend.set("zip:00001", "{}", ttl=-1)
+            self.assertEqual(SQLiteGeocodeBackend(path).count(), 1)  # at open
+
+            capped = SQLiteGeocodeBackend(path, max_rows=3, purge_every=1)
+            for i in range(4):
+                capped.set(f"zip:1000{i}", "{}", ttl=60 + i)
+            self.assertEqual(capped.count(), 3)
+            self.assertIsNone(capped.get("zip:27511"))  # closest to expiry
+            self.assertEqual(capped.get("zip:10003"), "{}")
+
+    def test_backend_failure_is_a_miss(self):
+        """A broken backend does not fail the search"""
+        backend = MagicMock()
+        backend.get.side_effect = ConnectionError("down")
+        cache = GeocodeCache(backend=backend, enabled=True)
+
+        self.assertIsNone(cache.get("zip:27511"))
+        self.assertEqual(cache.stats()["errors"], 1)
+
+
+class TestLocServiceCaching(unittest.TestCase):
+    def setUp(self):
+        self.cache = GeocodeCache(enabled=True)
+        self.service = LocService({}, cache=self.cache)
+
+    @patch("requests.get")
+    def test_repeat_search_served_from_cache(self, mock_get):
+        """Only the first search for a postal code reaches Nominatim"""
+        mock_get.return_value.json.return_value = NOMINATIM_ZIP
+        params = {"postalcode": "27511", "format": "json"}
+
+        first = self.service.fetch_location(params, s_type=0)
+        second = self.service.fetch_location(dict(params), s_type=0)
+
+        mock_get.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertEqual(second["city"], "Cary")
+
+    @patch("requests.get")
+    def test_not_found_is_cached_but_errors_are_not(self, mock_get):
+        """Empty answers are cached; request failures are retried"""
+        mock_get.return_value.json.return_value = []
+        params = {"postalcode": "00000", "format": "json"}
+        self.assertEqual(self.service.fetch_location(params), {})
+        self.assertEqual(self.service.fetch_location(params), {})
+        mock_get.assert_called_once()
+
+        mock_get.reset_mock()
+        mock_get.side_effect = Exception("API Error")
+        params = {"postalcode": "27511", "format": "json"}
+        self.service.fetch_location(params)
+        self.service.fetch_location(params)
+        self.assertEqual(mock_get.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
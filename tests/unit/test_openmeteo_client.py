@@ -0,0 +1,102 @@
+import unittest
+import threading
+from unittest.mock import patch, MagicMock
+
+from flask import Flask
+
+from app.services.openmeteo_client import OpenMeteoClientPool
+
+
+class TestOpenMeteoClientPool(unittest.TestCase):
+    def setUp(self):
+        """Create a pool with an in-memory HTTP cache"""
+        self.pool = OpenMeteoClientPool(cache_backend="memory", pool_maxsize=4)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_client_is_built_once(self):
+        """Concurrent callers share a single client"""
+        clients = []
+
+        def grab():
+            clients.append(self.pool.get_client())
+
+        threads = [threading.Thread(target=grab) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len({id(c) for c in clients}), 1)
+
+    def test_adapter_uses_configured_pool_size(self):
+        """The mounted adapter is sized from the settings and keeps retries"""
+        self.pool.get_client()
+        adapter = self.pool._session.get_adapter("https://")
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 5)
+
+    def test_keep_alive_disabled(self):
+        """keep_alive=False asks the server to close connections"""
+        pool = OpenMeteoClientPool(cache_backend="memory", keep_alive=False)
+        pool.get_client()
+        self.assertEqual(pool._session.headers["Connection"], "close")
+        pool.close()
+
+    def test_init_app_reads_config(self):
+        """init_app applies Flask config and registers the extension"""
+        app = Flask(__name__)
+        app.config["OPENMETEO_POOL_MAXSIZE"] = 7
+        app.config["OPENMETEO_CACHE_BACKEND"] = "memory"
+        app.config["API_TIMEOUT"] = 2
+
+        self.pool.init_app(app)
+
+        self.assertIs(app.extensions["openmeteo_pool"], self.pool)
+        self.assertEqual(self.pool.settings["pool_maxsize"], 7)
+        self.assertEqual(self.pool.settings["timeout"], 2)
+        # the client is built lazily unless preloading is requested
+        self.assertIsNone(self.pool._client)
+
+        app.config["OPENMETEO_PRELOAD"] = True
+        self.pool.init_app(app)
+        self.assertIsNotNone(self.pool._client)
+
+    def test_weather_api_tracks_stats(self):
+        """Calls and errors are counted for the utilization report"""
+        mock_client = MagicMock()
+        mock_client.weather_api.return_value = ["response"]
+
+        with patch.object(self.pool, "get_client", return_value=mock_client):
+            self.assertEqual(self.pool.weather_api({"latitude": 1}), ["response"])
+
+            mock_client.weather_api.side_effect = Exception("API error")
+            with self.assertRaises(Exception):
+                self.pool.weather_api({"latitude": 1})
+
+        args, kwargs = mock_client.weather_api.call_args
+        self.assertEqual(args[0], self.pool.settings["url"])
+        self.assertEqual(kwargs["timeout"], self.pool.settings["timeout"])
+
+        stats = self.pool.stats()
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["peak_in_flight"], 1)
+        self.assertEqual(stats["pool_maxsize"], 4)
+
+    def test_refresh_bypasses_http_cache(self):
+        """Revalidation asks the cached session for a fresh response"""
+        mock_client = MagicMock()
+
+        with patch.object(self.pool, "get_client", return_value=mock_client):
+            self.pool.weather_api({"latitude": 1})
+            self.assertNotIn("force_refresh", mock_client.weather_api.call_args[1])
+
+            self.pool.weather_api({"latitude": 1}, refresh=True)
+            self.assertTrue(mock_client.weather_api.call_args[1]["force_refresh"])
+
+
+if __name__ == "__main__":
+    unittest.main()
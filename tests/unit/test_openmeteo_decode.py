@@ -0,0 +1,63 @@
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from app.services.openmeteo_decode import (
+    block_epochs,
+    local_dates,
+    local_datetimes,
+    local_strings,
+)
+from app.services.openmeteo_fakes import DAY0, FakeBlock
+
+# A week without DST changes, where a fixed offset equals the zone rules
+ZONES = [("America/New_York", -4 * 3600), ("Asia/Tokyo", 9 * 3600)]
+
+
+class TestOpenMeteoDecode(unittest.TestCase):
+    def setUp(self):
+        self.block = FakeBlock([list(range(168))], time=DAY0, interval=3600)
+
+    def test_block_epochs(self):
+        """The time axis is rebuilt from Time/TimeEnd/Interval"""
+        epochs = block_epochs(self.block)
+        self.assertEqual(len(epochs), 168)
+        self.assertEqual(epochs[0], DAY0)
+        self.assertEqual(epochs[1] - epochs[0], 3600)
+
+    def test_matches_pandas(self):
+        """Results equal the previous pandas date_range/tz_convert decoding"""
+        for zone, offset in ZONES:
+            with self.subTest(zone=zone):
+                expected = (
+                    pd.date_range(
+                        start=pd.to_datetime(self.block.Time(), unit="s", utc=True),
+                        end=pd.to_datetime(self.block.TimeEnd(), unit="s", utc=True),
+                        freq=pd.Timedelta(seconds=self.block.Interval()),
+                        inclusive="left",
+                    )
+                    .tz_convert(zone)
+                    .tz_localize(None)
+                )
+                epochs = block_epochs(self.block)
+
+                self.assertEqual(
+                    local_datetimes(epochs, offset), expected.to_pydatetime().tolist()
+                )
+                self.assertEqual(
+                    local_strings(epochs, offset),
+                    expected.strftime("%Y-%m-%d %H:%M:%S").tolist(),
+                )
+
+    def test_local_dates(self):
+        """Daily dates use the location's calendar day"""
+        midnight_tokyo = DAY0 - 13 * 3600  # 2025-05-03 00:00 JST
+        self.assertEqual(local_dates([midnight_tokyo], 9 * 3600), ["2025-05-03"])
+        self.assertEqual(
+            local_datetimes([DAY0], -4 * 3600), [datetime(2025, 5, 3, 0, 0)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
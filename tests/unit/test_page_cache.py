@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import patch
+
+from app import create_app
+from app.config import TestingConfig
+from app.services.geo_grid import coordinate_grid
+from app.services.openmeteo_client import openmeteo_pool
+from app.services.openmeteo_fakes import make_bundle_response
+from app.services.page_cache import PageCache, page_cache
+
+COORDS = {"lat": 35.78, "lon": -78.78}
+UNITS = ("F", "mph", "in")
+HOUR = 1_700_000_000 // 3600 * 3600
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = PageCache(max_entries=2, ttl=60, bucket=3600, enabled=True)
+
+    def test_hit_and_miss(self):
+        key = self.cache.make_key(COORDS, UNITS, "home.html")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.set(key, "<html>")
+        self.assertEqual(self.cache.get(key), "<html>")
+        self.assertEqual(self.cache.stats()["hit_ratio"], 0.5)
+
+    def test_key_varies_with_inputs(self):
+        key = self.cache.make_key(COORDS, UNITS, "hourly.html", 24, now=HOUR)
+        self.assertNotEqual(
+            key, self.cache.make_key(COORDS, ("C", "kmh", "mm"), "hourly.html", 24)
+        )
+        self.assertNotEqual(
+            key, self.cache.make_key(COORDS, UNITS, "hourly.html", 48, now=HOUR)
+        )
+        self.assertNotEqual(
+            key, self.cache.make_key(COORDS, UNITS, "forecast.html", 24, now=HOUR)
+        )
+        # same hour, same page; the next hour is a new page
+        self.assertEqual(
+            key, self.cache.make_key(COORDS, UNITS, "hourly.html", 24, now=HOUR + 3599)
+        )
+        self.assertNotEqual(
+            key, self.cache.make_key(COORDS, UNITS, "hourly.html", 24, now=HOUR + 3600)
+        )
+
+    def test_invalidate_retires_location(self):
+        key = self.cache.make_key(COORDS, UNITS, "home.html")
+        other = self.cache.make_key({"lat": 40.0, "lon": -75.0}, UNITS, "home.html")
+        self.cache.set(key, "old")
+        self.cache.set(other, "other")
+
+        # Open-Meteo params carry the snapped coordinates as strings or floats
+        self.cache.invalidate("35.78", "-78.78")
+        fresh = self.cache.make_key(COORDS, UNITS, "home.html")
+        self.assertNotEqual(fresh, key)
+        self.assertIsNone(self.cache.get(fresh))
+        self.assertEqual(self.cache.get(other), "other")
+
+    def test_ttl_and_lru(self):
+        self.cache.ttl = 0
+        key = self.cache.make_key(COORDS, UNITS, "home.html")
+        self.cache.set(key, "page")
+        with patch("app.services.page_cache.time.time", return_value=2e9):
+            self.assertIsNone(self.cache.get(key))
+
+        self.cache.ttl = 60
+        for template in ("a", "b", "c"):
+            self.cache.set(self.cache.make_key(COORDS, UNITS, template), template)
+        self.assertEqual(self.cache.stats()["entries"], 2)
+        self.assertIsNone(self.cache.get(self.cache.make_key(COORDS, UNITS, "a")))
+
+    def test_disabled(self):
+        cache = PageCache()
+        key = cache.make_key(COORDS, UNITS, "home.html")
+        cache.set(key, "page")
+        self.assertIsNone(cache.get(key))
+
+
+class TestCachedViews(unittest.TestCase):
+    def setUp(self):
+        class PageCacheConfig(TestingConfig):
+            PAGE_CACHE_ENABLED = True
+
+        self.app = create_app(PageCacheConfig)
+        self.client = self.app.test_client()
+        self.get("/")  # session defaults (Cary, NC; F/mph/in)
+
+    def tearDown(self):
+        page_cache.enabled = False
+        page_cache.clear()
+
+    def get(self, url):
+        with patch.object(
+            openmeteo_pool,
+            "weather_api",
+            side_effect=lambda params, **kwargs: [make_bundle_response()],
+        ) as weather_api:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, weather_api.call_count
+
+    def test_repeat_views_skip_fetch_and_render(self):
+        first, calls = self.get("/hourly")
+        self.assertEqual(calls, 1)
+
+        second, calls = self.get("/hourly")
+        self.assertEqual(calls, 0)
+        self.assertEqual(second.data, first.data)
+
+        # another length is another page
+        _, calls = self.get("/hourly?hours=48")
+        self.assertEqual(calls, 1)
+
+    def test_units_change_renders_again(self):
+        self.get("/forecast")
+        with self.client.session_transaction() as session:
+            session["temp_unit"] = "C"
+        _, calls = self.get("/forecast")
+        self.assertEqual(calls, 1)
+
+    def test_forecast_refresh_invalidates(self):
+        self.get("/hourly")
+        cell = coordinate_grid.snap_coords({"lat": 35.7915, "lon": -78.7811})
+        page_cache.invalidate(cell["lat"], cell["lon"])
+        _, calls = self.get("/hourly")
+        self.assertEqual(calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
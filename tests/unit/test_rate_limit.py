@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+import fakeredis
+
+from app.services.loc_api import LocService
+from app.services.rate_limit import RateLimiter, RateLimitExceeded
+
+NOMINATIM_ZIP = [
+    {
+        "lat": "35.7915",
+        "lon": "-78.7811",
+        "display_name": "27511, Cary, Wake County, North Carolina, United States",
+    }
+]
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_calls_are_spaced(self):
+        """Back-to-back callers queue for consecutive slots"""
+        limiter = RateLimiter("test", rate=20, burst=1)
+        waits = [limiter.acquire() for _ in range(3)]
+
+        self.assertEqual(waits[0], 0.0)
+        self.assertAlmostEqual(waits[1], 0.05, delta=0.02)
+        self.assertAlmostEqual(waits[2], 0.05, delta=0.02)
+
+    def test_burst_then_reject(self):
+        """Bursts pass at once; a queue longer than max_wait is rejected"""
+        limiter = RateLimiter("test", rate=1, burst=2, max_wait=0)
+
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertEqual(limiter.acquire(), 0.0)
+        with self.assertRaises(RateLimitExceeded) as ctx:
+            limiter.acquire()
+
+        self.assertAlmostEqual(ctx.exception.retry_after, 1.0, delta=0.05)
+        stats = limiter.stats()
+        self.assertEqual((stats["granted"], stats["rejected"]), (2, 1))
+
+    def test_disabled(self):
+        """rate=None never waits"""
+        limiter = RateLimiter("test", rate=None, max_wait=0)
+        self.assertEqual([limiter.acquire() for _ in range(5)], [0.0] * 5)
+
+    def test_shared_budget_across_workers(self):
+        """Limiters sharing a Redis key share one budget"""
+        redis = fakeredis.FakeRedis()
+        worker_a = RateLimiter("test", rate=1, max_wait=0, client=redis)
+        worker_b = RateLimiter("test", rate=1, max_wait=0, client=redis)
+
+        worker_a.acquire()
+        with self.assertRaises(RateLimitExceeded):
+            worker_b.acquire()
+        self.assertTrue(redis.exists("ratelimit:test"))
+
+    def test_redis_failure_falls_back_to_local(self):
+        """A broken Redis still limits per process"""
+        client = MagicMock()
+        client.pipeline.side_effect = ConnectionError("down")
+        limiter = RateLimiter("test", rate=1, max_wait=0, client=client)
+
+        limiter.acquire()
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire()
+
+
+class TestLocServiceQueue(unittest.TestCase):
+    @patch("requests.get")
+    def test_identical_searches_share_one_call(self, mock_get):
+        """Concurrent searches for one postal code make a single request"""
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(1)
+            return MagicMock(json=MagicMock(return_value=NOMINATIM_ZIP))
+
+        mock_get.side_effect = slow_get
+        limiter = RateLimiter("test", rate=1, max_wait=0)
+        results = []
+
+        def search():
+            service = LocService({}, limiter=limiter)
+            results.append(service.fetch_location({"postalcode": "27511"}))
+
+        threads = [threading.Thread(target=search) for _ in range(5)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        mock_get.assert_called_once()
+        self.assertEqual([r["city"] for r in results], ["Cary"] * 5)
+
+    @patch("requests.get")
+    def test_overload_is_raised(self, mock_get):
+        """A full queue surfaces as RateLimitExceeded, not an empty result"""
+        mock_get.return_value.json.return_value = NOMINATIM_ZIP
+        service = LocService({}, limiter=RateLimiter("test", rate=1, max_wait=0))
+
+        service.fetch_location({"postalcode": "27511"})
+        with self.assertRaises(RateLimitExceeded):
+            service.get_lat_lon({"postal_code": "27513", "city": "", "state": ""})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@ from app.config import TestingConfig
 from app import create_app
 from app.services.weather_service import WeatherService
 from app.services.loc_api import LocService
+from app.services.rate_limit import RateLimitExceeded
 
 
 class TestRoutes(unittest.TestCase):
@@ -129,8 +130,34 @@ class TestRoutes(unittest.TestCase):
             "app.routes.routes.update_view_hourly_frame"
         ) as mock_hourly_frame:
 
-            mock_cur_frame.return_value = {"current_temp": 75}
-            mock_hourly_frame.return_value = {"hourly_forecast": [70, 72, 74]}
+            mock_cur_frame.return_value = self.sample_location | {
+                "updated_time": "10:00",
+                "unit": "F",
+                "wind_label": "mph",
+                "precip_label": "in",
+                "current_temperature_2m": 75,
+                "current_apparent_temperature": 77,
+                "current_precipitation": 0.0,
+                "current_wind_speed_10m": 8.0,
+                "current_weather_code": 0,
+                "is_day": 1,
+                "daily_temperature_2m_max": 80,
+                "daily_temperature_2m_min": 70,
+                "daily_uv_index_max": 5.0,
+                "daily_precipitation_probability_max": 0,
+                "icon": "icon.png",
+                "description": "Clear sky",
+                "timezone": "America/New_York",
+            }
+            mock_hourly_frame.return_value = {
+                "hours": ["10:00", "11:00"],
+                "hourly_temperature_2m": ["70", "72"],
+                "hourly_weather_code": ["0", "0"],
+                "hourly_precipitation_probability": ["0", "0"],
+                "icon_hourly": ["icon.png", "icon.png"],
+                "description_hourly": ["Clear sky", "Clear sky"],
+                "temp_unit": "F",
+            }
 
             # Send search request
             response = self.client.post(
@@ -143,10 +170,13 @@ class TestRoutes(unittest.TestCase):
             self.assertEqual(response.status_code, 200)
             data = json.loads(response.data)
 
-            # Verify data contains merged results
-            self.assertIn("city", data)
-            self.assertIn("current_temp", data)
-            self.assertIn("hourly_forecast", data)
+            # Verify data contains the schema's fields only
+            self.assertEqual(data["schema_version"], 1)
+            self.assertEqual(data["city"], "Cary")
+            self.assertEqual(data["current_temperature_2m"], 75)
+            self.assertEqual(data["hourly_temperature_2m"], ["70", "72"])
+            for key in ("timezone", "temp_unit", "cur_location", "lat"):
+                self.assertNotIn(key, data)
 
     @patch("app.routes.routes.verify")
     def test_search_route_invalid_location(self, mock_verify):
@@ -318,6 +348,22 @@ class TestRoutes(unittest.TestCase):
         self.assertEqual(data["lat"], "35.7915")
         self.assertEqual(data["lon"], "-78.7811")
 
+    @patch("app.routes.routes.LocService")
+    def test_api_location_route_rate_limited(self, mock_loc_service):
+        """A full Nominatim queue is reported as 503 with Retry-After."""
+        mock_instance = mock_loc_service.return_value
+        mock_instance.get_lat_lon.side_effect = RateLimitExceeded("nominatim", 2.4)
+
+        response = self.client.post(
+            "/api/location",
+            data=json.dumps({"city": "Cary", "state": "NC"}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "2")
+        self.assertIn("nominatim is busy", json.loads(response.data)["error"])
+
     def test_api_location_route_no_data(self):
         """Test the api_location route with no data."""
         # Send request with empty body
@@ -350,6 +396,47 @@ class TestRoutes(unittest.TestCase):
         self.assertIn("error", data)
         self.assertEqual(data["error"], "API error")
 
+    @patch("app.routes.routes.WeatherService")
+    def test_api_weather_batch_route(self, mock_weather_service):
+        """Test the batch forecast route fans results out per location."""
+        bundle = {
+            "cur": {"current_temperature_2m": 75},
+            "hourly": {"hours": [datetime(2025, 5, 3, 7, 0)]},
+            "daily": {"date": self.sample_7day["date"]},
+        }
+        mock_instance = mock_weather_service.return_value
+        mock_instance.get_forecasts_bulk.return_value = [bundle, bundle]
+
+        response = self.client.post(
+            "/api/weather/batch",
+            data=json.dumps(
+                {"locations": [{"lat": "35.79", "lon": "-78.78"}, {"lat": 1, "lon": 2}]}
+            ),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        mock_instance.get_forecasts_bulk.assert_called_once()
+        results = json.loads(response.data)["results"]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["lat"], 35.79)
+        self.assertEqual(results[1]["cur"]["current_temperature_2m"], 75)
+        self.assertEqual(results[0]["hourly"]["hours"], ["2025-05-03 07:00:00"])
+
+    def test_api_weather_batch_route_too_many(self):
+        """Test the batch forecast route rejects oversized batches."""
+        max_locations = self.app.config["WEATHER_BATCH_MAX_LOCATIONS"]
+        locations = [{"lat": 1, "lon": 2}] * (max_locations + 1)
+
+        response = self.client.post(
+            "/api/weather/batch",
+            data=json.dumps({"locations": locations}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", json.loads(response.data))
+
 
 if __name__ == "__main__":
     unittest.main()
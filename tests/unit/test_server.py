@@ -0,0 +1,118 @@
+import json
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app import create_app
+from app.config import GeventConfig, TestingConfig
+from app.server import Backpressure, create_server
+from app.services.nominatim_client import NominatimClientPool
+
+
+def start_response_recorder():
+    recorded = {}
+
+    def start_response(status, headers):
+        recorded["status"] = status
+        recorded["headers"] = dict(headers)
+
+    return recorded, start_response
+
+
+class TestBackpressure(unittest.TestCase):
+    def test_admits_within_limit(self):
+        app = Backpressure(lambda environ, start_response: [b"ok"], max_active=2)
+        recorded, start_response = start_response_recorder()
+
+        self.assertEqual(app({}, start_response), [b"ok"])
+        self.assertNotIn("status", recorded)
+        self.assertEqual(app.stats()["admitted"], 1)
+        self.assertEqual(app.stats()["active"], 0)
+
+    def test_sheds_load_when_saturated(self):
+        """Requests past max_active wait queue_timeout, then get a 503"""
+        entered = threading.Event()
+        release = threading.Event()
+
+        def slow_app(environ, start_response):
+            entered.set()
+            release.wait(5)
+            return [b"ok"]
+
+        app = Backpressure(slow_app, max_active=1, queue_timeout=0.05, retry_after=3)
+        worker = threading.Thread(target=app, args=({}, lambda *a: None))
+        worker.start()
+        entered.wait(5)
+
+        recorded, start_response = start_response_recorder()
+        body = app({}, start_response)
+        release.set()
+        worker.join()
+
+        self.assertEqual(recorded["status"], "503 Service Unavailable")
+        self.assertEqual(recorded["headers"]["Retry-After"], "3")
+        self.assertEqual(json.loads(body[0])["retry_after"], 3)
+        stats = app.stats()
+        self.assertEqual((stats["admitted"], stats["rejected"]), (1, 1))
+        self.assertEqual(stats["peak_active"], 1)
+
+    def test_slot_released_on_error(self):
+        def failing_app(environ, start_response):
+            raise ValueError("boom")
+
+        app = Backpressure(failing_app, max_active=1, queue_timeout=0)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                app({}, lambda *a: None)
+        self.assertEqual(app.stats()["rejected"], 0)
+
+
+class TestCreateServer(unittest.TestCase):
+    def test_server_settings(self):
+        class ServerConfig(TestingConfig):
+            GEVENT_POOL_SIZE = 50
+            GEVENT_MAX_ACTIVE = 10
+
+        app = create_app(ServerConfig)
+        server = create_server(app, host="127.0.0.1", port=0)
+
+        self.assertEqual(server.pool.size, 50)
+        self.assertIs(app.wsgi_app, app.extensions["backpressure"])
+        self.assertEqual(app.wsgi_app.max_active, 10)
+
+        metrics = app.test_client().get("/api/metrics").get_json()
+        self.assertEqual(metrics["server"]["max_active"], 10)
+
+    def test_gevent_profile_blocks_on_pools(self):
+        """Greenlets wait for pooled connections instead of opening more"""
+        self.assertTrue(GeventConfig.OPENMETEO_POOL_BLOCK)
+        self.assertEqual(GeventConfig.OPENMETEO_POOL_MAXSIZE, 200)
+        self.assertGreater(GeventConfig.NOMINATIM_POOL_MAXSIZE, 0)
+
+
+class TestNominatimClientPool(unittest.TestCase):
+    @patch("requests.get")
+    def test_unpooled_uses_requests_get(self, mock_get):
+        pool = NominatimClientPool(pool_maxsize=0, timeout=2)
+        pool.get({"postalcode": "27511", "format": "json"})
+
+        _, kwargs = mock_get.call_args
+        self.assertEqual(kwargs["params"]["postalcode"], "27511")
+        self.assertEqual(kwargs["timeout"], 2)
+
+    @patch("requests.get")
+    def test_pooled_session_is_reused(self, mock_get):
+        pool = NominatimClientPool(pool_maxsize=2)
+        with patch("requests.Session.get", return_value=MagicMock()) as session_get:
+            pool.get({"postalcode": "27511"})
+            pool.get({"postalcode": "27513"})
+
+        mock_get.assert_not_called()
+        self.assertEqual(session_get.call_count, 2)
+        session = pool._get_session()
+        self.assertEqual(session.get_adapter("https://")._pool_maxsize, 2)
+        self.assertEqual(pool.stats()["calls"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
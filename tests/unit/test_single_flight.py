@@ -0,0 +1,119 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import fakeredis
+
+from app.services.openmeteo_fakes import make_bundle_response
+from app.services.single_flight import SingleFlight
+from app.services.weather_service import WeatherService
+
+COORDS = {"lat": 35.7915, "lon": -78.7811}
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_callers_share_one_call(self):
+        """Callers arriving while a key is in flight get the leader's result"""
+        flight = SingleFlight()
+        calls, results = [], []
+        release = threading.Event()
+
+        def slow():
+            calls.append(1)
+            release.wait(1)
+            return {"value": 42}
+
+        def caller():
+            results.append(flight.do("key", slow))
+
+        threads = [threading.Thread(target=caller) for _ in range(8)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"value": 42}] * 8)
+        stats = flight.stats()
+        self.assertEqual((stats["executed"], stats["coalesced"]), (1, 7))
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_error_is_shared_and_not_remembered(self):
+        """Waiters see the leader's exception; the next call runs again"""
+        flight = SingleFlight()
+
+        def fail():
+            raise ConnectionError("upstream down")
+
+        with self.assertRaises(ConnectionError):
+            flight.do("key", fail)
+        self.assertEqual(flight.do("key", lambda: "ok"), "ok")
+
+    def test_redis_lock_makes_other_workers_wait(self):
+        """A worker that finds the lock taken waits for the published result"""
+        redis = fakeredis.FakeRedis()
+        published = {}
+        flight = SingleFlight(client=redis, poll_interval=0.01)
+
+        # another worker holds the lock and publishes shortly after
+        redis.set("inflight:key", "other-worker", ex=10)
+
+        def publish():
+            time.sleep(0.05)
+            published["key"] = {"value": 42}
+            redis.delete("inflight:key")
+
+        threading.Thread(target=publish).start()
+        fn = MagicMock(return_value={"value": 0})
+
+        result = flight.do("key", fn, lookup=lambda: published.get("key"))
+
+        self.assertEqual(result, {"value": 42})
+        fn.assert_not_called()
+        self.assertEqual(flight.stats()["remote_waits"], 1)
+
+    def test_redis_lock_released_by_holder(self):
+        """The lock is only held while the call runs"""
+        redis = fakeredis.FakeRedis()
+        flight = SingleFlight(client=redis)
+
+        self.assertEqual(flight.do("key", lambda: redis.exists("inflight:key")), 1)
+        self.assertFalse(redis.exists("inflight:key"))
+
+
+class TestWeatherServiceCoalescing(unittest.TestCase):
+    def test_concurrent_requests_call_upstream_once(self):
+        """Threads missing the cache together trigger a single upstream fetch"""
+        release = threading.Event()
+        pool = MagicMock()
+
+        def weather_api(params, **kwargs):
+            release.wait(1)
+            return [make_bundle_response()]
+
+        pool.weather_api.side_effect = weather_api
+        flight = SingleFlight()
+        temps = []
+
+        def request():
+            # one service per request, like get_weather_service() on flask.g
+            weather = WeatherService(pool=pool, bundle=True, flight=flight)
+            temps.append(weather.get_cur_forecast(COORDS)["current_temperature_2m"])
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        pool.weather_api.assert_called_once()
+        self.assertEqual(temps, [70] * 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ["pandas", "numpy", "requests_cache", "openmeteo_requests"]
+
+
+def modules_loaded_by(code):
+    """Run code in a fresh interpreter and return the heavy modules it loaded"""
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\n{code}\n"
+            f"print('loaded:', [m for m in {HEAVY_MODULES!r} if m in sys.modules])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # the app logs to stdout too; the report is the last line
+    return completed.stdout.strip().splitlines()[-1]
+
+
+class TestStartup(unittest.TestCase):
+    def test_weather_service_import_is_side_effect_free(self):
+        """Importing the service neither prints, calls out nor loads pandas"""
+        completed = subprocess.run(
+            [sys.executable, "-c", "import app.services.weather_service"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(completed.stdout, "")
+        self.assertEqual(
+            modules_loaded_by("import app.services.weather_service"), "loaded: []"
+        )
+
+    def test_create_app_defers_heavy_imports(self):
+        """Booting the app leaves numpy, pandas and the HTTP cache unloaded"""
+        code = (
+            "from app import create_app\n"
+            "from app.config import TestingConfig\n"
+            "create_app(TestingConfig)"
+        )
+        self.assertEqual(modules_loaded_by(code), "loaded: []")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from app.services.daylight import sun_times
+from app.services.timezone_service import TimezoneService
+
+# 2025-11-01 00:00 America/New_York (EDT); DST ends 2025-11-02 06:00 UTC
+NOV1 = 1761969600
+DST_END = int(datetime(2025, 11, 2, 6, tzinfo=timezone.utc).timestamp())
+# DST starts 2025-03-09 07:00 UTC (02:00 EST -> 03:00 EDT)
+DST_START = int(datetime(2025, 3, 9, 7, tzinfo=timezone.utc).timestamp())
+
+
+class TestTimezoneService(unittest.TestCase):
+    def setUp(self):
+        self.service = TimezoneService(max_zones=2)
+
+    def test_zone_cache_is_bounded(self):
+        """Zones are reused and the cache never grows past max_zones"""
+        zone = self.service.zone("America/New_York")
+        self.assertIsInstance(zone, ZoneInfo)
+        self.assertIs(self.service.zone("America/New_York"), zone)
+        self.service.zone("Asia/Tokyo")
+        self.service.zone("Europe/Paris")
+        stats = self.service.stats()
+        self.assertEqual(stats["zones"], 2)
+        self.assertEqual(stats["zone_hits"], 1)
+
+    def test_local_zone_resolved_once(self):
+        with patch("tzlocal.get_localzone", return_value=ZoneInfo("UTC")) as local:
+            self.assertEqual(str(self.service.local_zone()), "UTC")
+            self.service.local_zone()
+        local.assert_called_once()
+
+    def test_offsets_follow_dst(self):
+        """A DST change inside the forecast shifts the later hours"""
+        epochs = NOV1 + np.arange(72) * 3600
+        offsets = self.service.offsets("America/New_York", epochs)
+        np.testing.assert_array_equal(
+            offsets, np.where(epochs < DST_END, -4 * 3600, -5 * 3600)
+        )
+        transitions, _ = self.service._table(
+            "America/New_York", int(epochs.min()), int(epochs.max())
+        )
+        self.assertEqual(transitions[1], DST_END)
+
+    def test_offsets_at_dst_start(self):
+        """The table switches offset on the exact second of the change"""
+        epochs = [DST_START - 3600, DST_START - 1, DST_START, DST_START + 3600]
+        offsets = self.service.offsets("America/New_York", epochs)
+        self.assertEqual(offsets.tolist(), [-5 * 3600, -5 * 3600, -4 * 3600, -4 * 3600])
+
+        # changes right at the end of the range and between two probes
+        for start, end in (
+            (DST_START - 86400, DST_START),
+            (DST_START - 60, DST_START + 60),
+        ):
+            transitions, table = self.service._table("America/New_York", start, end)
+            self.assertEqual(transitions, (start, DST_START))
+            self.assertEqual(table, (-5 * 3600, -4 * 3600))
+
+        # a range spanning both changes of the year finds each of them
+        transitions, _ = self.service._table(
+            "America/New_York", DST_START - 86400 * 7, DST_END + 86400 * 7
+        )
+        self.assertEqual(transitions[1:], (DST_START, DST_END))
+
+    def test_unknown_zone_uses_default(self):
+        offsets = self.service.offsets("Invalid/Timezone", [NOV1, NOV1 + 3600], 3600)
+        self.assertEqual(offsets.tolist(), [3600, 3600])
+
+    def test_sun_times_across_dst(self):
+        """Sunrise stays ~06:30 local on both sides of the change"""
+        sunrise = [NOV1 + 6 * 3600 + 1800, NOV1 + 86400 + 7 * 3600 + 1800]
+        data = {
+            "timezone": "America/New_York",
+            "utc_offset": -4 * 3600,
+            "daily_sunrise_epochs": sunrise,
+            "daily_sunset_epochs": sunrise,
+        }
+        local_sunrise, _ = sun_times(data)
+        self.assertEqual(
+            np.datetime_as_string(local_sunrise, unit="m").tolist(),
+            ["2025-11-01T06:30", "2025-11-02T06:30"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
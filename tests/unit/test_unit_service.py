@@ -0,0 +1,120 @@
+import unittest
+
+import numpy as np
+
+from app.routes.utils import convert_to_celsius
+from app.services.unit_service import UnitService, convert_temperature
+
+
+class TestUnitService(unittest.TestCase):
+    def test_temperature_matches_scalar_conversion(self):
+        """Arrays match convert_to_celsius at full precision"""
+        temps = np.linspace(-20.7, 105.3, 200)
+        units = UnitService(temp_unit="C")
+        self.assertEqual(
+            units.temperature(temps).tolist(),
+            [convert_to_celsius(float(t)) for t in temps],
+        )
+        self.assertEqual(
+            UnitService(temp_unit="F").temperature(temps).tolist(),
+            [int(t) for t in temps],
+        )
+
+    def test_scalars_stay_scalars(self):
+        """Single values come back as Python numbers"""
+        units = UnitService(temp_unit="C", wind_unit="kmh", precip_unit="in")
+        self.assertEqual(units.temperature(47.0), 8)
+        self.assertIsInstance(units.temperature(47.0), int)
+        self.assertEqual(units.wind(13.0), 20.9)
+        self.assertEqual(units.precipitation(25.4), 1.0)
+
+    def test_wind_and_precipitation(self):
+        """Wind and precipitation follow the chosen units"""
+        speeds = [0.0, 10.0, 13.0]
+        self.assertEqual(
+            UnitService(wind_unit="kmh").wind(speeds).tolist(), [0.0, 16.1, 20.9]
+        )
+        self.assertEqual(UnitService(wind_unit="mph").wind(speeds).tolist(), speeds)
+        self.assertEqual(
+            UnitService(precip_unit="in").precipitation([0.0, 12.7]).tolist(),
+            [0.0, 0.5],
+        )
+        self.assertEqual(
+            UnitService(precip_unit="mm").precipitation([0.0, 12.7]).tolist(),
+            [0.0, 12.7],
+        )
+
+    def test_from_session(self):
+        """Preferences come from the session, with the app defaults"""
+        units = UnitService.from_session({"temp_unit": "C", "wind_unit": "kmh"})
+        self.assertEqual(
+            units.target,
+            {"temperature": "C", "wind": "kmh", "precipitation": "in"},
+        )
+        self.assertEqual(units.labels["wind"], "km/h")
+
+    def test_unsupported_unit(self):
+        with self.assertRaises(ValueError):
+            UnitService(wind_unit="knots")
+        with self.assertRaises(ValueError):
+            UnitService.profile({}, "metric")
+
+    def test_profiles(self):
+        """Upstream profiles convert nothing, canonical ones convert from SI"""
+        preferences = {"temp_unit": "F", "wind_unit": "mph", "precip_unit": "in"}
+        upstream = UnitService.profile(preferences)
+        self.assertTrue(upstream.identity)
+        self.assertEqual(
+            upstream.openmeteo_params(),
+            {
+                "temperature_unit": "fahrenheit",
+                "wind_speed_unit": "mph",
+                "precipitation_unit": "inch",
+            },
+        )
+        self.assertEqual(upstream.temperature([70.6, 71.9]).tolist(), [70, 71])
+
+        canonical = UnitService.profile(preferences, "canonical")
+        self.assertFalse(canonical.identity)
+        self.assertEqual(canonical.openmeteo_params()["temperature_unit"], "celsius")
+        self.assertEqual(canonical.temperature(21.7), 71)
+        self.assertEqual(canonical.wind(16.0934), 10.0)
+
+    def test_convert_fields(self):
+        """Scalar fields and columns are converted per kind"""
+        units = UnitService(temp_unit="C", wind_unit="kmh", precip_unit="in")
+        data = {
+            "current_temperature_2m": 47.0,
+            "daily_temperature_2m_max": 66.0,
+            "current_wind_speed_10m": 13.0,
+            "hourly_precipitation": [0.0, 2.54],
+            "timezone": "America/New_York",
+        }
+        converted = units.convert(
+            data,
+            {
+                "temperature": [
+                    "current_temperature_2m",
+                    "daily_temperature_2m_max",
+                    "missing_field",
+                ],
+                "wind": ["current_wind_speed_10m"],
+                "precipitation": ["hourly_precipitation"],
+            },
+        )
+        self.assertEqual(converted["current_temperature_2m"], 8)
+        self.assertEqual(converted["daily_temperature_2m_max"], 18)
+        self.assertEqual(converted["current_wind_speed_10m"], 20.9)
+        self.assertEqual(converted["hourly_precipitation"], [0.0, 0.1])
+        self.assertEqual(converted["timezone"], "America/New_York")
+        self.assertNotIn("missing_field", converted)
+        # the input is left untouched
+        self.assertEqual(data["current_temperature_2m"], 47.0)
+
+    def test_convert_temperature(self):
+        self.assertEqual(convert_temperature(100, "F"), 212)
+        self.assertEqual(convert_temperature(20, "C"), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
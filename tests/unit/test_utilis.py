@@ -21,6 +21,7 @@ from app.routes.utils import (
     get_is_day,
     convert_to_celsius,
 )
+from app.services.unit_service import UnitService
 from app.utils.constants import WEATHER_CODE_MAP
 
 
@@ -147,6 +148,8 @@ class TestUtils(unittest.TestCase):
         """Test update_view_cur_frame with Fahrenheit units"""
         # Set up mocks
         mock_instance = mock_weather_service.return_value
+        # the mocked service returns Fahrenheit/mph/mm payloads
+        mock_instance.units = UnitService(temp_unit="F")
         mock_instance.get_cur_forecast.return_value = self.sample_current
 
         mock_time.return_value = {
@@ -174,6 +177,8 @@ class TestUtils(unittest.TestCase):
         """Test update_view_cur_frame with Celsius units"""
         # Set up mocks
         mock_instance = mock_weather_service.return_value
+        # the mocked service returns Fahrenheit/mph/mm payloads
+        mock_instance.units = UnitService(temp_unit="C")
         mock_instance.get_cur_forecast.return_value = self.sample_current
 
         mock_time.return_value = {
@@ -200,6 +205,8 @@ class TestUtils(unittest.TestCase):
         """Test update_view_hourly_frame with Fahrenheit units"""
         # Set up mocks
         mock_instance = mock_weather_service.return_value
+        # the mocked service returns Fahrenheit/mph/mm payloads
+        mock_instance.units = UnitService(temp_unit="F")
         mock_instance.get_hourly_forecast.return_value = self.sample_hourly
 
         mock_time.return_value = {
@@ -216,6 +223,9 @@ class TestUtils(unittest.TestCase):
             self.assertEqual(len(result["hours"]), 6)
             self.assertEqual(result["hourly_temperature_2m"][0], "44")
             self.assertEqual(result["hourly_precipitation_probability"][0], "0")
+            # the frame carries its own fields, not the session
+            self.assertNotIn("cur_location", result)
+            self.assertNotIn("temp_unit", result)
 
     @patch("app.routes.utils.WeatherService")
     @patch("app.routes.utils.get_time_in_timezone")
@@ -223,6 +233,8 @@ class TestUtils(unittest.TestCase):
         """Test update_view_hourly_frame with Celsius units"""
         # Set up mocks
         mock_instance = mock_weather_service.return_value
+        # the mocked service returns Fahrenheit/mph/mm payloads
+        mock_instance.units = UnitService(temp_unit="C")
         mock_instance.get_hourly_forecast.return_value = self.sample_hourly
 
         mock_time.return_value = {
@@ -243,6 +255,8 @@ class TestUtils(unittest.TestCase):
         """Test update_view_7_day_frame with Fahrenheit units"""
         # Set up mock
         mock_instance = mock_weather_service.return_value
+        # the mocked service returns Fahrenheit/mph/mm payloads
+        mock_instance.units = UnitService(temp_unit="F")
         mock_instance.get_7_day_forecast.return_value = self.sample_daily
 
         with self.app.test_request_context():
@@ -263,6 +277,8 @@ class TestUtils(unittest.TestCase):
         """Test update_view_7_day_frame with Celsius units"""
         # Set up mock
         mock_instance = mock_weather_service.return_value
+        # the mocked service returns Fahrenheit/mph/mm payloads
+        mock_instance.units = UnitService(temp_unit="C")
         mock_instance.get_7_day_forecast.return_value = self.sample_daily
 
         with self.app.test_request_context():
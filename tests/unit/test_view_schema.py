@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app import create_app
+from app.config import TestingConfig
+from app.models.view_schema import (
+    SEARCH_SCHEMA_VERSION,
+    CurrentView,
+    HourlyView,
+    serialize_search,
+)
+from app.services.openmeteo_client import openmeteo_pool
+from app.services.openmeteo_fakes import make_bundle_response
+
+HOURLY = {
+    "hours": ["10:00", "11:00"],
+    "hourly_temperature_2m": ["70", "72"],
+    "hourly_weather_code": ["0", "3"],
+    "hourly_precipitation_probability": ["0", "10"],
+    "icon_hourly": ["01d.png", "04d.png"],
+    "description_hourly": ["Clear sky", "Overcast"],
+}
+
+CURRENT = {
+    "city": "Cary",
+    "state": "NC",
+    "city_state": "Cary, NC",
+    "updated_time": "10:00",
+    "unit": "F",
+    "wind_label": "mph",
+    "precip_label": "in",
+    "current_temperature_2m": 75,
+    "current_apparent_temperature": 77,
+    "current_precipitation": 0.0,
+    "current_wind_speed_10m": 8.2,
+    "current_weather_code": 0,
+    "is_day": 1,
+    "daily_temperature_2m_max": 80,
+    "daily_temperature_2m_min": 70,
+    "daily_uv_index_max": 6.6,
+    "daily_precipitation_probability_max": 20,
+    "icon": "01d.png",
+    "description": "Clear sky",
+}
+
+# what the views used to merge in from the session and the raw forecast
+SESSION = {
+    "temp_unit": "F",
+    "wind_unit": "mph",
+    "precip_unit": "in",
+    "cur_location": {"lat": 35.7915, "lon": -78.7811, "city": "Cary"},
+}
+
+
+class TestViewSchema(unittest.TestCase):
+    def test_from_dict_drops_extra_keys(self):
+        view = HourlyView.from_dict(HOURLY | SESSION)
+        self.assertEqual(view.to_dict(), HOURLY)
+
+        current = CurrentView.from_dict(CURRENT | {"timezone": "America/New_York"})
+        self.assertEqual(current.to_dict(), CURRENT)
+
+    def test_missing_field(self):
+        with self.assertRaises(KeyError):
+            HourlyView.from_dict({"hours": []})
+
+    def test_serialize_search(self):
+        payload = serialize_search(CURRENT | SESSION, HOURLY | SESSION)
+        self.assertEqual(payload["schema_version"], SEARCH_SCHEMA_VERSION)
+        self.assertEqual(payload, {"schema_version": 1} | CURRENT | HOURLY)
+
+        with self.assertRaises(ValueError):
+            serialize_search(CURRENT, HOURLY, version=0)
+
+
+class TestSearchPayload(unittest.TestCase):
+    """/search end to end: LocService, the view frames and the serializer"""
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+
+    @patch("requests.get")
+    def test_geocoded_search(self, mock_get):
+        # geocoded locations come without city_state
+        mock_get.return_value = MagicMock()
+        mock_get.return_value.json.return_value = [
+            {
+                "lat": "35.9799",
+                "lon": "-78.5097",
+                "display_name": "27587, Wake Forest, Wake County, North Carolina, "
+                "United States",
+            }
+        ]
+        with patch.object(
+            openmeteo_pool,
+            "weather_api",
+            side_effect=lambda params, **kwargs: [make_bundle_response()],
+        ):
+            self.client.get("/")
+            response = self.client.post(
+                "/search", json={"postal_code": "27587", "city": "", "state": ""}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["schema_version"], SEARCH_SCHEMA_VERSION)
+        self.assertEqual(data["city_state"], "Wake Forest, NC")
+        self.assertEqual(len(data["hours"]), 6)
+        self.assertNotIn("cur_location", data)
+
+
+if __name__ == "__main__":
+    unittest.main()
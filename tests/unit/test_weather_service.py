@@ -0,0 +1,159 @@
+import unittest
+from unittest.mock import MagicMock
+
+from app.services.openmeteo_fakes import make_bundle_response
+from app.services.unit_service import UnitService
+from app.services.weather_service import WeatherService
+
+COORDS = {"lat": 35.7915, "lon": -78.7811}
+
+
+class TestForecastBundle(unittest.TestCase):
+    def setUp(self):
+        """Service backed by a pool returning one fake bundle response"""
+        self.pool = MagicMock()
+        self.pool.weather_api.return_value = [make_bundle_response()]
+        self.weather = WeatherService(pool=self.pool, bundle=True)
+
+    def test_one_upstream_call_for_all_views(self):
+        """cur, hourly and daily are sliced from a single request"""
+        cur = self.weather.get_cur_forecast(COORDS)
+        hourly = self.weather.get_hourly_forecast(COORDS)
+        daily = self.weather.get_7_day_forecast(COORDS)
+
+        self.pool.weather_api.assert_called_once()
+        params = self.pool.weather_api.call_args[0][0]
+        self.assertIn("current", params)
+        self.assertIn("hourly", params)
+        self.assertIn("daily", params)
+
+        self.assertEqual(cur["current_temperature_2m"], 70)
+        self.assertEqual(cur["daily_temperature_2m_max"], 80)
+        self.assertEqual(cur["daily_uv_index_max"], 6.6)
+        self.assertEqual(cur["timezone"], "America/New_York")
+
+        self.assertEqual(len(hourly["hours"]), 168)
+        self.assertEqual(hourly["daily_sunrise"][0], "2025-05-03 06:30:00")
+        self.assertEqual(hourly["daily_sunset"][1], "2025-05-04 20:00:00")
+        self.assertEqual(len(hourly["daily_sunrise_epochs"]), 7)
+        self.assertEqual(hourly["utc_offset"], -4 * 3600)
+
+        self.assertEqual(daily["date"][0], "2025-05-03")
+        self.assertEqual(len(daily["weather_code"]), 7)
+        self.assertEqual(daily["temperature_2m_min"][0], 60.0)
+
+    def test_bundle_disabled_uses_separate_requests(self):
+        """Without bundle mode each view requests only its own variables"""
+        weather = WeatherService(pool=self.pool, bundle=False)
+        weather.get_7_day_forecast(COORDS)
+
+        params = self.pool.weather_api.call_args[0][0]
+        self.assertNotIn("current", params)
+        self.assertNotIn("hourly", params)
+
+    def test_refresh_retires_cached_pages(self):
+        """A revalidated forecast invalidates its location's rendered pages"""
+        pages = MagicMock()
+        weather = WeatherService(pool=self.pool, bundle=True, pages=pages)
+        params = weather._bundle_params(35.8, -78.78)
+
+        weather._fetch_and_store(params, "bundle", "key")
+        pages.invalidate.assert_not_called()
+        weather._fetch_and_store(params, "bundle", "key", refresh=True)
+        pages.invalidate.assert_called_once_with(35.8, -78.78)
+
+    def test_invalid_type(self):
+        """Unknown decode types are rejected"""
+        with self.assertRaises(ValueError):
+            self.weather.fetch_weather_data(
+                {"latitude": 1.0, "longitude": 2.0}, "weekly"
+            )
+
+
+class TestUnitsProfile(unittest.TestCase):
+    def setUp(self):
+        self.pool = MagicMock()
+        self.pool.weather_api.return_value = [make_bundle_response()]
+
+    def fetch_params(self, units):
+        WeatherService(pool=self.pool, bundle=True, units=units).get_cur_forecast(
+            COORDS
+        )
+        return self.pool.weather_api.call_args[0][0]
+
+    def test_upstream_units_requested(self):
+        """Open-Meteo is asked for the user's units"""
+        units = UnitService.profile(
+            {"temp_unit": "C", "wind_unit": "kmh", "precip_unit": "mm"}
+        )
+        params = self.fetch_params(units)
+        self.assertEqual(params["temperature_unit"], "celsius")
+        self.assertEqual(params["wind_speed_unit"], "kmh")
+        self.assertEqual(params["precipitation_unit"], "mm")
+
+    def test_cache_key_per_units_profile(self):
+        """Upstream payloads in different units never share a cache entry"""
+        cache = WeatherService(pool=self.pool).cache
+        fahrenheit = self.fetch_params(UnitService.profile({"temp_unit": "F"}))
+        celsius = self.fetch_params(UnitService.profile({"temp_unit": "C"}))
+        self.assertNotEqual(
+            cache.make_key("bundle", fahrenheit), cache.make_key("bundle", celsius)
+        )
+
+    def test_canonical_units_shared(self):
+        """Canonical mode fetches one payload whatever the preferences"""
+        fahrenheit = self.fetch_params(
+            UnitService.profile({"temp_unit": "F"}, "canonical")
+        )
+        celsius = self.fetch_params(
+            UnitService.profile({"temp_unit": "C"}, "canonical")
+        )
+        self.assertEqual(fahrenheit, celsius)
+        self.assertEqual(celsius["temperature_unit"], "celsius")
+
+    def test_canonical_payload_keeps_precision(self):
+        """Values converted on read are not truncated before conversion"""
+        units = UnitService.profile({"temp_unit": "F"}, "canonical")
+        weather = WeatherService(pool=self.pool, bundle=True, units=units)
+        cur = weather.get_cur_forecast(COORDS)
+        # the fake answers 70.6 whatever was requested, read here as Celsius
+        self.assertEqual(cur["current_temperature_2m"], 70.6)
+        self.assertEqual(units.temperature(cur["current_temperature_2m"]), 159)
+
+
+class TestForecastsBulk(unittest.TestCase):
+    def test_locations_batched_into_one_request(self):
+        """Coordinates are joined per batch and results fanned back out"""
+        pool = MagicMock()
+        pool.weather_api.side_effect = [
+            [make_bundle_response(lat=1.0), make_bundle_response(lat=2.0)],
+            [make_bundle_response(lat=3.0)],
+        ]
+        weather = WeatherService(pool=pool, bundle=True)
+        coords_list = [{"lat": 1.0, "lon": 10.0}, {"lat": 2.0, "lon": 20.0}, COORDS]
+
+        bundles = weather.get_forecasts_bulk(coords_list, batch_size=2)
+
+        self.assertEqual(pool.weather_api.call_count, 2)
+        params = pool.weather_api.call_args_list[0][0][0]
+        self.assertEqual(params["latitude"], "1.0,2.0")
+        self.assertEqual(params["longitude"], "10.0,20.0")
+        self.assertEqual(len(bundles), 3)
+        self.assertEqual(set(bundles[0]), {"cur", "hourly", "daily"})
+
+        # bundles are reused by the single-location API afterwards
+        self.assertIs(weather.get_forecast_bundle(COORDS), bundles[2])
+        self.assertEqual(pool.weather_api.call_count, 2)
+
+    def test_response_count_mismatch(self):
+        """A short upstream answer is an error, not a silent misalignment"""
+        pool = MagicMock()
+        pool.weather_api.return_value = [make_bundle_response()]
+        weather = WeatherService(pool=pool, bundle=True)
+
+        with self.assertRaises(ValueError):
+            weather.get_forecasts_bulk([COORDS, {"lat": 1.0, "lon": 2.0}])
+
+
+if __name__ == "__main__":
+    unittest.main()